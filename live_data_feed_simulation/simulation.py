@@ -7,20 +7,48 @@ non-interactive mode for automated runs.
 """
 
 import argparse
+import atexit
+import functools
+import itertools
 import os
+import queue
 import random
+import re
 import threading
 import time
 import sys
 import math
+import operator
+import mimetypes
+import mmap
 import json
 import webbrowser
+import weakref
+from array import array
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from collections import deque
 from urllib.parse import urlparse, parse_qs
 from datetime import datetime, timezone
-from typing import Optional, Tuple, List, Callable
+from typing import Optional, Tuple, List, Callable, Set
+
+try:  # optional: faster JSON encoding for the live endpoints
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+try:  # optional: batched Gaussian draws for RandomWalk
+    import numpy as np
+except ImportError:
+    np = None
+
+# Precomposed status line and headers for JSON responses of the route server
+_RESP_OK_JSON = (
+    b"HTTP/1.0 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: %d\r\n\r\n"
+)
 
 
 # --- CNV schema based on example file (17 variables) ---
@@ -127,13 +155,29 @@ CITY_COORDS = {
     "hamburg": (53.5511, 9.9937),
     "rotterdam": (51.9244, 4.4777),
 }
+# Lookups lower-case the query once; keep keys normalized for new entries
+CITY_COORDS = {k.strip().lower(): v for k, v in CITY_COORDS.items()}
+
+
+def _city_coords(name: str) -> Optional[Tuple[float, float]]:
+    """Return (lat, lon) for a city/port name, or None if it is unknown."""
+    return CITY_COORDS.get(name.strip().lower())
+
 
 # Variable name helpers
 VAR_KEYS = [name.split(":")[0] for name in NAME_LIST]
+VAR_KEYS_T = tuple(VAR_KEYS)
 VAR_INDEX = {k: i for i, k in enumerate(VAR_KEYS)}
 VAR_INDEX_LC = {k.lower(): i for k, i in VAR_INDEX.items()}
+SCAN_IDX = VAR_INDEX["scan"]
+TIME_IDX = VAR_INDEX["timeS"]
+PUMPS_IDX = VAR_INDEX["pumps"]
 
-
+# Route picker hooks; set once the picker server and a simulator exist
+_ROUTE_LIVE_STATE: Optional[dict] = None
+_ROUTE_REROUTE_CB: Optional[Callable[[dict], None]] = None
+_ROUTE_CONTROL_CB: Optional[Callable[[str], None]] = None
+_ROUTE_SET_SPEED_CB: Optional[Callable[[float], None]] = None
 
 
 def _deg_to_degmin_str(lat_deg: float, lon_deg: float) -> Tuple[str, str]:
@@ -141,19 +185,140 @@ def _deg_to_degmin_str(lat_deg: float, lon_deg: float) -> Tuple[str, str]:
 
     Example: -35.57462 -> "35 34.48 S"
     """
-    def one(val: float, pos_hem: str, neg_hem: str) -> str:
-        hem = pos_hem if val >= 0 else neg_hem
-        aval = abs(val)
-        deg = int(aval)
-        minutes = (aval - deg) * 60.0
-        return f"{deg} {minutes:05.2f} {hem}"
+    alat, alon = abs(lat_deg), abs(lon_deg)
+    dlat, dlon = int(alat), int(alon)
+    return (
+        f"{dlat} {(alat - dlat) * 60.0:05.2f} {'NS'[lat_deg < 0]}",
+        f"{dlon} {(alon - dlon) * 60.0:05.2f} {'EW'[lon_deg < 0]}",
+    )
 
-    return one(lat_deg, "N", "S"), one(lon_deg, "E", "W")
+
+# (epoch second, formatted string) of the last _utc_now_localstr() result
+_utc_now_cache: Tuple[int, str] = (-1, "")
 
 
 def _utc_now_localstr() -> str:
-    """Return current UTC timestamp formatted like the CNV headers expect."""
-    return datetime.now(timezone.utc).strftime("%b %d %Y %H:%M:%S")
+    """Return current UTC timestamp formatted like the CNV headers expect.
+
+    The string only changes once per second, so it is reformatted at most
+    once per second.
+    """
+    global _utc_now_cache
+    now = int(time.time())
+    if _utc_now_cache[0] != now:
+        _utc_now_cache = (
+            now,
+            datetime.fromtimestamp(now, timezone.utc).strftime("%b %d %Y %H:%M:%S"),
+        )
+    return _utc_now_cache[1]
+
+
+class LiveRowRing:
+    """Fixed-capacity ring of the latest rows for the route picker live view.
+
+    Rows are packed as C doubles into one preallocated ``array('d')`` of
+    ``capacity * len(VAR_KEYS)`` values instead of lists of float objects.
+    A single writer (the simulator's on_row callback) fills a slot and then
+    publishes it by advancing ``_widx``; HTTP readers snapshot the index and
+    copy what they need with slices, so neither side takes a lock. A reader
+    re-checks the index after copying and drops rows the writer may have
+    overwritten meanwhile. One slot is kept free so the slot being written
+    is never handed out.
+    """
+
+    WIDTH = len(VAR_KEYS)
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * self.WIDTH * capacity))
+        self._widx = 0  # total rows ever appended; next slot is _widx % capacity
+        self._base = 0  # logical index of the first row after the last clear()
+
+    def _start(self, end: int) -> int:
+        return max(self._base, end - self.capacity + 1)
+
+    def _scan(self, k: int) -> float:
+        return self._data[(k % self.capacity) * self.WIDTH + SCAN_IDX]
+
+    def append(self, row: List[float]) -> None:
+        """Publish ``row``; a restarted scan sequence (new file) clears first."""
+        widx = self._widx
+        if widx > self._base and row[SCAN_IDX] <= self._scan(widx - 1):
+            self._base = widx
+        i = (widx % self.capacity) * self.WIDTH
+        self._data[i:i + self.WIDTH] = array("d", row)
+        self._widx = widx + 1
+
+    def clear(self) -> None:
+        """Drop all rows currently held."""
+        self._base = self._widx
+
+    def __len__(self) -> int:
+        end = self._widx
+        return end - self._start(end)
+
+    def last(self) -> Optional[List[float]]:
+        """Return the most recent row, or None when empty."""
+        end = self._widx
+        if end <= self._start(end):
+            return None
+        i = ((end - 1) % self.capacity) * self.WIDTH
+        return self._data[i:i + self.WIDTH].tolist()
+
+    def after(self, after_scan: int, max_rows: int = 0) -> List[List[float]]:
+        """Return rows with scan > ``after_scan``, oldest first.
+
+        Args:
+            after_scan: Last scan number the caller already has
+            max_rows: Keep only the newest ``max_rows`` rows when positive
+
+        Returns:
+            List of row lists
+        """
+        end = self._widx
+        cap, width = self.capacity, self.WIDTH
+        # Binary search for the first scan > after_scan (scans ascend)
+        lo, hi = self._start(end), end
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._scan(mid) <= after_scan:
+                lo = mid + 1
+            else:
+                hi = mid
+        start = max(lo, end - max_rows) if max_rows > 0 else lo
+        n = end - start
+        if n <= 0:
+            return []
+        i = start % cap
+        if i + n <= cap:
+            flat = self._data[i * width:(i + n) * width].tolist()
+        else:
+            flat = self._data[i * width:].tolist() + self._data[:(i + n - cap) * width].tolist()
+        lost = self._start(self._widx) - start
+        first = max(lost, 0) * width
+        return [flat[k:k + width] for k in range(first, len(flat), width)]
+
+
+def _load_static_files(doc_root: Path) -> dict:
+    """Read the route picker's static files into ready-to-send responses.
+
+    Returns a mapping of URL path (e.g. "/route_picker.html") to the full
+    HTTP response bytes, so the handler serves them with a single write and
+    no per-request filesystem access.
+    """
+    static = {}
+    for p in doc_root.iterdir():
+        if not p.is_file():
+            continue
+        ctype = mimetypes.guess_type(p.name)[0] or "application/octet-stream"
+        body = p.read_bytes()
+        head = (
+            "HTTP/1.0 200 OK\r\n"
+            f"Content-Type: {ctype}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode("ascii")
+        static["/" + p.name] = head + body
+    return static
 
 
 def _run_route_picker_and_wait(cnv_path: Optional[str] = None, timeout_sec: float = 600.0):
@@ -176,8 +341,8 @@ def _run_route_picker_and_wait(cnv_path: Optional[str] = None, timeout_sec: floa
         "event": threading.Event(),
         "selection": None,
         "doc_root": str(doc_root),
-        "rows": deque(maxlen=10000),
-        "lock": threading.Lock(),
+        "ring": LiveRowRing(10000),
+        "static_files": _load_static_files(doc_root),
         "cnv_path": cnv_path,
     }
 
@@ -185,6 +350,9 @@ def _run_route_picker_and_wait(cnv_path: Optional[str] = None, timeout_sec: floa
         def log_message(self, format, *args):
             # Quieter server
             pass
+        def _send_json(self, out: bytes):
+            # Status line, headers and body go out in a single write
+            self.wfile.write(_RESP_OK_JSON % len(out) + out)
         def translate_path(self, path):
             # Serve files from doc_root regardless of CWD
             root = Path(state["doc_root"]).resolve()
@@ -218,65 +386,49 @@ def _run_route_picker_and_wait(cnv_path: Optional[str] = None, timeout_sec: floa
                     state["event"].set()
                     # Call reroute callback and ensure writer is running
                     try:
-                        cb = globals().get("_ROUTE_REROUTE_CB")
+                        cb = _ROUTE_REROUTE_CB
                         if cb:
                             cb(sel)
                     except Exception:
                         pass
                     try:
-                        ctrl = globals().get("_ROUTE_CONTROL_CB")
+                        ctrl = _ROUTE_CONTROL_CB
                         if ctrl:
                             ctrl("resume")
                     except Exception:
                         pass
-                    out = json.dumps({"ok": True}).encode("utf-8")
-                    self.send_response(200)
-                    self.send_header("Content-Type", "application/json")
-                    self.send_header("Content-Length", str(len(out)))
-                    self.end_headers()
-                    self.wfile.write(out)
+                    out = _dumps({"ok": True})
+                    self._send_json(out)
                 except Exception:
                     self.send_response(400)
                     self.end_headers()
             elif self.path == "/control/pause":
                 try:
-                    cb = globals().get("_ROUTE_CONTROL_CB")
+                    cb = _ROUTE_CONTROL_CB
                     if cb:
                         cb("pause")
-                    out = json.dumps({"ok": True, "action": "pause"}).encode("utf-8")
-                    self.send_response(200)
-                    self.send_header("Content-Type", "application/json")
-                    self.send_header("Content-Length", str(len(out)))
-                    self.end_headers()
-                    self.wfile.write(out)
+                    out = _dumps({"ok": True, "action": "pause"})
+                    self._send_json(out)
                 except Exception:
                     self.send_response(500)
                     self.end_headers()
             elif self.path == "/control/resume":
                 try:
-                    cb = globals().get("_ROUTE_CONTROL_CB")
+                    cb = _ROUTE_CONTROL_CB
                     if cb:
                         cb("resume")
-                    out = json.dumps({"ok": True, "action": "resume"}).encode("utf-8")
-                    self.send_response(200)
-                    self.send_header("Content-Type", "application/json")
-                    self.send_header("Content-Length", str(len(out)))
-                    self.end_headers()
-                    self.wfile.write(out)
+                    out = _dumps({"ok": True, "action": "resume"})
+                    self._send_json(out)
                 except Exception:
                     self.send_response(500)
                     self.end_headers()
             elif self.path == "/control/clear":
                 try:
-                    cb = globals().get("_ROUTE_CONTROL_CB")
+                    cb = _ROUTE_CONTROL_CB
                     if cb:
                         cb("clear")
-                    out = json.dumps({"ok": True, "action": "clear"}).encode("utf-8")
-                    self.send_response(200)
-                    self.send_header("Content-Type", "application/json")
-                    self.send_header("Content-Length", str(len(out)))
-                    self.end_headers()
-                    self.wfile.write(out)
+                    out = _dumps({"ok": True, "action": "clear"})
+                    self._send_json(out)
                 except Exception:
                     self.send_response(500)
                     self.end_headers()
@@ -286,15 +438,11 @@ def _run_route_picker_and_wait(cnv_path: Optional[str] = None, timeout_sec: floa
                     raw = self.rfile.read(length)
                     obj = json.loads(raw.decode("utf-8"))
                     val = float(obj.get("speed_knots"))
-                    cb = globals().get("_ROUTE_SET_SPEED_CB")
+                    cb = _ROUTE_SET_SPEED_CB
                     if cb:
                         cb(val)
-                    out = json.dumps({"ok": True, "action": "speed", "speed_knots": val}).encode("utf-8")
-                    self.send_response(200)
-                    self.send_header("Content-Type", "application/json")
-                    self.send_header("Content-Length", str(len(out)))
-                    self.end_headers()
-                    self.wfile.write(out)
+                    out = _dumps({"ok": True, "action": "speed", "speed_knots": val})
+                    self._send_json(out)
                 except Exception:
                     self.send_response(400)
                     self.end_headers()
@@ -314,45 +462,33 @@ def _run_route_picker_and_wait(cnv_path: Optional[str] = None, timeout_sec: floa
                             result = {"has_start": True, "start_lat": last_lat, "start_lon": last_lon}
                 except Exception:
                     result = {"has_start": False}
-                out = json.dumps(result).encode("utf-8")
-                self.send_response(200)
-                self.send_header("Content-Type", "application/json")
-                self.send_header("Content-Length", str(len(out)))
-                self.end_headers()
-                self.wfile.write(out)
+                out = _dumps(result)
+                self._send_json(out)
                 return
             if parsed.path == "/live/status":
-                with state["lock"]:
-                    last_scan = 0
-                    if state["rows"]:
-                        try:
-                            last_scan = int(state["rows"][-1][VAR_INDEX["scan"]])
-                        except Exception:
-                            last_scan = 0
-                    out = json.dumps({
-                        "ok": True,
-                        "rows": len(state["rows"]),
-                        "last_scan": last_scan,
-                    }).encode("utf-8")
-                self.send_response(200)
-                self.send_header("Content-Type", "application/json")
-                self.send_header("Content-Length", str(len(out)))
-                self.end_headers()
-                self.wfile.write(out)
+                ring = state["ring"]
+                last = ring.last()
+                last_scan = 0
+                if last is not None:
+                    try:
+                        last_scan = int(last[SCAN_IDX])
+                    except Exception:
+                        last_scan = 0
+                out = _dumps({
+                    "ok": True,
+                    "rows": len(ring),
+                    "last_scan": last_scan,
+                })
+                self._send_json(out)
                 return
             if parsed.path == "/live/latest":
-                with state["lock"]:
-                    if not state["rows"]:
-                        self.send_response(204)
-                        self.end_headers()
-                        return
-                    obj = _row_to_obj(state["rows"][-1])
-                    out = json.dumps(obj).encode("utf-8")
-                self.send_response(200)
-                self.send_header("Content-Type", "application/json")
-                self.send_header("Content-Length", str(len(out)))
-                self.end_headers()
-                self.wfile.write(out)
+                last = state["ring"].last()
+                if last is None:
+                    self.send_response(204)
+                    self.end_headers()
+                    return
+                out = _dumps(_row_to_obj(last))
+                self._send_json(out)
                 return
             if parsed.path == "/live/after":
                 qs = parse_qs(parsed.query or "")
@@ -364,25 +500,15 @@ def _run_route_picker_and_wait(cnv_path: Optional[str] = None, timeout_sec: floa
                     max_rows = int(qs.get("max", [200])[0])
                 except Exception:
                     max_rows = 200
-                with state["lock"]:
-                    result = []
-                    for r in state["rows"]:
-                        try:
-                            sc = int(r[VAR_INDEX["scan"]])
-                        except Exception:
-                            sc = 0
-                        if sc > after_scan:
-                            result.append(_row_to_obj(r))
-                    if len(result) > max_rows:
-                        result = result[-max_rows:]
-                    out = json.dumps(result).encode("utf-8")
-                self.send_response(200)
-                self.send_header("Content-Type", "application/json")
-                self.send_header("Content-Length", str(len(out)))
-                self.end_headers()
-                self.wfile.write(out)
+                rows = state["ring"].after(after_scan, max_rows)
+                out = _dumps({"keys": VAR_KEYS_T, "rows": rows})
+                self._send_json(out)
+                return
+            # static files are served from memory; anything else from disk
+            blob = state["static_files"].get(parsed.path)
+            if blob is not None:
+                self.wfile.write(blob)
                 return
-            # default: static file
             return super().do_GET()
 
     # Bind to an available port on localhost
@@ -416,90 +542,10 @@ def _run_route_picker_and_wait(cnv_path: Optional[str] = None, timeout_sec: floa
     return state["selection"]
 
 
-def _format_header(
-    file_hex_path: str,
-    operator: str = "Scott",
-    ship: str = "Investigator",
-    cruise: str = "in2020_v09",
-    station: str = "7",
-    start_lat: float = -35.57462,
-    start_lon: float = 154.30952,
-    interval_sec: float = 0.0416667,
-    start_time_utc: Optional[datetime] = None,
-) -> str:
-    """Build a realistic CNV header string.
-
-    The header mirrors the structure of Sea-Bird Seasave output, including
-    instrument metadata, variable schema, spans, and a sensors block copied as
-    comments for realism. The resulting string ends with "*END*" and a newline.
-    """
-    dt_utc = start_time_utc or datetime.now(timezone.utc)
-    sys_upload_time = dt_utc.strftime("%b %d %Y %H:%M:%S")
-    nmea_time = dt_utc.strftime("%b %d %Y  %H:%M:%S")
-    system_utc = dt_utc.strftime("%b %d %Y %H:%M:%S")
-    start_time_line = dt_utc.strftime("%b %d %Y %H:%M:%S")
-    nmea_lat_str, nmea_lon_str = _deg_to_degmin_str(start_lat, start_lon)
-
-    lines: List[str] = []
-    lines.append("* Sea-Bird SBE 9 Data File:")
-    lines.append(f"* FileName = {file_hex_path}")
-    lines.append("* Software Version Seasave V 7.26.7.110")
-    lines.append("* Temperature SN = 5932")
-    lines.append("* Conductivity SN = 3168")
-    lines.append("* Number of Bytes Per Scan = 41")
-    lines.append("* Number of Voltage Words = 4")
-    lines.append("* Number of Scans Averaged by the Deck Unit = 1")
-    lines.append("* Append System Time to Every Scan")
-    lines.append(f"* System UpLoad Time = {sys_upload_time}")
-    lines.append(f"* NMEA Latitude = {nmea_lat_str}")
-    lines.append(f"* NMEA Longitude = {nmea_lon_str}")
-    lines.append(f"* NMEA UTC (Time) = {nmea_time}")
-    lines.append("* Store Lat/Lon Data = Append to Every Scan")
-    lines.append(f"** Operator: {operator}")
-    lines.append("** CTD config:")
-    lines.append(f"** Ship: {ship}")
-    lines.append(f"** Cruise: {cruise}")
-    lines.append(f"** Station:  {station}")
-    lines.append("** Latitude:")
-    lines.append("** Longitude:")
-    lines.append("** Depth:")
-    lines.append(f"* System UTC = {system_utc}")
-
-    # Schema
-    lines.append(f"# nquan = {len(NAME_LIST)}")
-    lines.append(f"# nvalues = 0")
-    lines.append("# units = specified")
-    for i, name in enumerate(NAME_LIST):
-        lines.append(f"# name {i} = {name}")
-    for i, (vmin, vmax) in enumerate(zip(SPAN_MIN, SPAN_MAX)):
-        # Preserve formatting similar to sample
-        if i in (7, 16):
-            vmin_s = f"{vmin:.4e}"
-            vmax_s = f"{vmax:.4e}"
-        elif i in (11, 13):
-            vmin_s = f"{int(vmin):10d}".strip()
-            vmax_s = f"{int(vmax):10d}".strip()
-        else:
-            # choose 4 or 6 or 3 decimals depending on column
-            if i in (2,):
-                vmin_s = f"{vmin:8.3f}".strip()
-                vmax_s = f"{vmax:8.3f}".strip()
-            elif i in (1, 4):
-                vmin_s = f"{vmin:.6f}"
-                vmax_s = f"{vmax:.6f}"
-            else:
-                vmin_s = f"{vmin:.4f}"
-                vmax_s = f"{vmax:.4f}"
-        lines.append(f"# span {i} = {vmin_s:>12}, {vmax_s:>12}")
-
-    lines.append(f"# interval = seconds: {interval_sec}")
-    lines.append(f"# start_time = {start_time_line} [System UTC, first data scan.]")
-    lines.append(f"# bad_flag = {BAD_FLAG}")
-
-    # Sensors block is copied as comments for realism (static text)
-    # Note: This is not parsed or used by the code; it is present to make the
-    # output closely resemble files created by Seasave/datcnv.
-    sensors_block = """
+# Sensors block is copied as comments for realism (static text)
+# Note: This is not parsed or used by the code; it is present to make the
+# output closely resemble files created by Seasave/datcnv.
+_SENSORS_BLOCK = """
 # <Sensors count="13" >
 #   <sensor Channel="1" >
 #     <!-- Frequency 0, Temperature -->
@@ -728,98 +774,313 @@ def _format_header(
 #     <!-- A/D voltage 7, Free -->
 #   </sensor>
 # </Sensors>
-# datcnv_date = {dt} , 7.26.7.129 [datcnv_vars = 16]
+# datcnv_date = %(datcnv_date)s , 7.26.7.129 [datcnv_vars = 16]
 # datcnv_in = D:\\triaxus_processing\\in2023_v06\\seasave\\in2023_v06_07\\in2023_v06_07_XXX.hex D:\\triaxus_processing\\in2023_v06\\seasave\\in2023_v06_07\\in2023_v06_07_XXX.XMLCON
 # datcnv_skipover = 0
 # datcnv_ox_hysteresis_correction = yes
 # datcnv_ox_tau_correction = yes
 # file_type = ascii
-""".strip("\n").format(dt=datetime.now().strftime("%b %d %Y %H:%M:%S"))
-    lines.extend(sensors_block.splitlines())
+""".strip("\n")
+
 
+def _format_spans() -> str:
+    """Format the "# span" lines, which only depend on SPAN_MIN/SPAN_MAX."""
+    lines: List[str] = []
+    for i, (vmin, vmax) in enumerate(zip(SPAN_MIN, SPAN_MAX)):
+        # Preserve formatting similar to sample
+        if i in (7, 16):
+            vmin_s = f"{vmin:.4e}"
+            vmax_s = f"{vmax:.4e}"
+        elif i in (11, 13):
+            vmin_s = f"{int(vmin):10d}".strip()
+            vmax_s = f"{int(vmax):10d}".strip()
+        else:
+            # choose 4 or 6 or 3 decimals depending on column
+            if i in (2,):
+                vmin_s = f"{vmin:8.3f}".strip()
+                vmax_s = f"{vmax:8.3f}".strip()
+            elif i in (1, 4):
+                vmin_s = f"{vmin:.6f}"
+                vmax_s = f"{vmax:.6f}"
+            else:
+                vmin_s = f"{vmin:.4f}"
+                vmax_s = f"{vmax:.4f}"
+        lines.append(f"# span {i} = {vmin_s:>12}, {vmax_s:>12}")
+    return "\n".join(lines)
+
+
+# Spans are constants, so their block is formatted once at import time
+_SPAN_BLOCK = _format_spans()
+
+
+def _build_header_template() -> str:
+    """Assemble the CNV header once, with %-placeholders for per-file fields."""
+    lines: List[str] = [
+        "* Sea-Bird SBE 9 Data File:",
+        "* FileName = %(file)s",
+        "* Software Version Seasave V 7.26.7.110",
+        "* Temperature SN = 5932",
+        "* Conductivity SN = 3168",
+        "* Number of Bytes Per Scan = 41",
+        "* Number of Voltage Words = 4",
+        "* Number of Scans Averaged by the Deck Unit = 1",
+        "* Append System Time to Every Scan",
+        "* System UpLoad Time = %(ts)s",
+        "* NMEA Latitude = %(nmea_lat)s",
+        "* NMEA Longitude = %(nmea_lon)s",
+        "* NMEA UTC (Time) = %(nmea_time)s",
+        "* Store Lat/Lon Data = Append to Every Scan",
+        "** Operator: %(operator)s",
+        "** CTD config:",
+        "** Ship: %(ship)s",
+        "** Cruise: %(cruise)s",
+        "** Station:  %(station)s",
+        "** Latitude:",
+        "** Longitude:",
+        "** Depth:",
+        "* System UTC = %(ts)s",
+        # Schema
+        f"# nquan = {len(NAME_LIST)}",
+        "# nvalues = 0",
+        "# units = specified",
+    ]
+    # Names are static text; escape "%" (e.g. "[%]") for the substitution
+    lines.extend(
+        f"# name {i} = {name}".replace("%", "%%") for i, name in enumerate(NAME_LIST)
+    )
+    lines.append(_SPAN_BLOCK)
+    lines.append("# interval = seconds: %(interval)s")
+    lines.append("# start_time = %(ts)s [System UTC, first data scan.]")
+    lines.append(f"# bad_flag = {BAD_FLAG}")
+    lines.extend(_SENSORS_BLOCK.splitlines())
     lines.append("*END*")
     return "\n".join(lines) + "\n"
 
 
-def _fmt_row(values: List[float]) -> str:
+HEADER_TEMPLATE = _build_header_template()
+
+
+def _format_header(
+    file_hex_path: str,
+    operator: str = "Scott",
+    ship: str = "Investigator",
+    cruise: str = "in2020_v09",
+    station: str = "7",
+    start_lat: float = -35.57462,
+    start_lon: float = 154.30952,
+    interval_sec: float = 0.0416667,
+    start_time_utc: Optional[datetime] = None,
+) -> str:
+    """Build a realistic CNV header string.
+
+    The header mirrors the structure of Sea-Bird Seasave output, including
+    instrument metadata, variable schema, spans, and a sensors block copied as
+    comments for realism. The resulting string ends with "*END*" and a newline.
+    Only the per-file fields are substituted into HEADER_TEMPLATE.
+    """
+    dt_utc = start_time_utc or datetime.now(timezone.utc)
+    # One strftime serves every timestamp line; NMEA uses two spaces before the time
+    ts = dt_utc.strftime("%b %d %Y %H:%M:%S")
+    nmea_date, nmea_clock = ts.rsplit(" ", 1)
+    nmea_lat_str, nmea_lon_str = _deg_to_degmin_str(start_lat, start_lon)
+    return HEADER_TEMPLATE % {
+        "file": file_hex_path,
+        "ts": ts,
+        "nmea_lat": nmea_lat_str,
+        "nmea_lon": nmea_lon_str,
+        "nmea_time": f"{nmea_date}  {nmea_clock}",
+        "operator": operator,
+        "ship": ship,
+        "cruise": cruise,
+        "station": station,
+        "interval": interval_sec,
+        "datcnv_date": datetime.now().strftime("%b %d %Y %H:%M:%S"),
+    }
+
+
+# printf-style template for one data row, spacing similar to sample CNV output.
+# Applying it with ``%`` formats all 19 columns in one C-level call; it is a
+# bytes template so rows go to the binary file handle without an encode step.
+_ROW_FMT = (
+    b"%10.4f %10.6f %10.3f %10.4f %10.6f %10.3f %10.3f %10.4e %10.4f "
+    b"%10.4f %10.4f %10.3f %10.3f %10d %10.3f %10d %10.5f %10.5f %10.3e\n"
+)
+
+# Upper bound on rows generated and written together when the writer falls
+# behind its schedule.
+MAX_BATCH_ROWS = 512
+
+# The CNV handle is block buffered; by default rows are flushed at most this
+# often (see CNVSimulator's flush_interval) so live readers still see new
+# scans promptly, and on pause/stop/switch.
+WRITE_BUFFER_BYTES = 1 << 20
+FLUSH_INTERVAL_SEC = 0.5
+
+
+def _fmt_row(values: List[float]) -> bytes:
     """Format one data row using spacing similar to sample CNV output."""
-    (
-        t0,
-        c0,
-        pr,
-        t1,
-        c1,
-        o0,
-        o1,
-        par,
-        cstar,
-        sal0,
-        sal1,
-        fleco_afl,
-        ph,
-        scan,
-        times,
-        pumps,
-        lat,
-        lon,
-        flag,
-    ) = values
-
-    parts = [
-        f"{t0:10.4f}",
-        f"{c0:10.6f}",
-        f"{pr:10.3f}",
-        f"{t1:10.4f}",
-        f"{c1:10.6f}",
-        f"{o0:10.3f}",
-        f"{o1:10.3f}",
-        f"{par:10.4e}",
-        f"{cstar:10.4f}",
-        f"{sal0:10.4f}",
-        f"{sal1:10.4f}",
-        f"{fleco_afl:10.3f}",
-        f"{ph:10.3f}",
-        f"{int(scan):10d}",
-        f"{times:10.3f}",
-        f"{int(pumps):10d}",
-        f"{lat:10.5f}",
-        f"{lon:10.5f}",
-        f"{flag:10.3e}",
-    ]
-    return " ".join(parts) + "\n"
+    return _ROW_FMT % tuple(values)
+
+
+@functools.lru_cache(maxsize=MAX_BATCH_ROWS)
+def _batch_fmt(n: int) -> bytes:
+    """Return the printf template for ``n`` rows, built once per batch size."""
+    return _ROW_FMT * n
+
+
+def _fmt_rows(rows: List[List[float]]) -> bytes:
+    """Format several data rows into one bytes blob with a single ``%`` call."""
+    if len(rows) == 1:
+        # Common case at normal rates: one row per tick
+        return _ROW_FMT % tuple(rows[0])
+    return _batch_fmt(len(rows)) % tuple(itertools.chain.from_iterable(rows))
 
 
 class RandomWalk:
     """Small helper for bounded random-walk value generation.
 
     Each call to ``step`` nudges a value by a Gaussian delta and reflects
-    against the provided [vmin, vmax] bounds to stay within range.
+    against the provided [vmin, vmax] bounds to stay within range. Unit
+    normals are drawn in blocks of ``NORMAL_BATCH`` (with NumPy when it is
+    installed) and consumed one per step. ``step_many`` advances a whole
+    vector of values with one NumPy expression. The PAR floor draws are
+    batched the same way, so no per-tick call reaches the RNG.
     """
 
+    NORMAL_BATCH = 4096
+
     def __init__(self, seed: Optional[int] = None):
         self._rng = random.Random(seed)
+        self._ng = np.random.default_rng(seed) if np is not None else None
+        self._buf: List[float] = []
+        self._pos = 0
+        self._vbuf = None  # NumPy block for step_many
+        self._vpos = 0
+        self._floor_draws: List[bool] = []  # choose_par_floor outcomes
+        self._floor_pos = 0
+
+    def _refill(self):
+        """Draw the next block of standard normal values."""
+        if self._ng is not None:
+            self._buf = self._ng.standard_normal(self.NORMAL_BATCH).tolist()
+        else:
+            gauss = self._rng.gauss
+            self._buf = [gauss(0.0, 1.0) for _ in range(self.NORMAL_BATCH)]
+        self._pos = 0
 
     def step(self, value: float, vmin: float, vmax: float, sigma: float) -> float:
         """Advance ``value`` by a Gaussian step and keep it within bounds."""
-        delta = self._rng.gauss(0.0, sigma)
-        newv = value + delta
-        if newv < vmin:
-            newv = vmin + (vmin - newv)
-        if newv > vmax:
-            newv = vmax - (newv - vmax)
-        return max(vmin, min(vmax, newv))
+        if self._pos >= len(self._buf):
+            self._refill()
+        delta = self._buf[self._pos] * sigma
+        self._pos += 1
+        span = vmax - vmin
+        if span <= 0.0:
+            return vmin
+        # Fold the offset with a triangle wave of period 2*span: values inside
+        # the range are unchanged and any overshoot is reflected back in
+        return vmax - abs((value + delta - vmin) % (2.0 * span) - span)
+
+    def step_many(self, values, vmin, vmax, sigma) -> None:
+        """Advance every entry of ``values`` in place, as ``step`` would.
+
+        With NumPy, all arguments are float arrays of equal length (bounds
+        must satisfy vmax > vmin) and the update is vectorized; otherwise
+        they are lists and ``step`` is applied per entry.
+        """
+        n = len(values)
+        if self._ng is None:
+            step = self.step
+            for i in range(n):
+                values[i] = step(values[i], vmin[i], vmax[i], sigma[i])
+            return
+        if self._vbuf is None or self._vpos + n > len(self._vbuf):
+            self._vbuf = self._ng.standard_normal(self.NORMAL_BATCH * n)
+            self._vpos = 0
+        z = self._vbuf[self._vpos:self._vpos + n]
+        self._vpos += n
+        span = vmax - vmin
+        # Same triangle-wave fold as step(), on the whole vector
+        values += z * sigma - vmin
+        np.remainder(values, 2.0 * span, out=values)
+        values -= span
+        np.abs(values, out=values)
+        np.subtract(vmax, values, out=values)
 
     def choose_par_floor(self) -> float:
         """Occasionally force PAR to its low floor, mimicking night readings."""
-        return 1.0e-12 if self._rng.random() < 0.1 else None  # 10% chance
+        if self._ng is None:
+            return 1.0e-12 if self._rng.random() < 0.1 else None  # 10% chance
+        if self._floor_pos >= len(self._floor_draws):
+            self._floor_draws = (self._ng.random(self.NORMAL_BATCH) < 0.1).tolist()
+            self._floor_pos = 0
+        hit = self._floor_draws[self._floor_pos]
+        self._floor_pos += 1
+        return 1.0e-12 if hit else None
 
 
 def _row_to_obj(row: List[float]) -> dict:
     """Convert a numeric row list to a dict keyed by variable names."""
-    obj = {}
-    for i, key in enumerate(VAR_KEYS):
-        obj[key] = row[i]
-    return obj
+    return dict(zip(VAR_KEYS_T, row))
+
+
+# Output directories already created by this process
+_ENSURED_DIRS: Set[str] = set()
+
+
+def _ensure_dir(path: str):
+    """Create the parent directory of ``path`` once per process."""
+    d = os.path.dirname(path) or "."
+    if d not in _ENSURED_DIRS:
+        os.makedirs(d, exist_ok=True)
+        _ENSURED_DIRS.add(d)
+
+
+# (path, size, mtime_ns, line) of the last tail lookup
+_last_line_cache: Tuple[str, int, int, str] = ("", -1, -1, "")
+
+
+def _read_last_data_line(path: str) -> str:
+    """Return the last non-empty, non-header line of a CNV file.
+
+    The file is memory-mapped and searched backwards from EOF, so only the
+    pages holding the tail are read regardless of file size. Returns "" if
+    the file is empty or holds no data lines. While the file's size and
+    modification time are unchanged the previous result is reused without
+    opening the file again.
+    """
+    global _last_line_cache
+    st = os.stat(path)
+    cached_path, cached_size, cached_mtime, cached_line = _last_line_cache
+    if cached_path == path and cached_size == st.st_size and cached_mtime == st.st_mtime_ns:
+        return cached_line
+    with open(path, "rb") as f:
+        line = _scan_last_data_line(f)
+    _last_line_cache = (path, st.st_size, st.st_mtime_ns, line)
+    return line
+
+
+def _scan_last_data_line(f) -> str:
+    """Reverse-scan a readable binary CNV handle for its last data line.
+
+    The file is memory-mapped through its descriptor, so the handle's
+    position and write buffer are left untouched.
+    """
+    if os.fstat(f.fileno()).st_size == 0:
+        return ""
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = len(mm)
+        while end > 0:
+            start = mm.rfind(b"\n", 0, end - 1) + 1
+            line = mm[start:end]
+            if line.strip() and line[:1] not in (b"*", b"#"):
+                return line.decode("utf-8", errors="replace")
+            end = start
+    return ""
+
+
+# Plain decimal or exponent notation, as written by _ROW_FMT
+_looks_numeric = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?").fullmatch
 
 
 def _read_last_lat_lon(path: str) -> Tuple[Optional[float], Optional[float]]:
@@ -827,23 +1088,31 @@ def _read_last_lat_lon(path: str) -> Tuple[Optional[float], Optional[float]]:
 
     Returns (lat, lon) or (None, None) if not found or parse error.
     """
-    last_line = ""
     try:
-        with open(path, "r") as rf:
-            for line in rf:
-                if line.strip() and not line.startswith("*") and not line.startswith("#"):
-                    last_line = line
-        if last_line:
-            cols = last_line.split()
-            if len(cols) >= 16:
-                lat = float(cols[14])
-                lon = float(cols[15])
-                return lat, lon
-    except Exception:
-        pass
+        last_line = _read_last_data_line(path)
+    except OSError:
+        return None, None
+    # lat/lon are the last columns before the flag; split from the right
+    # only as far as they go. A row cut short by a concurrent append is
+    # rejected by the pattern check rather than by a float() exception.
+    cols = last_line.rsplit(None, 3)
+    if len(cols) == 4 and _looks_numeric(cols[1]) and _looks_numeric(cols[2]):
+        return float(cols[1]), float(cols[2])
     return None, None
 
 
+def _sincos(x: float) -> Tuple[float, float]:
+    """Return ``(sin(x), cos(x))`` so callers evaluate each angle once."""
+    return math.sin(x), math.cos(x)
+
+
+def _unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    """Return the earth-centred unit vector of a lat/lon position in degrees."""
+    sin_phi, cos_phi = _sincos(math.radians(lat))
+    sin_lam, cos_lam = _sincos(math.radians(lon))
+    return cos_phi * cos_lam, cos_phi * sin_lam, sin_phi
+
+
 class MissionTrack:
     """Straight-line mission track between two lat/lon points.
 
@@ -851,10 +1120,13 @@ class MissionTrack:
       to (end_lat, end_lon).
     - If ``pingpong`` is True, bounces at the ends; otherwise clamps at the end.
     - Speed is specified in knots for user friendliness; internal uses m/s.
-    - Uses a simple local-plane approximation suitable for small mission spans.
+    - Follows the great circle between the end points; tracks shorter than
+      ``FLAT_TRACK_MAX_M`` use a simple local-plane approximation instead.
     """
 
     KNOT_TO_MPS = 0.514444
+    EARTH_RADIUS_M = 6371008.8
+    FLAT_TRACK_MAX_M = 1000.0
 
     def __init__(
         self,
@@ -865,12 +1137,23 @@ class MissionTrack:
         speed_knots: float = 4.0,
         pingpong: bool = False,
     ):
+        self.pingpong = bool(pingpong)
+        # Distance covered per step() for the bound tick interval
+        self._dt = 0.0
+        self._ds_per_tick = 0.0
+        self.speed_mps = max(0.0, float(speed_knots)) * self.KNOT_TO_MPS
+        self.reconfigure(start_lat, start_lon, end_lat, end_lon)
+
+    def reconfigure(self, start_lat: float, start_lon: float, end_lat: float, end_lon: float):
+        """Move the track to new end points and restart at the start point.
+
+        Recomputes the track geometry in place; speed, pingpong and the bound
+        tick interval are kept. Not thread-safe against a concurrent ``step``.
+        """
         self.start_lat = start_lat
         self.start_lon = start_lon
         self.end_lat = end_lat
         self.end_lon = end_lon
-        self.speed_mps = max(0.0, float(speed_knots)) * self.KNOT_TO_MPS
-        self.pingpong = bool(pingpong)
 
         # Precompute track geometry
         self._dlat_deg = self.end_lat - self.start_lat
@@ -886,9 +1169,40 @@ class MissionTrack:
         self._deg_lat_per_m = (self._dlat_deg / self._length_m) if self._length_m > 0 else 0.0
         self._deg_lon_per_m = (self._dlon_deg / self._length_m) if self._length_m > 0 else 0.0
 
-        # Distance progressed from start along the line in meters and direction (1 or -1)
+        # Longer tracks follow the great circle. Haversine gives the length;
+        # positions are then A*cos(s/R) + C*sin(s/R) with A the start unit
+        # vector and C the unit vector 90 degrees along the track from A.
+        self._geodesic = False
+        if self._length_m >= self.FLAT_TRACK_MAX_M:
+            # Each angle's sin/cos is evaluated once and shared by the
+            # haversine length and the unit vectors
+            sin_p1, cos_p1 = _sincos(math.radians(self.start_lat))
+            sin_p2, cos_p2 = _sincos(math.radians(self.end_lat))
+            sin_l1, cos_l1 = _sincos(math.radians(self.start_lon))
+            sin_l2, cos_l2 = _sincos(math.radians(self.end_lon))
+            sin_half_dphi = math.sin(math.radians(self._dlat_deg) / 2.0)
+            sin_half_dlam = math.sin(math.radians(self._dlon_deg) / 2.0)
+            a = sin_half_dphi ** 2 + cos_p1 * cos_p2 * sin_half_dlam ** 2
+            a = min(1.0, a)
+            delta = 2.0 * math.atan2(math.sqrt(a), math.sqrt(1.0 - a))
+            if 0.0 < delta < math.pi:
+                ax, ay, az = cos_p1 * cos_l1, cos_p1 * sin_l1, sin_p1
+                bx, by, bz = cos_p2 * cos_l2, cos_p2 * sin_l2, sin_p2
+                # sin/cos of delta follow from a without further trig calls
+                sin_d = 2.0 * math.sqrt(a * (1.0 - a))
+                cos_d = 1.0 - 2.0 * a
+                self._axis_a = (ax, ay, az)
+                self._axis_c = ((bx - ax * cos_d) / sin_d,
+                                (by - ay * cos_d) / sin_d,
+                                (bz - az * cos_d) / sin_d)
+                self._rad_per_m = 1.0 / self.EARTH_RADIUS_M
+                self._length_m = delta * self.EARTH_RADIUS_M
+                self._geodesic = True
+
+        # Total distance travelled (monotonic, unfolded) and the resulting
+        # position along the line in meters
+        self._u = 0.0
         self._s_m = 0.0
-        self._dir = 1
 
     def reset_position(self, lat: float, lon: float):
         """Align the along-track distance to the provided lat/lon.
@@ -897,47 +1211,118 @@ class MissionTrack:
         clamps within [0, length].
         """
         if self._length_m <= 0:
-            self._s_m = 0.0
+            self._u = self._s_m = 0.0
+            return
+        if self._geodesic:
+            # Angle of the point's projection onto the track's great circle
+            px, py, pz = _unit_vector(lat, lon)
+            ax, ay, az = self._axis_a
+            cx, cy, cz = self._axis_c
+            angle = math.atan2(px * cx + py * cy + pz * cz, px * ax + py * ay + pz * az)
+            self._set_position(angle * self.EARTH_RADIUS_M)
             return
         # Work purely in degrees to find fraction, then scale by length_m
         dv_lat = lat - self.start_lat
         dv_lon = lon - self.start_lon
         denom = (self._dlat_deg ** 2 + self._dlon_deg ** 2)
         if denom <= 0:
-            self._s_m = 0.0
+            self._u = self._s_m = 0.0
             return
         t = (dv_lat * self._dlat_deg + dv_lon * self._dlon_deg) / denom
-        t = max(0.0, min(1.0, t))
-        self._s_m = t * self._length_m
+        self._set_position(t * self._length_m)
+
+    def _set_position(self, s_m: float):
+        """Move to ``s_m`` meters along the track, clamped to [0, length]."""
+        self._s_m = max(0.0, min(self._length_m, s_m))
+        # Keep the current heading: on the return leg the unfolded distance
+        # lies in (L, 2L)
+        two_l = 2.0 * self._length_m
+        if self.pingpong and math.fmod(self._u, two_l) > self._length_m:
+            self._u = two_l - self._s_m
+        else:
+            self._u = self._s_m
+
+    @property
+    def speed_mps(self) -> float:
+        return self._speed_mps
+
+    @speed_mps.setter
+    def speed_mps(self, value: float):
+        self._speed_mps = value
+        self._ds_per_tick = value * self._dt
+
+    def bind_interval(self, dt: float):
+        """Precompute the along-track distance of one ``step(dt)``."""
+        self._dt = max(0.0, dt)
+        self._ds_per_tick = self._speed_mps * self._dt
 
     def step(self, dt: float) -> Tuple[float, float]:
         if self._length_m <= 0:
             # Degenerate: stay at end
             return self.end_lat, self.end_lon
 
-        ds = self.speed_mps * max(0.0, dt) * self._dir
-        self._s_m += ds
+        if dt != self._dt:
+            self.bind_interval(dt)
+        length = self._length_m
         if self.pingpong:
-            # Reflect at ends
-            if self._s_m > self._length_m:
-                over = self._s_m - self._length_m
-                self._s_m = self._length_m - over
-                self._dir *= -1
-            elif self._s_m < 0.0:
-                self._s_m = -self._s_m
-                self._dir *= -1
+            # Reflect at ends: fold the unfolded distance with a triangle wave
+            two_l = 2.0 * length
+            self._u = u = math.fmod(self._u + self._ds_per_tick, two_l)
+            self._s_m = length - abs(u - length)
         else:
-            # Clamp at ends
-            if self._s_m > self._length_m:
-                self._s_m = self._length_m
-            if self._s_m < 0.0:
-                self._s_m = 0.0
+            # Clamp at the end
+            self._u = u = min(self._u + self._ds_per_tick, length)
+            self._s_m = u
+
+        if self._geodesic:
+            angle = self._s_m * self._rad_per_m
+            sin_s, cos_s = _sincos(angle)
+            ax, ay, az = self._axis_a
+            cx, cy, cz = self._axis_c
+            x = ax * cos_s + cx * sin_s
+            y = ay * cos_s + cy * sin_s
+            z = az * cos_s + cz * sin_s
+            return (math.degrees(math.atan2(z, math.hypot(x, y))),
+                    math.degrees(math.atan2(y, x)))
 
         lat = self.start_lat + self._deg_lat_per_m * self._s_m
         lon = self.start_lon + self._deg_lon_per_m * self._s_m
         return lat, lon
 
 
+# The first N_SIGNALS columns (t090C .. ph) are random walks. Per-scan
+# Gaussian step sizes are tuned for smoothness; PAR moves 5% of its span.
+N_SIGNALS = 13
+PAR_IDX = 7
+SIGNAL_SIGMA = [
+    0.003, 0.0002, 0.15, 0.003, 0.0002, 0.20, 0.20,
+    (SPAN_MAX[PAR_IDX] - SPAN_MIN[PAR_IDX]) * 0.05,
+    0.10, 0.001, 0.001, 0.01, 0.001,
+]
+
+
+def _signal_vector(values: List[float]):
+    """Return ``values`` as the vector type used by RandomWalk.step_many."""
+    return np.array(values, dtype=np.float64) if np is not None else list(values)
+
+
+_SIG_MIN = _signal_vector(SPAN_MIN[:N_SIGNALS])
+_SIG_MAX = _signal_vector(SPAN_MAX[:N_SIGNALS])
+_SIG_SIGMA = _signal_vector(SIGNAL_SIGMA)
+
+
+# Simulators whose CNV handle may hold buffered rows; flushed at exit because
+# the writer thread is a daemon and stop() is not always reached.
+_OPEN_SIMULATORS: "weakref.WeakSet[CNVSimulator]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_simulators():
+    for sim in list(_OPEN_SIMULATORS):
+        with sim._io_lock:
+            sim._flush()
+
+
 class CNVSimulator:
     """Continuously write simulated scans to a CNV file.
 
@@ -964,9 +1349,12 @@ class CNVSimulator:
         track_speed_knots: float = 6.0,
         track_pingpong: bool = True,
         on_row: Optional[Callable[[List[float]], None]] = None,
+        flush_interval: float = FLUSH_INTERVAL_SEC,
     ):
         self.out_path = out_path
         self.interval = interval
+        # Longest time written rows may sit in the file buffer
+        self.flush_interval = max(0.01, float(flush_interval))
         self.operator = operator
         self.ship = ship
         self.cruise = cruise
@@ -974,8 +1362,24 @@ class CNVSimulator:
         self._rng = RandomWalk(seed)
         self._stop = threading.Event()
         self._run = threading.Event()
+        # Set to wake a paused tick loop early (resume, stop, file switch)
+        self._wake = threading.Event()
+        # File switches are handed to the tick thread and run between two
+        # ticks, so the tick loop itself never takes a lock. _lock only
+        # serializes control calls made from other threads.
         self._lock = threading.Lock()
+        self._pending: Optional[list] = None
+        # wait_for_scan(): set once scan _target_scan has been generated
+        self._target_scan: Optional[int] = None
+        self._target_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        # Rows travel from the tick loop to a separate file writer thread;
+        # _io_lock guards the file handle between that writer and swaps.
+        self._wq: "queue.Queue[Optional[List[List[float]]]]" = queue.Queue(maxsize=1024)
+        self._writer: Optional[threading.Thread] = None
+        # Set when a write fails; the tick loop then stops queueing batches
+        self._writer_failed = False
+        self._io_lock = threading.Lock()
         self._fh = None
         self._count_written = 0
         self._scan = 1
@@ -985,21 +1389,13 @@ class CNVSimulator:
         self._lon = start_lon
         self._track = None  # set below if end_lat/lon provided
         self._on_row = on_row
+        _OPEN_SIMULATORS.add(self)
 
-        # Initialize signal values at mid-spans for a stable starting point.
-        self._t0 = (SPAN_MIN[0] + SPAN_MAX[0]) / 2
-        self._c0 = (SPAN_MIN[1] + SPAN_MAX[1]) / 2
-        self._pr = (SPAN_MIN[2] + SPAN_MAX[2]) / 2
-        self._t1 = (SPAN_MIN[3] + SPAN_MAX[3]) / 2
-        self._c1 = (SPAN_MIN[4] + SPAN_MAX[4]) / 2
-        self._o0 = (SPAN_MIN[5] + SPAN_MAX[5]) / 2
-        self._o1 = (SPAN_MIN[6] + SPAN_MAX[6]) / 2
-        self._par = (SPAN_MIN[7] + SPAN_MAX[7]) / 2
-        self._cstar = (SPAN_MIN[8] + SPAN_MAX[8]) / 2
-        self._sal0 = (SPAN_MIN[9] + SPAN_MAX[9]) / 2
-        self._sal1 = (SPAN_MIN[10] + SPAN_MAX[10]) / 2
-        self._fleco_afl = (SPAN_MIN[11] + SPAN_MAX[11]) / 2
-        self._ph = (SPAN_MIN[12] + SPAN_MAX[12]) / 2
+        # Initialize signal values (columns 0..N_SIGNALS-1) at mid-spans for
+        # a stable starting point.
+        self._sig = _signal_vector(
+            [(SPAN_MIN[i] + SPAN_MAX[i]) / 2 for i in range(N_SIGNALS)]
+        )
 
         # Persist track defaults
         self._track_speed_knots = track_speed_knots
@@ -1028,7 +1424,7 @@ class CNVSimulator:
     # --- File management ---
     def _start_new_file(self):
         """Create a new CNV file and write a fresh header."""
-        os.makedirs(os.path.dirname(self.out_path) or ".", exist_ok=True)
+        _ensure_dir(self.out_path)
         header = _format_header(
             file_hex_path=self.out_path.replace(".cnv", ".hex"),
             operator=self.operator,
@@ -1039,9 +1435,9 @@ class CNVSimulator:
             start_lon=self._lon,
             interval_sec=self.interval,
         )
-        with open(self.out_path, "w", newline="\n") as f:
-            f.write(header)
-        self._fh = open(self.out_path, "a", buffering=1)
+        with open(self.out_path, "wb") as f:
+            f.write(header.encode("utf-8"))
+        self._fh = open(self.out_path, "ab", buffering=WRITE_BUFFER_BYTES)
         self._count_written = 0
         self._scan = 1
         self._time_s = 0.0
@@ -1049,41 +1445,31 @@ class CNVSimulator:
     def _open_for_append(self):
         """Open an existing CNV file and resume counters from the last row.
 
-        This scans the file for the last non-header, non-empty line, parses the
-        numeric columns, then updates internal counters and signal seeds so
-        appended data continues smoothly.
+        This finds the last non-header, non-empty line by scanning backwards
+        from the end of the file, parses the numeric columns, then updates
+        internal counters and signal seeds so appended data continues smoothly.
         """
-        self._fh = open(self.out_path, "r+", buffering=1)
-        self._fh.seek(0, os.SEEK_END)
-        # Find the last actual data line (skip header lines starting with * or #).
-        last_line = ""
-        with open(self.out_path, "r") as rf:
-            for line in rf:
-                if line.strip() and not line.startswith("*") and not line.startswith("#"):
-                    last_line = line
+        # One handle serves both the tail lookup and the appended rows. Only
+        # the tail is read, so resuming costs the same for any file size.
+        self._fh = open(self.out_path, "a+b", buffering=WRITE_BUFFER_BYTES)
+        last_line = _scan_last_data_line(self._fh)
         if last_line:
             try:
-                cols = last_line.split()
-                self._scan = int(cols[11]) + 1
-                self._time_s = float(cols[12]) + self.interval
-                self._pumps = int(cols[13])
-                self._lat = float(cols[14])
-                self._lon = float(cols[15])
+                # Stop tokenizing after pumps; latitude, longitude and flag
+                # stay together in the last item
+                cols = last_line.split(None, PUMPS_IDX + 1)
+                if len(cols) <= PUMPS_IDX + 1:
+                    raise ValueError("short data line")
+                self._scan = int(cols[SCAN_IDX]) + 1
+                self._time_s = float(cols[TIME_IDX]) + self.interval
+                self._pumps = int(cols[PUMPS_IDX])
+                lat, lon = cols[PUMPS_IDX + 1].split(None, 2)[:2]
+                self._lat = float(lat)
+                self._lon = float(lon)
                 # Update internal signals from last row where feasible so the
                 # random walk continues from previous values.
-                self._t0 = float(cols[0])
-                self._c0 = float(cols[1])
-                self._pr = float(cols[2])
-                self._t1 = float(cols[3])
-                self._c1 = float(cols[4])
-                self._o0 = float(cols[5])
-                self._o1 = float(cols[6])
-                self._par = float(cols[7])
-                self._cstar = float(cols[8])
-                self._sal0 = float(cols[9])
-                self._sal1 = float(cols[10])
-                self._fleco_afl = float(cols[11]) if len(cols) > 11 else (SPAN_MIN[11] + SPAN_MAX[11]) / 2
-                self._ph = float(cols[12]) if len(cols) > 12 else (SPAN_MIN[12] + SPAN_MAX[12]) / 2
+                sig = [float(c) for c in cols[:N_SIGNALS]]
+                self._sig[:len(sig)] = sig
                 # Align track position with last known lat/lon if a track is active
                 if self._track is not None:
                     try:
@@ -1099,19 +1485,55 @@ class CNVSimulator:
             self._fh.close()
             self._start_new_file()
 
-        # reopen in append mode
-        if not self._fh.closed:
-            self._fh.close()
-        self._fh = open(self.out_path, "a", buffering=1)
+    def _flush(self):
+        """Flush buffered rows to disk, ignoring a closed or missing handle."""
+        try:
+            if self._fh and not self._fh.closed:
+                self._fh.flush()
+        except Exception:
+            pass
+
+    def _close_file(self):
+        """Write out queued rows, then flush and close the current handle.
+
+        Runs between ticks (see ``_between_ticks``) so no new rows are
+        produced meanwhile.
+        """
+        # A dead writer would never mark leftover batches done
+        if self._writer and self._writer.is_alive():
+            self._wq.join()
+        with self._io_lock:
+            if self._fh:
+                self._flush()
+                try:
+                    self._fh.close()
+                except Exception:
+                    pass
 
     # --- Control ---
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @interval.setter
+    def interval(self, value: float):
+        # The tick loop schedules in integer nanoseconds so the tick phase
+        # never accumulates float rounding drift over long runs
+        self._interval = value
+        self._interval_ns = max(1, int(round(value * 1e9)))
+
     def start(self):
-        """Start or resume the background writer thread."""
+        """Start or resume the background tick and file writer threads."""
         if self._thread and self._thread.is_alive():
             self._run.set()
+            self._wake.set()
             return
         self._stop.clear()
         self._run.set()
+        if not (self._writer and self._writer.is_alive()):
+            self._writer_failed = False
+            self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer.start()
         self._thread = threading.Thread(target=self._loop, daemon=True)
         self._thread.start()
 
@@ -1122,63 +1544,117 @@ class CNVSimulator:
     def resume(self):
         """Resume writing after a pause."""
         self._run.set()
+        self._wake.set()
 
     def stop(self):
-        """Stop the background thread and close the file handle."""
+        """Stop the background threads and close the file handle."""
         self._run.clear()
         self._stop.set()
+        self._wake.set()
+        self._target_event.set()
         if self._thread:
             self._thread.join(timeout=2)
-        if self._fh:
-            self._fh.flush()
-            self._fh.close()
+        if self._writer and self._writer.is_alive():
+            self._wq.put(None)
+            self._writer.join(timeout=2)
+        with self._io_lock:
+            if self._fh:
+                self._flush()
+                self._fh.close()
     
+    def wait_for_scan(self, scan: int, timeout: Optional[float] = None) -> bool:
+        """Block until scan number ``scan`` has been generated.
+
+        Returns True once it has, False on timeout. ``stop()`` also releases
+        the wait; check the return value or ``status()`` to tell them apart.
+        """
+        self._target_event.clear()
+        self._target_scan = scan
+        if self._scan > scan:
+            self._target_event.set()
+        done = self._target_event.wait(timeout)
+        return done and self._scan > scan
+
     def set_on_row(self, cb: Optional[Callable[[List[float]], None]]):
         """Register or clear a live row callback."""
         self._on_row = cb
 
+    def _between_ticks(self, fn: Callable[[], None]):
+        """Run ``fn`` on the tick thread between two ticks and wait for it.
+
+        Rows generated before the call stay in the old state, rows after it
+        see the new one. Runs ``fn`` directly when the tick thread is not
+        running. Exceptions raised by ``fn`` propagate to the caller.
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                fn()
+                return
+            # [fn, done, error]; the tick thread fills in error
+            pending = [fn, threading.Event(), None]
+            self._pending = pending
+            self._wake.set()
+            while not pending[1].wait(0.1):
+                if not thread.is_alive():
+                    if self._pending is pending:
+                        self._pending = None
+                        fn()
+                        return
+                    break
+            if pending[2] is not None:
+                raise pending[2]
+
+    def _run_pending(self):
+        """Tick thread: run a control change queued by ``_between_ticks``."""
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        try:
+            pending[0]()
+        except Exception as exc:
+            pending[2] = exc
+        finally:
+            pending[1].set()
+
     def switch_to_new_file(self, new_path: str):
         """Close current file and start a brand new CNV at ``new_path``."""
-        with self._lock:
-            if self._fh:
-                self._fh.flush()
-                self._fh.close()
+        def swap():
+            self._close_file()
             self.out_path = new_path
-            self._start_new_file()
+            with self._io_lock:
+                self._start_new_file()
+        self._between_ticks(swap)
 
     def switch_to_append_file(self, path: str):
         """Close current file and append to an existing CNV at ``path``."""
-        with self._lock:
-            if self._fh:
-                self._fh.flush()
-                self._fh.close()
+        def swap():
+            self._close_file()
             self.out_path = path
-            self._open_for_append()
+            with self._io_lock:
+                self._open_for_append()
+        self._between_ticks(swap)
 
     def clear_current_file(self):
         """Delete the current CNV file and start a fresh one with a new header.
 
-        Safe to call while running; acquires internal lock and resets counters.
+        Safe to call while running; runs between ticks and resets counters.
         """
         # Pause writer so we don't race file operations
         self._run.clear()
-        with self._lock:
-            if self._fh:
-                try:
-                    self._fh.flush()
-                except Exception:
-                    pass
+
+        def swap():
+            self._close_file()
+            with self._io_lock:
                 try:
-                    self._fh.close()
+                    if os.path.exists(self.out_path):
+                        os.remove(self.out_path)
                 except Exception:
+                    # If deletion fails, proceed to truncate via _start_new_file
                     pass
-            try:
-                if os.path.exists(self.out_path):
-                    os.remove(self.out_path)
-            except Exception:
-                # If deletion fails, proceed to truncate via _start_new_file
-                pass
-            self._start_new_file()
+                self._start_new_file()
+        self._between_ticks(swap)
         # Keep paused; caller can resume explicitly (route picker does this on new route)
 
     def update_track(self, start_lat: float, start_lon: float, end_lat: float, end_lon: float,
@@ -1186,15 +1662,15 @@ class CNVSimulator:
         """Atomically update the mission track. If simulator is running, takes effect immediately.
 
         If ``speed_knots`` or ``pingpong`` are None, keep previous values.
+        An existing track is reconfigured in place between two ticks; the
+        first track is built and installed with one assignment.
         """
-        with self._lock:
-            if speed_knots is not None:
-                self._track_speed_knots = float(speed_knots)
-            if pingpong is not None:
-                self._track_pingpong = bool(pingpong)
-            # Immediately move current position to provided start
-            self._lat = start_lat
-            self._lon = start_lon
+        if speed_knots is not None:
+            self._track_speed_knots = float(speed_knots)
+        if pingpong is not None:
+            self._track_pingpong = bool(pingpong)
+        track = self._track
+        if track is None:
             self._track = MissionTrack(
                 start_lat=start_lat,
                 start_lon=start_lon,
@@ -1203,15 +1679,24 @@ class CNVSimulator:
                 speed_knots=self._track_speed_knots,
                 pingpong=self._track_pingpong,
             )
+        else:
+            def reroute():
+                track.pingpong = self._track_pingpong
+                track.speed_mps = self._track_speed_knots * MissionTrack.KNOT_TO_MPS
+                track.reconfigure(start_lat, start_lon, end_lat, end_lon)
+            self._between_ticks(reroute)
+        # Immediately move current position to provided start
+        self._lat = start_lat
+        self._lon = start_lon
 
     def set_track_speed(self, speed_knots: float):
-        with self._lock:
-            try:
-                self._track_speed_knots = float(speed_knots)
-            except Exception:
-                return
-            if self._track is not None:
-                self._track.speed_mps = self._track_speed_knots * MissionTrack.KNOT_TO_MPS
+        try:
+            self._track_speed_knots = float(speed_knots)
+        except Exception:
+            return
+        track = self._track
+        if track is not None:
+            track.speed_mps = self._track_speed_knots * MissionTrack.KNOT_TO_MPS
 
     def status(self) -> str:
         """Return a short human-readable summary of current state."""
@@ -1222,85 +1707,143 @@ class CNVSimulator:
 
     # --- Writing loop ---
     def _loop(self):
-        """Writer loop running in a background thread.
-
-        Uses a simple tick scheduler based on ``time.perf_counter`` to target
-        the configured output rate. When paused, it sleeps briefly and resets
-        the next tick to avoid catching up too quickly on resume.
+        """Tick loop running in a background thread.
+
+        Uses a simple tick scheduler based on ``time.perf_counter_ns`` to
+        target the configured output rate; ticks are kept as integer
+        nanoseconds so they do not drift. When paused, it waits on an event
+        that resume/stop set and resets the next tick to avoid catching up
+        too quickly on resume. If
+        several ticks are due at once (e.g. after a slow callback or a high
+        rate), the due rows are generated together; a backlog beyond
+        ``MAX_BATCH_ROWS`` ticks is dropped rather than replayed in bursts.
+        Rows are handed to the file writer thread through a queue, so disk
+        I/O never delays the next tick or the live ``on_row`` callback. File
+        switches queued by ``_between_ticks`` run at the top of an iteration.
         """
-        next_tick = time.perf_counter()
+        next_ns = time.perf_counter_ns()
         while not self._stop.is_set():
+            if self._pending is not None:
+                self._run_pending()
             if not self._run.is_set():
-                time.sleep(0.05)
-                next_tick = time.perf_counter() + self.interval
+                # Sleep until resume/stop/file switch; state is re-checked
+                # at the top of the loop after clearing the flag
+                self._wake.wait(0.25)
+                self._wake.clear()
+                next_ns = time.perf_counter_ns() + self._interval_ns
                 continue
 
-            now = time.perf_counter()
-            if now < next_tick:
-                time.sleep(min(0.005, next_tick - now))
+            now_ns = time.perf_counter_ns()
+            if now_ns < next_ns:
+                self._stop.wait(min(5_000_000, next_ns - now_ns) / 1e9)
                 continue
-            next_tick += self.interval
-
-            with self._lock:
-                row = self._next_row()
-                self._fh.write(_fmt_row(row))
-                self._count_written += 1
-                if self._on_row is not None:
+            interval_ns = self._interval_ns
+            due = (now_ns - next_ns) // interval_ns + 1
+            if due > MAX_BATCH_ROWS:
+                due = MAX_BATCH_ROWS
+                next_ns = now_ns + interval_ns
+            else:
+                next_ns += due * interval_ns
+
+            rows = [self._next_row() for _ in range(due)]
+            self._count_written += due
+            target = self._target_scan
+            if target is not None and self._scan > target:
+                self._target_scan = None
+                self._target_event.set()
+            if not self._writer_failed:
+                self._wq.put(rows)
+            on_row = self._on_row
+            if on_row is not None:
+                try:
+                    for row in rows:
+                        on_row(row)
+                except Exception as exc:
+                    # Report a failing callback once and detach it rather
+                    # than silently retrying it on every row
+                    print(f"[warn] on_row callback failed and was removed: {exc!r}",
+                          file=sys.stderr)
+                    if self._on_row is on_row:
+                        self._on_row = None
+
+    def _writer_loop(self):
+        """File writer thread: format queued row batches and write them.
+
+        Rows are flushed once ``flush_interval`` seconds have passed since the last
+        flush, or as soon as the queue goes idle for that long (e.g. paused).
+        A ``None`` item stops the thread. A failed write (disk full, closed
+        handle) is reported on stderr and stops the simulator, so rows are
+        never dropped without a trace.
+        """
+        last_flush = time.perf_counter()
+        unflushed = False
+        while True:
+            try:
+                rows = self._wq.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if unflushed:
+                    with self._io_lock:
+                        self._flush()
+                    last_flush = time.perf_counter()
+                    unflushed = False
+                continue
+            try:
+                if rows is None:
+                    return
+                data = _fmt_rows(rows)
+                with self._io_lock:
+                    self._fh.write(data)
+                    now = time.perf_counter()
+                    if now - last_flush >= self.flush_interval:
+                        self._flush()
+                        last_flush = now
+                        unflushed = False
+                    else:
+                        unflushed = True
+            except Exception as exc:
+                print(f"[error] file writer failed, stopping simulator: {exc!r}",
+                      file=sys.stderr)
+                self._writer_failed = True
+                self._run.clear()
+                self._stop.set()
+                self._wake.set()
+                # Release queued batches so producers and _wq.join() do not block
+                while True:
                     try:
-                        self._on_row(row)
-                    except Exception:
-                        pass
+                        self._wq.get_nowait()
+                    except queue.Empty:
+                        break
+                    self._wq.task_done()
+                return
+            finally:
+                self._wq.task_done()
 
     # --- Data generation ---
     def _next_row(self) -> List[float]:
         """Generate the next scan values using bounded random walks.
 
         Step sizes are tuned for smoothness. PAR occasionally snaps to a very
-        low "floor" to mimic night-time readings.
+        low "floor" to mimic night-time readings. Each call returns a new
+        list: rows wait in the writer queue and ``on_row`` consumers may keep
+        them, so a buffer reused across ticks would be overwritten under them.
         """
-        # Signal step sizes (tune for smoothness)
-        self._t0 = self._rng.step(self._t0, SPAN_MIN[0], SPAN_MAX[0], 0.003)
-        self._c0 = self._rng.step(self._c0, SPAN_MIN[1], SPAN_MAX[1], 0.0002)
-        self._pr = self._rng.step(self._pr, SPAN_MIN[2], SPAN_MAX[2], 0.15)
-        self._t1 = self._rng.step(self._t1, SPAN_MIN[3], SPAN_MAX[3], 0.003)
-        self._c1 = self._rng.step(self._c1, SPAN_MIN[4], SPAN_MAX[4], 0.0002)
-        self._o0 = self._rng.step(self._o0, SPAN_MIN[5], SPAN_MAX[5], 0.20)
-        self._o1 = self._rng.step(self._o1, SPAN_MIN[6], SPAN_MAX[6], 0.20)
-
+        # All random-walk signals advance in one vectorized step
+        self._rng.step_many(self._sig, _SIG_MIN, _SIG_MAX, _SIG_SIGMA)
         par_floor = self._rng.choose_par_floor()
-        if par_floor is None:
-            self._par = self._rng.step(self._par, SPAN_MIN[7], SPAN_MAX[7], (SPAN_MAX[7]-SPAN_MIN[7]) * 0.05)
-        else:
-            self._par = par_floor
-
-        self._cstar = self._rng.step(self._cstar, SPAN_MIN[8], SPAN_MAX[8], 0.10)
-        self._sal0 = self._rng.step(self._sal0, SPAN_MIN[9], SPAN_MAX[9], 0.001)
-        self._sal1 = self._rng.step(self._sal1, SPAN_MIN[10], SPAN_MAX[10], 0.001)
-        self._fleco_afl = self._rng.step(self._fleco_afl, SPAN_MIN[11], SPAN_MAX[11], 0.01)
-        self._ph = self._rng.step(self._ph, SPAN_MIN[12], SPAN_MAX[12], 0.001)
+        if par_floor is not None:
+            self._sig[PAR_IDX] = par_floor
 
         # Latitude/longitude: follow mission track if set, else drift slowly.
-        if self._track is not None:
-            self._lat, self._lon = self._track.step(self.interval)
+        track = self._track
+        if track is not None:
+            self._lat, self._lon = track.step(self.interval)
         else:
             self._lat = self._rng.step(self._lat, SPAN_MIN[14], SPAN_MAX[14], 0.00005)
             self._lon = self._rng.step(self._lon, SPAN_MIN[15], SPAN_MAX[15], 0.00005)
 
         # Pump is constant (1), flag is always 0; increment time/scan counters.
-        row = [
-            self._t0,
-            self._c0,
-            self._pr,
-            self._t1,
-            self._c1,
-            self._o0,
-            self._o1,
-            self._par,
-            self._cstar,
-            self._sal0,
-            self._sal1,
-            self._fleco_afl,
-            self._ph,
+        row = self._sig.tolist() if np is not None else self._sig[:]
+        row += [
             float(self._scan),
             round(self._time_s, 3),
             float(self._pumps),
@@ -1329,7 +1872,7 @@ def interactive_cli(default_path: str, autostart: bool = True, **sim_kwargs):
         sim = CNVSimulator(default_path, append=False, **sim_kwargs)
         sim.start()
         # If route picker server is active, expose a reroute callback bound to this sim
-        if globals().get("_ROUTE_LIVE_STATE") is not None:
+        if _ROUTE_LIVE_STATE is not None:
             def _reroute(sel: dict):
                 s_lat = float(sel.get("start_lat", sim._lat))
                 s_lon = float(sel.get("start_lon", sim._lon))
@@ -1345,13 +1888,9 @@ def interactive_cli(default_path: str, autostart: bool = True, **sim_kwargs):
                     sim.resume()
                 elif action == "clear":
                     sim.clear_current_file()
-                    st = globals().get("_ROUTE_LIVE_STATE")
+                    st = _ROUTE_LIVE_STATE
                     if st:
-                        try:
-                            with st["lock"]:
-                                st["rows"].clear()
-                        except Exception:
-                            pass
+                        st["ring"].clear()
             globals()["_ROUTE_CONTROL_CB"] = _control
             globals()["_ROUTE_SET_SPEED_CB"] = lambda val: sim.set_track_speed(val)
         print(f"Auto-started. Writing to: {default_path}")
@@ -1380,7 +1919,7 @@ def interactive_cli(default_path: str, autostart: bool = True, **sim_kwargs):
                 sim.stop()
             sim = CNVSimulator(path, append=False, **sim_kwargs)
             sim.start()
-            if globals().get("_ROUTE_LIVE_STATE") is not None:
+            if _ROUTE_LIVE_STATE is not None:
                 def _reroute(sel: dict):
                     s_lat = float(sel.get("start_lat", sim._lat))
                     s_lon = float(sel.get("start_lon", sim._lon))
@@ -1396,13 +1935,9 @@ def interactive_cli(default_path: str, autostart: bool = True, **sim_kwargs):
                         sim.resume()
                     elif action == "clear":
                         sim.clear_current_file()
-                        st = globals().get("_ROUTE_LIVE_STATE")
+                        st = _ROUTE_LIVE_STATE
                         if st:
-                            try:
-                                with st["lock"]:
-                                    st["rows"].clear()
-                            except Exception:
-                                pass
+                            st["ring"].clear()
                 globals()["_ROUTE_CONTROL_CB"] = _control
                 globals()["_ROUTE_SET_SPEED_CB"] = lambda val: sim.set_track_speed(val)
             print(f"Started new file: {path}")
@@ -1413,7 +1948,7 @@ def interactive_cli(default_path: str, autostart: bool = True, **sim_kwargs):
             else:
                 sim.switch_to_new_file(path)
             sim.start()
-            if globals().get("_ROUTE_LIVE_STATE") is not None:
+            if _ROUTE_LIVE_STATE is not None:
                 def _reroute(sel: dict):
                     s_lat = float(sel.get("start_lat", sim._lat))
                     s_lon = float(sel.get("start_lon", sim._lon))
@@ -1429,13 +1964,9 @@ def interactive_cli(default_path: str, autostart: bool = True, **sim_kwargs):
                         sim.resume()
                     elif action == "clear":
                         sim.clear_current_file()
-                        st = globals().get("_ROUTE_LIVE_STATE")
+                        st = _ROUTE_LIVE_STATE
                         if st:
-                            try:
-                                with st["lock"]:
-                                    st["rows"].clear()
-                            except Exception:
-                                pass
+                            st["ring"].clear()
                 globals()["_ROUTE_CONTROL_CB"] = _control
                 globals()["_ROUTE_SET_SPEED_CB"] = lambda val: sim.set_track_speed(val)
             print(f"Switched to new file: {path}")
@@ -1449,7 +1980,7 @@ def interactive_cli(default_path: str, autostart: bool = True, **sim_kwargs):
             else:
                 sim.switch_to_append_file(path)
             sim.start()
-            if globals().get("_ROUTE_LIVE_STATE") is not None:
+            if _ROUTE_LIVE_STATE is not None:
                 def _reroute(sel: dict):
                     s_lat = float(sel.get("start_lat", sim._lat))
                     s_lon = float(sel.get("start_lon", sim._lon))
@@ -1510,6 +2041,8 @@ def main():
     parser.add_argument("--file", dest="file", default=default_path)
     parser.add_argument("--hz", dest="hz", type=float, default=24.0, help="Output rate in Hz (default 24Hz)")
     parser.add_argument("--seed", dest="seed", type=int, default=None, help="Random seed for reproducibility")
+    parser.add_argument("--flush-interval", type=float, default=FLUSH_INTERVAL_SEC,
+                        help=f"Max seconds written rows stay buffered before a flush (default {FLUSH_INTERVAL_SEC})")
     # Mission track options
     parser.add_argument("--start-lat", type=float, default=-35.57462, help="Mission start latitude [deg]")
     parser.add_argument("--start-lon", type=float, default=154.30952, help="Mission start longitude [deg]")
@@ -1537,24 +2070,24 @@ def main():
     )
     args = parser.parse_args()
 
-    os.makedirs(os.path.dirname(args.file) or ".", exist_ok=True)
+    _ensure_dir(args.file)
 
     # Resolve city names to coordinates if provided (lat/lon flags take precedence if also set explicitly)
     start_lat = args.start_lat
     start_lon = args.start_lon
     if args.start_city:
-        key = args.start_city.strip().lower()
-        if key in CITY_COORDS:
-            start_lat, start_lon = CITY_COORDS[key]
+        coords = _city_coords(args.start_city)
+        if coords is not None:
+            start_lat, start_lon = coords
         else:
             print(f"[warn] Unknown start city: {args.start_city}. Using --start-lat/--start-lon.", file=sys.stderr)
 
     end_lat = args.end_lat
     end_lon = args.end_lon
     if args.end_city:
-        key = args.end_city.strip().lower()
-        if key in CITY_COORDS:
-            end_lat, end_lon = CITY_COORDS[key]
+        coords = _city_coords(args.end_city)
+        if coords is not None:
+            end_lat, end_lon = coords
         else:
             print(f"[warn] Unknown end city: {args.end_city}. Use --end-lat/--end-lon to specify.", file=sys.stderr)
     # If requested, open a local route picker and wait for selection.
@@ -1569,15 +2102,19 @@ def main():
         else:
             print("[route] No selection received; continuing with existing coordinates.")
 
-    # Setup live on_row callback composition
+    # Setup live on_row callback composition. Unset callbacks are dropped
+    # here rather than per row; none of the callbacks below raise, and the
+    # simulator detaches the composed callback if one ever does.
     def _compose_callbacks(*cbs):
+        cbs = tuple(f for f in cbs if f)
+        if not cbs:
+            return None
+        if len(cbs) == 1:
+            return cbs[0]
+
         def _cb(row):
             for f in cbs:
-                if f:
-                    try:
-                        f(row)
-                    except Exception:
-                        pass
+                f(row)
         return _cb
 
     live_cb = None
@@ -1586,59 +2123,55 @@ def main():
         # Create LivePrinter instance
         class LivePrinter:
             """Prints a compact summary of selected fields every N rows."""
+
+            # printf format per label; other fields print with str()
+            FORMATS = {
+                "latitude": "%.5f", "longitude": "%.5f",
+                "timeS": "%.3f",
+                "scan": "%d", "pumps": "%d",
+                "prDM": "%.2f",
+                "t090C": "%.3f", "t190C": "%.3f", "sal00": "%.3f",
+                "sal11": "%.3f", "CStarTr0": "%.3f",
+            }
+
             def __init__(self, every: int = 24, fields: Optional[List[str]] = None):
                 self.every = max(1, int(every))
-                self._n = 0
+                self._left = self.every
                 default = ["scan", "timeS", "latitude", "longitude", "prDM", "t090C", "sal00"]
-                fields = fields or default
-                indices = []
-                labels = []
-                for f in fields:
-                    key = f.strip()
-                    if not key:
-                        continue
-                    idx = VAR_INDEX_LC.get(key.lower())
-                    if idx is not None:
-                        indices.append(idx)
-                        labels.append(VAR_KEYS[idx])
+                keys = (f.strip().lower() for f in (fields or default))
+                indices = [VAR_INDEX_LC[k] for k in keys if k in VAR_INDEX_LC]
+                labels = [VAR_KEYS[idx] for idx in indices]
                 self._indices = indices
                 self._labels = labels
+                # One "label=<format>, ..." template filled from a tuple that
+                # itemgetter picks out of the row in a single call
+                self._fmt = ", ".join(
+                    label + "=" + self.FORMATS.get(label, "%s") for label in labels
+                )
+                if len(indices) > 1:
+                    self._pick = operator.itemgetter(*indices)
+                elif indices:
+                    self._pick = operator.itemgetter(slice(indices[0], indices[0] + 1))
+                else:
+                    self._pick = lambda row: ()
 
             def __call__(self, row: List[float]):
-                self._n += 1
-                if (self._n % self.every) != 0:
+                self._left -= 1
+                if self._left:
                     return
-                parts = []
-                for label, idx in zip(self._labels, self._indices):
-                    val = row[idx]
-                    if label in ("latitude", "longitude"):
-                        parts.append(f"{label}={val:.5f}")
-                    elif label in ("timeS",):
-                        parts.append(f"{label}={val:.3f}")
-                    elif label in ("scan", "pumps"):
-                        parts.append(f"{label}={int(val)}")
-                    elif label in ("prDM",):
-                        parts.append(f"{label}={val:.2f}")
-                    elif label in ("t090C", "t190C", "sal00", "sal11", "CStarTr0"):
-                        parts.append(f"{label}={val:.3f}")
-                    else:
-                        parts.append(f"{label}={val}")
+                self._left = self.every
                 try:
-                    print("live:", ", ".join(parts), flush=True)
-                except Exception:
-                    pass
+                    print("live:", self._fmt % tuple(self._pick(row)), flush=True)
+                except BrokenPipeError:
+                    # stdout was closed (e.g. piped into head); a negative
+                    # countdown never reaches zero again, so printing stops
+                    self._left = -1
         live_cb = LivePrinter(every=args.live_every, fields=fields)
+    # The picker state exists once a route was selected above; bind its ring
+    # directly. LiveRowRing.append is lock-free for this single producer.
     route_cb = None
-    if args.route_picker:
-        def route_cb(row):
-            st = globals().get("_ROUTE_LIVE_STATE")
-            if not st:
-                return
-            try:
-                with st["lock"]:
-                    st["rows"].append(row)
-            except Exception:
-                pass
+    if args.route_picker and _ROUTE_LIVE_STATE is not None:
+        route_cb = _ROUTE_LIVE_STATE["ring"].append
 
     on_row_cb = _compose_callbacks(live_cb, route_cb)
 
@@ -1656,6 +2189,7 @@ def main():
             track_speed_knots=args.speed_knots,
             track_pingpong=args.pingpong,
             on_row=on_row_cb,
+            flush_interval=args.flush_interval,
         )
         sim.start()
         # Expose reroute callback for route picker page
@@ -1679,10 +2213,8 @@ def main():
                 while True:
                     time.sleep(1)
             else:
-                # Sleep in short intervals until enough scans are written.
-                target_scan = args.count
-                while sim._scan - 1 < target_scan:
-                    time.sleep(0.1)
+                # Block until enough scans are written.
+                sim.wait_for_scan(args.count)
         except KeyboardInterrupt:
             pass
         finally:
@@ -1703,6 +2235,7 @@ def main():
                 track_speed_knots=args.speed_knots,
                 track_pingpong=args.pingpong,
                 on_row=on_row_cb,
+                flush_interval=args.flush_interval,
             )
             sim.start()
             if args.route_picker:
@@ -1745,6 +2278,7 @@ def main():
                     track_speed_knots=args.speed_knots,
                     track_pingpong=args.pingpong,
                     on_row=on_row_cb,
+                    flush_interval=args.flush_interval,
                 )
             except KeyboardInterrupt:
                 # Graceful shutdown on Ctrl+C
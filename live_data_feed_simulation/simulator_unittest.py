@@ -1,10 +1,17 @@
+import contextlib
+import io
 import os
 import re
-import time
 import tempfile
+import threading
 import importlib.util
 import unittest
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional for the simulator and its tests
+    np = None
+
 # -------- import the simulator from the same folder --------
 HERE = os.path.abspath(os.path.dirname(__file__))
 SIM_PATH = os.path.join(HERE, "simulation.py")
@@ -23,28 +30,26 @@ def _read_header_data(path):
                 data.append(line.rstrip("\n"))
     return header, data
 
-def _count_data_rows(path):
-    try:
-        with open(path, "r") as f:
-            return sum(1 for ln in f if ln.strip() and not ln.startswith(("*", "#")))
-    except FileNotFoundError:
-        return 0
+_NQUAN_RE = re.compile(r"#\s*nquan\s*=\s*(\d+)")
 
 def _get_nquan(header_lines):
     for hl in header_lines:
-        m = re.match(r"#\s*nquan\s*=\s*(\d+)", hl.strip())
+        m = _NQUAN_RE.match(hl.strip())
         if m:
             return int(m.group(1))
     return None
 
+# column indices taken from the simulator's output layout
+_COLS = (simulation.SCAN_IDX, simulation.TIME_IDX,
+         simulation.VAR_INDEX["latitude"], simulation.VAR_INDEX["longitude"])
+
 def _parse_cols(line):
     parts = line.split()
-    # indices based on simulator output format:
-    #  12th = scan (index 11), 13th = timeS (12), 15th = lat (14), 16th = lon (15)
-    scan = int(float(parts[11]))
-    timeS = float(parts[12])
-    lat = float(parts[14])
-    lon = float(parts[15])
+    scan_i, time_i, lat_i, lon_i = _COLS
+    scan = int(float(parts[scan_i]))
+    timeS = float(parts[time_i])
+    lat = float(parts[lat_i])
+    lon = float(parts[lon_i])
     return scan, timeS, lat, lon, len(parts)
 
 def _run_sim_and_wait(out_path, *, target_rows=80, interval=1/60.0,
@@ -63,34 +68,44 @@ def _run_sim_and_wait(out_path, *, target_rows=80, interval=1/60.0,
         track_pingpong=pingpong,
     )
     sim.start()
-    deadline = time.time() + timeout_s
-    while time.time() < deadline and _count_data_rows(out_path) < target_rows:
-        time.sleep(0.02)
-    sim.stop()
-    # let any buffers flush
-    time.sleep(0.1)
-
-# ================== one short run used by 3 tests ==================
+    try:
+        reached = sim.wait_for_scan(target_rows, timeout=timeout_s)
+    finally:
+        sim.stop()
+    assert reached, f"simulator did not reach scan {target_rows} within {timeout_s}s"
+
+# ================== one short run shared by the simulator tests ==================
+_SHARED_TD = None
+_SHARED_OUT = None
+
+def setUpModule():
+    global _SHARED_TD, _SHARED_OUT
+    _SHARED_TD = tempfile.TemporaryDirectory()
+    _SHARED_OUT = os.path.join(_SHARED_TD.name, "out_shared.cnv")
+    # Very short track so we hit the endpoint and bounce quickly.
+    # The ~7 m leg takes ~140 rows at 60 Hz; 240 rows cover a clear reversal.
+    _run_sim_and_wait(
+        _SHARED_OUT,
+        target_rows=240,
+        interval=1/60.0,
+        start_lat=-31.95000, start_lon=115.86000,
+        end_lat=-31.95005, end_lon=115.86005,  # ~5e-5 deg separation
+        speed_knots=6.0,
+        pingpong=True,
+        timeout_s=20,
+    )
+
+def tearDownModule():
+    _SHARED_TD.cleanup()
+
 class TestCNVBasic(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.td = tempfile.TemporaryDirectory()
-        cls.out = os.path.join(cls.td.name, "out_basic.cnv")
-        # Faster interval so we don’t wait long; ~80 rows in a second+.
-        _run_sim_and_wait(
-            cls.out, target_rows=80, interval=1/60.0,
-            start_lat=-31.95, start_lon=115.86,
-            end_lat=-32.06, end_lon=115.74,
-            speed_knots=6.0, pingpong=True, timeout_s=20
-        )
+        cls.out = _SHARED_OUT
         cls.header, cls.data = _read_header_data(cls.out)
         if not cls.data:
             raise RuntimeError("Simulator produced no data rows for basic test.")
 
-    @classmethod
-    def tearDownClass(cls):
-        cls.td.cleanup()
-
     def test_header_has_nquan(self):
         nquan = _get_nquan(self.header)
         self.assertIsNotNone(nquan, "Missing '# nquan = <N>' in header")
@@ -113,53 +128,152 @@ class TestCNVBasic(unittest.TestCase):
         self.assertGreaterEqual(numeric_like, nquan - 1, "Expected most tokens to be numeric")
 
     def test_scan_time_monotonic_and_bounds(self):
-        scans, times, lats, lons = [], [], [], []
-        for dl in self.data:
-            s, t, la, lo, _ = _parse_cols(dl)
-            scans.append(s); times.append(t); lats.append(la); lons.append(lo)
-        self.assertTrue(all(b > a for a, b in zip(scans, scans[1:])), "scan should strictly increase")
-        self.assertTrue(all(b >= a for a, b in zip(times, times[1:])), "timeS should be non-decreasing")
-        self.assertTrue(all(-90.0 <= v <= 90.0 for v in lats), "latitude out of bounds")
-        self.assertTrue(all(-180.0 <= v <= 180.0 for v in lons), "longitude out of bounds")
-
-# ================== separate run to prove ping-pong ==================
+        if np is not None:
+            # Same columns as _parse_cols, parsed in one pass
+            scans, times, lats, lons = np.loadtxt(
+                self.out, comments=("*", "#"), usecols=_COLS, ndmin=2
+            ).T
+            scan_increasing = bool((np.diff(scans) > 0).all())
+            time_nondecreasing = bool((np.diff(times) >= 0).all())
+            lat_in_bounds = bool(((lats >= -90.0) & (lats <= 90.0)).all())
+            lon_in_bounds = bool(((lons >= -180.0) & (lons <= 180.0)).all())
+        else:
+            scans, times, lats, lons = [], [], [], []
+            for dl in self.data:
+                s, t, la, lo, _ = _parse_cols(dl)
+                scans.append(s); times.append(t); lats.append(la); lons.append(lo)
+            scan_increasing = all(b > a for a, b in zip(scans, scans[1:]))
+            time_nondecreasing = all(b >= a for a, b in zip(times, times[1:]))
+            lat_in_bounds = all(-90.0 <= v <= 90.0 for v in lats)
+            lon_in_bounds = all(-180.0 <= v <= 180.0 for v in lons)
+        self.assertTrue(scan_increasing, "scan should strictly increase")
+        self.assertTrue(time_nondecreasing, "timeS should be non-decreasing")
+        self.assertTrue(lat_in_bounds, "latitude out of bounds")
+        self.assertTrue(lon_in_bounds, "longitude out of bounds")
+
+# ================== ping-pong on the shared short-track run ==================
 class TestPingPongReversal(unittest.TestCase):
     def test_pingpong_reverses_direction(self):
+        _, data = _read_header_data(_SHARED_OUT)
+        self.assertGreaterEqual(len(data), 120, "Not enough rows to detect reversal")
+
+        # Compare the outbound and return legs: positions are written with 5
+        # decimals, so a few consecutive rows may not move at all
+        def vec(pair_a, pair_b):
+            (la1, lo1), (la2, lo2) = pair_a, pair_b
+            return (la2 - la1, lo2 - lo1)
+
+        pts = [_parse_cols(line)[2:4] for line in data]
+        # turning point = farthest position from the start
+        turn = max(range(len(pts)), key=lambda i: sum(d * d for d in vec(pts[0], pts[i])))
+
+        d_start = vec(pts[0], pts[turn])
+        d_end   = vec(pts[turn], pts[-1])
+
+        dot = d_start[0]*d_end[0] + d_start[1]*d_end[1]
+        self.assertLess(dot, 0.0, "Expected direction reversal when pingpong=True")
+
+# ================== row formatting (no simulator run) ==================
+class TestRowFormatting(unittest.TestCase):
+    def test_batch_format_matches_single_rows(self):
+        sim_rng = simulation.RandomWalk(7)
+        rows = []
+        for scan in range(1, 6):
+            row = [sim_rng.step((lo + hi) / 2, lo, hi, (hi - lo) * 0.1)
+                   for lo, hi in zip(simulation.SPAN_MIN, simulation.SPAN_MAX)]
+            row[13] = float(scan)
+            rows.append(row)
+        batch = simulation._fmt_rows(rows)
+        self.assertEqual(batch, b"".join(simulation._fmt_row(r) for r in rows))
+        self.assertEqual(len(batch.splitlines()[0].split()), len(simulation.NAME_LIST))
+
+class TestLiveRowRing(unittest.TestCase):
+    @staticmethod
+    def _row(scan):
+        row = [0.0] * len(simulation.NAME_LIST)
+        row[simulation.SCAN_IDX] = scan
+        return row
+
+    def test_after_wraps_and_resets(self):
+        ring = simulation.LiveRowRing(5)
+        for scan in range(1, 9):
+            ring.append(self._row(scan))
+        scans = lambda rows: [r[simulation.SCAN_IDX] for r in rows]
+        self.assertEqual(scans(ring.after(0)), [5, 6, 7, 8])
+        self.assertEqual(scans(ring.after(6)), [7, 8])
+        self.assertEqual(scans(ring.after(0, max_rows=1)), [8])
+        # A restarted scan sequence drops rows from the previous file
+        ring.append(self._row(1))
+        self.assertEqual(scans(ring.after(0)), [1])
+        ring.clear()
+        self.assertIsNone(ring.last())
+        self.assertEqual(len(ring), 0)
+
+class TestOnRowCallback(unittest.TestCase):
+    def test_failing_callback_is_detached(self):
+        calls = []
+        def cb(row):
+            calls.append(row[simulation.SCAN_IDX])
+            if len(calls) == 3:
+                raise ValueError("callback failure")
+        with tempfile.TemporaryDirectory() as td:
+            sim = simulation.CNVSimulator(os.path.join(td, "cb.cnv"), interval=1/200.0, on_row=cb)
+            err = io.StringIO()
+            with contextlib.redirect_stderr(err):
+                sim.start()
+                try:
+                    self.assertTrue(sim.wait_for_scan(20, timeout=10))
+                finally:
+                    sim.stop()
+        self.assertEqual(len(calls), 3)
+        self.assertIn("callback failure", err.getvalue())
+        self.assertIsNone(sim._on_row)
+
+class TestWriterFailure(unittest.TestCase):
+    def test_write_error_stops_simulator(self):
+        class FailingFile:
+            def __init__(self, fh):
+                self._fh = fh
+            def write(self, data):
+                raise OSError("disk full")
+            def __getattr__(self, name):
+                return getattr(self._fh, name)
+        with tempfile.TemporaryDirectory() as td:
+            sim = simulation.CNVSimulator(os.path.join(td, "w.cnv"), interval=1/200.0)
+            err = io.StringIO()
+            with contextlib.redirect_stderr(err):
+                sim.start()
+                self.assertTrue(sim.wait_for_scan(2, timeout=10))
+                with sim._io_lock:
+                    sim._fh = FailingFile(sim._fh)
+                sim._writer.join(timeout=5)
+                sim._thread.join(timeout=5)
+                self.assertFalse(sim._writer.is_alive())
+                self.assertFalse(sim._thread.is_alive())
+                # A batch queued after the writer drained the queue must not
+                # block a later file switch
+                sim._wq.put([])
+                switch = threading.Thread(
+                    target=sim.switch_to_new_file, args=(os.path.join(td, "w2.cnv"),),
+                    daemon=True)
+                switch.start()
+                switch.join(timeout=5)
+                self.assertFalse(switch.is_alive(), "file switch blocked on the writer queue")
+                sim.stop()
+        self.assertIn("disk full", err.getvalue())
+
+class TestTailParsing(unittest.TestCase):
+    def test_last_lat_lon_from_tail(self):
+        row = [0.0] * len(simulation.NAME_LIST)
+        lat_idx = simulation.VAR_INDEX["latitude"]
+        row[lat_idx], row[lat_idx + 1] = -31.95, 115.86
         with tempfile.TemporaryDirectory() as td:
-            out = os.path.join(td, "out_pp.cnv")
-            # Very short track so we hit the endpoint and bounce quickly.
-            # Over ~120 rows at 60 Hz we should see a reversal.
-            _run_sim_and_wait(
-                out,
-                target_rows=160,
-                interval=1/60.0,
-                start_lat=-31.95000, start_lon=115.86000,
-                end_lat=-31.95005, end_lon=115.86005,  # ~5e-5 deg separation
-                speed_knots=6.0,
-                pingpong=True,
-                timeout_s=20,
-            )
-            _, data = _read_header_data(out)
-            self.assertGreaterEqual(len(data), 120, "Not enough rows to detect reversal")
-
-            # Compare early and late direction vectors
-            def vec(pair_a, pair_b):
-                (la1, lo1), (la2, lo2) = pair_a, pair_b
-                return (la2 - la1, lo2 - lo1)
-
-            # sample a few points from start and end to smooth noise
-            def parse_latlon(line):
-                parts = line.split()
-                return float(parts[14]), float(parts[15])
-
-            head_pts = [parse_latlon(data[i]) for i in range(0, min(5, len(data)))]
-            tail_pts = [parse_latlon(data[-i]) for i in range(1, min(6, len(data)))]
-
-            d_start = vec(head_pts[0], head_pts[-1])
-            d_end   = vec(tail_pts[-1], tail_pts[0])  # chronological order
-
-            dot = d_start[0]*d_end[0] + d_start[1]*d_end[1]
-            self.assertLessEqual(dot, 0.0, "Expected direction reversal when pingpong=True")
+            path = os.path.join(td, "tail.cnv")
+            with open(path, "wb") as f:
+                f.write(b"* header\n# nquan = 19\n")
+                f.write(simulation._fmt_rows([row, row]))
+                f.write(b"\n\n")
+            self.assertEqual(simulation._read_last_lat_lon(path), (-31.95, 115.86))
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
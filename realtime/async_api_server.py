@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Asyncio real-time API server for TRIAXUS dashboard
+Serves the same endpoints as realtime_api_server.py from one aiohttp event
+loop, with database reads going through AsyncOceanographicDataRepository
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+from aiohttp import web
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional; fall back to the default event loop
+    uvloop = None
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from triaxus.database import DatabaseConnectionManager, SecureDatabaseConfigManager, DataMapper
+from triaxus.database.async_repositories import AsyncOceanographicDataRepository
+from realtime_api_server import (
+    _dumps, _frame_to_records, _load_static_files, _time_window, _utc_timestamp
+)
+
+JSON_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type',
+}
+
+STATIC_TYPES = {
+    '.html': 'text/html',
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+}
+
+
+def json_response(data, status=200):
+    """Build a compact JSON response"""
+    return web.Response(body=_dumps(data), status=status,
+                        content_type='application/json', headers=JSON_HEADERS)
+
+
+async def load_data(app, limit, time_start=None, time_end=None):
+    """Load the latest records as a frame, or an empty frame if the database is down"""
+    if not app['db_available']:
+        return pd.DataFrame()
+    if time_start is not None and time_end is not None:
+        models = await app['repository'].get_latest_in_time_range(time_start, time_end, limit)
+    else:
+        models = await app['repository'].get_latest_records(limit)
+    return app['mapper'].models_to_dataframe(models)
+
+
+async def handle_latest_data(request):
+    """Provide latest oceanographic data"""
+    try:
+        query_params = {key: request.query.getall(key) for key in request.query}
+        limit = int(query_params.get('limit', ['1000'])[0])
+
+        time_start, time_end = _time_window(query_params)
+        data = await load_data(request.app, limit, time_start, time_end)
+        records = _frame_to_records(data)
+
+        return json_response({
+            'success': True,
+            'data': records,
+            'count': len(records),
+            'timestamp': _utc_timestamp()
+        })
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': str(e),
+            'timestamp': _utc_timestamp()
+        }, status=500)
+
+
+async def handle_status(request):
+    """Provide system status"""
+    try:
+        data = await load_data(request.app, 10)
+        return json_response({
+            'success': True,
+            'database_connected': True,
+            'latest_records': len(data),
+            'timestamp': _utc_timestamp()
+        })
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'database_connected': False,
+            'error': str(e),
+            'timestamp': _utc_timestamp()
+        }, status=500)
+
+
+def static_handler(name):
+    """Build a handler serving one cached dashboard file"""
+    async def handler(request):
+        content = request.app['static'].get(name)
+        if content is None:
+            raise web.HTTPNotFound(text=f"Static file {name} not found")
+        return web.Response(body=content, content_type=STATIC_TYPES[Path(name).suffix])
+    return handler
+
+
+async def handle_js_module(request):
+    """Serve a JS module file from the cache"""
+    return await static_handler(f"js/{request.match_info['name']}")(request)
+
+
+async def on_startup(app):
+    """Connect to the database once for the lifetime of the app"""
+    manager = DatabaseConnectionManager(SecureDatabaseConfigManager())
+    app['connection_manager'] = manager
+    app['db_available'] = manager.connect()
+    app['repository'] = AsyncOceanographicDataRepository(manager)
+    app['mapper'] = DataMapper()
+
+
+async def on_cleanup(app):
+    """Release pooled database connections"""
+    manager = app['connection_manager']
+    # disconnect() cannot await, so it only drops the async pool; close its
+    # connections here while the event loop is still running
+    if manager.async_engine is not None:
+        await manager.async_engine.dispose()
+    manager.disconnect()
+
+
+def create_app():
+    """Create the aiohttp application with the dashboard routes"""
+    app = web.Application()
+    app['static'] = _load_static_files()
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_get('/api/latest_data', handle_latest_data)
+    app.router.add_get('/api/status', handle_status)
+    app.router.add_get('/', static_handler('dashboard.html'))
+    app.router.add_get('/dashboard.html', static_handler('dashboard.html'))
+    app.router.add_get('/dashboard.css', static_handler('dashboard.css'))
+    app.router.add_get('/dashboard.js', static_handler('dashboard.js'))
+    app.router.add_get('/js/{name}', handle_js_module)
+    return app
+
+
+def run_server(port=8080):
+    """Run the asyncio real-time API server"""
+    if uvloop is not None:
+        uvloop.install()
+
+    print(f"TRIAXUS Real-time API Server (asyncio) starting...")
+    print(f"Dashboard: http://localhost:{port}")
+    print(f"API: http://localhost:{port}/api/latest_data")
+    print(f"Status: http://localhost:{port}/api/status")
+    print(f"Press Ctrl+C to stop")
+
+    web.run_app(create_app(), port=port, print=None)
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
+    run_server(port)
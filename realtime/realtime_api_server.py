@@ -4,14 +4,31 @@ Real-time API server for TRIAXUS dashboard
 Provides REST API endpoints for live oceanographic data
 """
 
+import gzip
+import hashlib
 import json
+import re
 import time
 import sys
 import os
+import queue
+import logging
+import logging.handlers
+import threading
 from pathlib import Path
-from datetime import datetime, timezone
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
+from cachetools import TTLCache
+
+try:  # optional: faster JSON encoding of API responses
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -19,15 +36,165 @@ sys.path.insert(0, str(project_root))
 
 from triaxus.data.database_source import DatabaseDataSource
 from triaxus.core.config.manager import ConfigManager
+import numpy as np
 import pandas as pd
 
+# Request log written to stdout and logs/api_server.log by a background
+# listener thread; the file rotates at LOG_MAX_BYTES keeping LOG_BACKUP_COUNT
+LOG_MAX_BYTES = 10_000_000
+LOG_BACKUP_COUNT = 3
+access_logger = logging.getLogger('triaxus.realtime.access')
+access_logger.setLevel(logging.INFO)
+access_logger.propagate = False
+
+# Numeric fields returned per record by /api/latest_data, after 'time'
+RECORD_FIELDS = ['depth', 'latitude', 'longitude', 'tv290c', 'sal00',
+                 'sbeox0mm_l', 'fleco_afl', 'ph']
+
+
+# Connection pool for the shared data source, sized for concurrent request
+# threads; each query checks a connection out and returns it when done
+API_POOL_CONFIG = {
+    'pool_size': 8,
+    'max_overflow': 8,
+    'pool_pre_ping': True,
+    'pool_recycle': 300,
+}
+
+# Seconds a cached /api/latest_data response may be reused while the newest
+# record time is unchanged; bounds staleness from deletes, back-filled rows
+# and the moving time window
+LATEST_CACHE_TTL_SEC = 5.0
+
+# (epoch second, formatted UTC timestamp) of the last _utc_timestamp() call
+_ts_cache = (None, '')
+
+
+def _utc_timestamp():
+    """Current UTC time as an RFC3339 'Z' string, formatted once per second
+
+    The cached pair is replaced as one tuple, so request threads never see
+    a second matched with another second's string.
+    """
+    global _ts_cache
+    now = int(time.time())
+    cached_at, text = _ts_cache
+    if cached_at != now:
+        text = datetime.fromtimestamp(now, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        _ts_cache = (now, text)
+    return text
+
+
+def _frame_to_records(data):
+    """Convert a data frame to JSON-ready record dicts in vectorized steps
+
+    Times become RFC3339 'Z' strings and missing values become None. Each
+    column is cast once to a NumPy array and then to a Python list; the
+    records are zipped from those lists.
+    """
+    if data.empty:
+        return []
+    times = pd.to_datetime(data['time'], utc=True, errors='coerce')
+    # datetime_as_string is far cheaper than Series.dt.strftime
+    seconds = times.dt.tz_convert(None).to_numpy(dtype='datetime64[s]')
+    stamps = np.char.add(np.datetime_as_string(seconds, unit='s'), 'Z')
+    columns = [np.where(np.isnat(seconds), None, stamps).tolist()]
+    for field in RECORD_FIELDS:
+        # Non-numeric cells become NaN (and so None) instead of failing the request
+        values = pd.to_numeric(data[field], errors='coerce').to_numpy(dtype=float)
+        columns.append(np.where(np.isnan(values), None, values).tolist())
+    keys = ('time', *RECORD_FIELDS)
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def _load_static_files():
+    """Read the dashboard files once so requests are served from memory
+
+    Returns a dict mapping each file's path relative to this directory
+    (e.g. 'dashboard.css', 'js/api.js') to its bytes. Edits to the files
+    take effect when the server is restarted.
+    """
+    static_dir = Path(__file__).parent
+    names = ['dashboard.html', 'dashboard.css', 'dashboard.js']
+    names += [f'js/{p.name}' for p in sorted((static_dir / 'js').glob('*.js'))]
+    cache = {}
+    for name in names:
+        file_path = static_dir / name
+        if file_path.is_file():
+            cache[name] = file_path.read_bytes()
+    return cache
+
+
+def _build_static_variants(cache):
+    """Precompute the response bodies and ETags for each cached file
+
+    Returns a dict mapping each name to ``{gzip: (body, etag)}`` with a
+    ``False`` (identity) entry and, when compression helps, a ``True`` one.
+    """
+    variants = {}
+    for name, content in cache.items():
+        digest = hashlib.blake2b(content, digest_size=8).hexdigest()
+        entry = {False: (content, f'"{digest}"')}
+        compressed = gzip.compress(content, compresslevel=6)
+        if len(compressed) < len(content):
+            entry[True] = (compressed, f'"{digest}-gz"')
+        variants[name] = entry
+    return variants
+
+
+# An Accept-Encoding entry that names gzip without refusing it (q=0)
+_ACCEPTS_GZIP = re.compile(r'(?:^|,)\s*gzip\s*(?:,|$|;\s*q=(?!0(?:\.0*)?\s*(?:,|$)))', re.I)
+
+
+def _time_window(query_params):
+    """Return the UTC (lower, upper) bounds requested for /api/latest_data
+
+    Only data within [now - window_minutes, now + max_future_minutes] is
+    returned. Defaults: 24h back, 5 minutes ahead.
+
+    Args:
+        query_params: Parsed query string (values are lists, as from parse_qs)
+    """
+    try:
+        window_minutes = int(query_params.get('window_minutes', ['1440'])[0])
+    except Exception:
+        window_minutes = 1440
+    try:
+        max_future_minutes = int(query_params.get('max_future_minutes', ['5'])[0])
+    except Exception:
+        max_future_minutes = 5
+
+    now_utc = datetime.now(timezone.utc)
+    return (now_utc - timedelta(minutes=window_minutes),
+            now_utc + timedelta(minutes=max_future_minutes))
+
+
 class RealtimeAPIHandler(BaseHTTPRequestHandler):
+    # Guards creation of the shared sources; requests run on their own threads
+    _init_lock = threading.Lock()
+    # Dashboard HTML/CSS/JS bytes keyed by relative path, read at import
+    _static_cache = _load_static_files()
+    # Identity/gzip bodies and their ETags per cached file
+    _static_variants = _build_static_variants(_static_cache)
+    # Pre-encoded status line and fixed headers per (file, status, gzip),
+    # built on first use; only the Date header is added per request
+    _static_heads = {}
+    # /api/latest_data bodies keyed by query: (newest record time, bytes)
+    _latest_cache = TTLCache(maxsize=32, ttl=LATEST_CACHE_TTL_SEC)
+    _latest_cache_lock = threading.Lock()
+    # Send each response as soon as it is written instead of waiting on ACKs
+    disable_nagle_algorithm = True
+
     def __init__(self, *args, **kwargs):
-        # Use shared database source to avoid repeated connections
-        if not hasattr(RealtimeAPIHandler, '_db_source'):
-            RealtimeAPIHandler._db_source = DatabaseDataSource()
-        if not hasattr(RealtimeAPIHandler, '_config'):
-            RealtimeAPIHandler._config = ConfigManager()
+        # Use shared database source to avoid repeated connections. Each
+        # query checks a connection out of its engine's bounded pool, so
+        # concurrent request threads never share one.
+        if not hasattr(RealtimeAPIHandler, '_db_source') or not hasattr(RealtimeAPIHandler, '_config'):
+            with RealtimeAPIHandler._init_lock:
+                if not hasattr(RealtimeAPIHandler, '_db_source'):
+                    RealtimeAPIHandler._db_source = DatabaseDataSource(pool_overrides=API_POOL_CONFIG)
+                if not hasattr(RealtimeAPIHandler, '_config'):
+                    RealtimeAPIHandler._config = ConfigManager()
         
         self.config = RealtimeAPIHandler._config
         self.db_source = RealtimeAPIHandler._db_source
@@ -61,81 +228,45 @@ class RealtimeAPIHandler(BaseHTTPRequestHandler):
             query_params = parse_qs(parsed_path.query)
             limit = int(query_params.get('limit', ['1000'])[0])
             
-            # Get latest data from database (only recent data for real-time display)
-            data = self.db_source.load_data(limit=limit)
-            
-            # Normalize all timestamps to UTC and filter by a sane window around now
-            if not data.empty and 'time' in data.columns:
-                # Parse to datetime (utc=True ensures tz-aware UTC; naive treated as UTC)
-                data['time'] = pd.to_datetime(data['time'], utc=True, errors='coerce')
-
-                # Optional windowing: only return data within [now - window_minutes, now + max_future_minutes]
-                # Defaults: 24h back, 5 minutes ahead
-                try:
-                    window_minutes = int(query_params.get('window_minutes', ['1440'])[0])
-                except Exception:
-                    window_minutes = 1440
-                try:
-                    max_future_minutes = int(query_params.get('max_future_minutes', ['5'])[0])
-                except Exception:
-                    max_future_minutes = 5
-
-                now_utc = datetime.now(timezone.utc)
-                lower_bound = now_utc - pd.Timedelta(minutes=window_minutes)
-                upper_bound = now_utc + pd.Timedelta(minutes=max_future_minutes)
-
-                data = data[(data['time'] >= lower_bound) & (data['time'] <= upper_bound)]
-
-                # Sort newest-first before limiting
-                data = data.sort_values('time', ascending=False)
+            # Reuse the last body for this query while no newer record has
+            # arrived; the MAX(datetime) lookup is far cheaper than the fetch.
+            # ?nocache=1 always rebuilds the response (and refreshes the cache).
+            cache_key = (limit, tuple(query_params.get('window_minutes', ())),
+                         tuple(query_params.get('max_future_minutes', ())))
+            use_cache = query_params.get('nocache', ['0'])[0] != '1'
+            latest_time = self.db_source.get_latest_time()
+            cached = None
+            if use_cache:
+                with self._latest_cache_lock:
+                    cached = self._latest_cache.get(cache_key)
+            if cached is not None and latest_time is not None and cached[0] == latest_time:
+                self.send_json_bytes(cached[1])
+                return
             
-            # Convert to JSON-serializable format
-            records = []
-            for _, row in data.head(limit).iterrows():
-                # Handle time conversion properly
-                time_val = row['time']
-                if pd.notna(time_val):
-                    # time_val may be a pandas Timestamp, numpy datetime64, or str
-                    try:
-                        # Convert via pandas to ensure UTC and consistent type
-                        ts = pd.to_datetime(time_val, utc=True, errors='coerce')
-                        if ts is not pd.NaT:
-                            # Always emit RFC3339 Z format
-                            time_str = ts.strftime('%Y-%m-%dT%H:%M:%SZ')
-                        else:
-                            time_str = None
-                    except Exception:
-                        time_str = None
-                else:
-                    time_str = None
-                
-                record = {
-                    'time': time_str,
-                    'depth': float(row['depth']) if pd.notna(row['depth']) else None,
-                    'latitude': float(row['latitude']) if pd.notna(row['latitude']) else None,
-                    'longitude': float(row['longitude']) if pd.notna(row['longitude']) else None,
-                    'tv290c': float(row['tv290c']) if pd.notna(row['tv290c']) else None,
-                    'sal00': float(row['sal00']) if pd.notna(row['sal00']) else None,
-                    'sbeox0mm_l': float(row['sbeox0mm_l']) if pd.notna(row['sbeox0mm_l']) else None,
-                    'fleco_afl': float(row['fleco_afl']) if pd.notna(row['fleco_afl']) else None,
-                    'ph': float(row['ph']) if pd.notna(row['ph']) else None,
-                }
-                records.append(record)
+            # Get the newest rows inside the time window; the window, order
+            # and limit are applied by the database
+            time_start, time_end = _time_window(query_params)
+            data = self.db_source.load_data(limit=limit, time_start=time_start, time_end=time_end)
+            records = _frame_to_records(data)
             
             response = {
                 'success': True,
                 'data': records,
                 'count': len(records),
-                'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+                'timestamp': _utc_timestamp()
             }
             
-            self.send_json_response(response)
+            payload = _dumps(response)
+            if latest_time is not None:
+                with self._latest_cache_lock:
+                    self._latest_cache[cache_key] = (latest_time, payload)
+            self.send_json_bytes(payload)
             
         except Exception as e:
             error_response = {
                 'success': False,
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _utc_timestamp()
             }
             self.send_json_response(error_response, status=500)
     
@@ -148,7 +279,7 @@ class RealtimeAPIHandler(BaseHTTPRequestHandler):
                 'success': True,
                 'database_connected': True,
                 'latest_records': len(data),
-                'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+                'timestamp': _utc_timestamp()
             }
             self.send_json_response(status)
         except Exception as e:
@@ -156,75 +287,120 @@ class RealtimeAPIHandler(BaseHTTPRequestHandler):
                 'success': False,
                 'database_connected': False,
                 'error': str(e),
-                'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+                'timestamp': _utc_timestamp()
             }
             self.send_json_response(status, status=500)
     
     def serve_dashboard(self):
         """Serve the dashboard HTML"""
         try:
-            dashboard_path = Path(__file__).parent / 'dashboard.html'
-            if dashboard_path.exists():
-                with open(dashboard_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'text/html')
-                self.send_header('Content-Length', str(len(content.encode('utf-8'))))
-                self.end_headers()
-                self.wfile.write(content.encode('utf-8'))
+            if 'dashboard.html' in self._static_cache:
+                self._write_cached('dashboard.html', 'text/html')
             else:
                 self.send_error(404, "Dashboard not found")
         except Exception as e:
             self.send_error(500, f"Error serving dashboard: {str(e)}")
     
     def serve_static_file(self, filename, content_type):
-        """Serve static files (CSS, JS)"""
+        """Serve static files (CSS, JS) from the in-memory cache"""
         try:
-            file_path = Path(__file__).parent / filename
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                self.send_response(200)
-                self.send_header('Content-Type', content_type)
-                self.send_header('Content-Length', str(len(content.encode('utf-8'))))
-                self.end_headers()
-                self.wfile.write(content.encode('utf-8'))
+            if filename in self._static_cache:
+                self._write_cached(filename, content_type)
             else:
                 self.send_error(404, f"Static file {filename} not found")
         except Exception as e:
             self.send_error(500, f"Error serving static file {filename}: {str(e)}")
     
+    def _write_cached(self, filename, content_type):
+        """Write a cached file's full response in a single socket write
+
+        Sends the gzip body when the client accepts it, and 304 Not Modified
+        when the client already holds the current ETag.
+        """
+        variants = self._static_variants[filename]
+        use_gzip = True in variants and bool(
+            _ACCEPTS_GZIP.search(self.headers.get('Accept-Encoding', ''))
+        )
+        body, etag = variants[use_gzip]
+        if_none_match = self.headers.get('If-None-Match')
+        status = 200
+        if if_none_match and (if_none_match.strip() == '*' or etag in
+                              [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]):
+            status, body = 304, b''
+
+        key = (filename, status, use_gzip)
+        head = self._static_heads.get(key)
+        if head is None:
+            lines = [f"{self.protocol_version} {status} {self.responses[status][0]}",
+                     f"ETag: {etag}",
+                     "Cache-Control: no-cache",
+                     "Vary: Accept-Encoding"]
+            if status == 200:
+                lines.append(f"Content-Type: {content_type}")
+                if use_gzip:
+                    lines.append("Content-Encoding: gzip")
+                lines.append(f"Content-Length: {len(body)}")
+            head = ("\r\n".join(lines) + "\r\n").encode('latin-1')
+            self._static_heads[key] = head
+        self.log_request(status)
+        date = f"Date: {self.date_time_string()}\r\n\r\n".encode('latin-1')
+        self.wfile.write(head + date + body)
+    
     def send_json_response(self, data, status=200):
         """Send JSON response"""
-        json_data = json.dumps(data, indent=2)
-        
+        # Compact bytes in one step; no indent
+        self.send_json_bytes(_dumps(data), status)
+    
+    def send_json_bytes(self, payload, status=200):
+        """Send an already encoded JSON body"""
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.send_header('Content-Length', str(len(json_data.encode('utf-8'))))
+        self.send_header('Content-Length', str(len(payload)))
         self.end_headers()
-        self.wfile.write(json_data.encode('utf-8'))
+        self.wfile.write(payload)
     
     def log_message(self, format, *args):
         """Custom log format"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        message = f"[{timestamp}] {format % args}"
-        print(message)
-        
-        # Also write to log file
-        logs_dir = Path('logs')
-        logs_dir.mkdir(exist_ok=True)
-        with open(logs_dir / 'api_server.log', 'a') as f:
-            f.write(message + '\n')
+        # Timestamped, printed and written to file by the listener thread
+        # (see _start_access_log)
+        access_logger.info(format % args)
+
+def _start_access_log(log_dir='logs'):
+    """Route access_logger through a queue to stdout and a rotating log file
+
+    Request threads only enqueue the record; the returned QueueListener's
+    thread does the console and file I/O. Call ``stop()`` on it at shutdown
+    to flush.
+    """
+    logs_dir = Path(log_dir)
+    logs_dir.mkdir(exist_ok=True)
+    formatter = logging.Formatter('[%(asctime)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    file_handler = logging.handlers.RotatingFileHandler(
+        logs_dir / 'api_server.log', maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+    )
+    console_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    access_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+    listener.start()
+    return listener
+
 
 def run_server(port=8080):
     """Run the real-time API server"""
     server_address = ('', port)
-    httpd = HTTPServer(server_address, RealtimeAPIHandler)
+    # One thread per request so dashboard polls do not queue behind a slow
+    # database query
+    httpd = ThreadingHTTPServer(server_address, RealtimeAPIHandler)
+    # Request threads must not keep the process alive after Ctrl+C
+    httpd.daemon_threads = True
+    log_listener = _start_access_log()
     
     print(f"TRIAXUS Real-time API Server starting...")
     print(f"Dashboard: http://localhost:{port}")
@@ -236,7 +412,10 @@ def run_server(port=8080):
         httpd.serve_forever()
     except KeyboardInterrupt:
         print("\nServer stopped")
-        httpd.shutdown()
+    finally:
+        # serve_forever has already returned; release the listening socket
+        httpd.server_close()
+        log_listener.stop()
 
 if __name__ == '__main__':
     import pandas as pd
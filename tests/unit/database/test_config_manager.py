@@ -0,0 +1,30 @@
+"""
+Configuration manager tests for TRIAXUS database settings
+"""
+
+from triaxus.database.config_manager import SecureDatabaseConfigManager
+
+
+class TestSecureDatabaseConfigManager:
+    """Test SecureDatabaseConfigManager configuration resolution"""
+
+    def test_configuration_resolved_once_until_cleared(self, monkeypatch):
+        """Environment overrides are read once and refreshed by clear_cache"""
+        monkeypatch.setenv('DATABASE_URL', 'sqlite:///first.db')
+        config = SecureDatabaseConfigManager({'database': {'enabled': True}})
+        assert config.get_connection_url() == 'sqlite:///first.db'
+
+        monkeypatch.setenv('DATABASE_URL', 'sqlite:///second.db')
+        assert config.get_connection_url() == 'sqlite:///first.db'
+
+        config.clear_cache()
+        assert config.get_connection_url() == 'sqlite:///second.db'
+
+    def test_returned_configuration_is_a_copy(self, monkeypatch):
+        """Callers cannot modify the cached configuration"""
+        monkeypatch.delenv('DATABASE_URL', raising=False)
+        config = SecureDatabaseConfigManager({'database': {'url': 'sqlite:///a.db'}})
+
+        config.get_database_config()['url'] = 'sqlite:///changed.db'
+
+        assert config.get_connection_url() == 'sqlite:///a.db'
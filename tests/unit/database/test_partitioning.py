@@ -0,0 +1,128 @@
+"""
+Monthly partitioning tests for TRIAXUS (PostgreSQL only)
+
+These tests load triaxus/database/sql/init_database.sql into a scratch
+database, convert it with partition_by_month() and check that constraints,
+triggers, views and the DEFAULT partition keep working. They run only when
+TRIAXUS_TEST_POSTGRES_URL points at a database whose TRIAXUS tables may be
+dropped.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from triaxus.database.config_manager import SecureDatabaseConfigManager
+from triaxus.database.initializer import DatabaseInitializer, _add_months, _month_start
+
+POSTGRES_URL = os.getenv('TRIAXUS_TEST_POSTGRES_URL')
+
+pytestmark = pytest.mark.skipif(
+    not (POSTGRES_URL or '').startswith('postgresql'),
+    reason="TRIAXUS_TEST_POSTGRES_URL is not set to a scratch PostgreSQL database"
+)
+
+INIT_SQL = (
+    Path(__file__).parent.parent.parent.parent / "triaxus" / "database" / "sql" / "init_database.sql"
+)
+
+_INSERT_SQL = text(
+    "INSERT INTO oceanographic_data (datetime, depth, latitude, longitude, ph, source_file) "
+    "VALUES (:datetime, :depth, -32.0, 115.0, :ph, 'partition_test.cnv')"
+)
+
+
+@pytest.fixture
+def initializer():
+    """Provide an initializer bound to a schema freshly loaded from init_database.sql"""
+    initializer = DatabaseInitializer(SecureDatabaseConfigManager({
+        'database': {'enabled': True, 'url': POSTGRES_URL}
+    }))
+    assert initializer.connection_manager.connect()
+    engine = initializer.connection_manager.get_engine()
+
+    # Run the script as psql would: one multi-statement string, functions included
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            cursor.execute(INIT_SQL.read_text())
+        raw.commit()
+    finally:
+        raw.close()
+
+    yield initializer
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS oceanographic_data, data_sources CASCADE"))
+        conn.execute(text("DROP FUNCTION IF EXISTS update_updated_at_column() CASCADE"))
+        conn.execute(text("DROP FUNCTION IF EXISTS validate_oceanographic_data() CASCADE"))
+    initializer.cleanup()
+
+
+def _insert(engine, when, depth=1.0, ph=8.0):
+    with engine.begin() as conn:
+        conn.execute(_INSERT_SQL, {'datetime': when, 'depth': depth, 'ph': ph})
+
+
+def _partition_of(engine, depth):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT tableoid::regclass::text FROM oceanographic_data WHERE depth = :depth"
+        ), {'depth': depth}).scalar()
+
+
+class TestPartitionByMonth:
+    """Test converting a schema built from init_database.sql"""
+
+    def test_views_triggers_and_constraints_survive(self, initializer):
+        """Views, triggers and CHECK constraints work on the partitioned table"""
+        engine = initializer.connection_manager.get_engine()
+        now = datetime.now(timezone.utc)
+        last_month = _add_months(_month_start(now), -1).replace(tzinfo=timezone.utc)
+        _insert(engine, last_month + timedelta(days=3), depth=1.0)
+        _insert(engine, now, depth=2.0)
+
+        assert initializer.partition_by_month(months_ahead=1)
+        assert initializer.is_partitioned()
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT total_records FROM data_statistics")).scalar() == 2
+            assert conn.execute(text("SELECT count(*) FROM latest_data_by_depth")).scalar() == 1
+        assert _partition_of(engine, 1.0) == f"oceanographic_data_{last_month:%Y_%m}"
+
+        # Validation trigger
+        with pytest.raises(DBAPIError, match="pH out of valid range"):
+            _insert(engine, now, depth=3.0, ph=12.0)
+        # CHECK (depth >= 0)
+        with pytest.raises(DBAPIError, match="check"):
+            _insert(engine, now, depth=-1.0)
+        # updated_at trigger
+        with engine.begin() as conn:
+            conn.execute(text(
+                "UPDATE oceanographic_data SET updated_at = '2000-01-01' WHERE depth = 2.0"
+            ))
+            updated_at = conn.execute(text(
+                "SELECT updated_at FROM oceanographic_data WHERE depth = 2.0"
+            )).scalar()
+        assert updated_at.year != 2000
+
+    def test_create_monthly_partitions_moves_default_rows(self, initializer):
+        """New partitions take their month's rows out of the DEFAULT partition"""
+        engine = initializer.connection_manager.get_engine()
+        assert initializer.partition_by_month(months_ahead=1)
+
+        future = _add_months(_month_start(datetime.now(timezone.utc)), 4).replace(tzinfo=timezone.utc)
+        _insert(engine, future + timedelta(days=1), depth=5.0)
+        assert _partition_of(engine, 5.0) == "oceanographic_data_default"
+
+        assert initializer.create_monthly_partitions(months_ahead=4) > 0
+        assert _partition_of(engine, 5.0) == f"oceanographic_data_{future:%Y_%m}"
+
+        # Idempotent once every month exists
+        assert initializer.create_monthly_partitions(months_ahead=4) == 0
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM oceanographic_data")).scalar() == 1
@@ -0,0 +1,382 @@
+"""
+Repository and session tests for TRIAXUS
+
+These tests run against a temporary SQLite database so that the repository
+layer can be exercised without a PostgreSQL server.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from triaxus.database.config_manager import SecureDatabaseConfigManager
+from triaxus.database.connection_manager import DatabaseConnectionManager
+from triaxus.database.models import Base, DataSource, OceanographicData
+from triaxus.database.async_repositories import AsyncOceanographicDataRepository
+from triaxus.database.mappers import DataMapper
+from triaxus.database.repositories import DataSourceRepository, OceanographicDataRepository
+
+
+@pytest.fixture
+def connection_manager(tmp_path, monkeypatch):
+    """Provide a connected manager backed by a temporary SQLite database"""
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    monkeypatch.delenv('DB_ENABLED', raising=False)
+    config = SecureDatabaseConfigManager({
+        'database': {
+            'enabled': True,
+            'url': f"sqlite:///{tmp_path / 'triaxus_test.db'}",
+        }
+    })
+    manager = DatabaseConnectionManager(config)
+    assert manager.connect()
+    Base.metadata.create_all(manager.engine)
+    yield manager
+    manager.disconnect()
+
+
+@pytest.fixture
+def repository(connection_manager):
+    """Provide an OceanographicDataRepository bound to the test database"""
+    return OceanographicDataRepository(connection_manager)
+
+
+def _make_records(count: int, start: datetime = None):
+    start = start or datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        OceanographicData(
+            datetime=start + timedelta(seconds=i),
+            depth=float(i),
+            latitude=-32.0 + i * 0.001,
+            longitude=115.0 + i * 0.001,
+            tv290c=15.0,
+            sal00=35.0,
+            source_file='unit_test.cnv',
+        )
+        for i in range(count)
+    ]
+
+
+class TestPoolOverrides:
+    """Test DatabaseConnectionManager pool overrides"""
+
+    def test_overrides_take_precedence(self, tmp_path, monkeypatch):
+        """Overridden pool settings size the engine's pool"""
+        monkeypatch.delenv('DATABASE_URL', raising=False)
+        monkeypatch.delenv('DB_ENABLED', raising=False)
+        config = SecureDatabaseConfigManager({
+            'database': {
+                'enabled': True,
+                'url': f"sqlite:///{tmp_path / 'pool_test.db'}",
+                'pool_size': 2,
+            }
+        })
+        manager = DatabaseConnectionManager(config, pool_overrides={'pool_size': 3, 'max_overflow': 1})
+        assert manager.connect()
+        try:
+            pool_config = manager.get_pool_config()
+            assert pool_config['pool_size'] == 3 and pool_config['max_overflow'] == 1
+            assert manager.engine.pool.size() == 3
+        finally:
+            manager.disconnect()
+
+
+class TestBatchedSession:
+    """Test DatabaseConnectionManager.batched_session"""
+
+    def test_flushes_every_batch_and_commits_once(self, connection_manager):
+        """Rows are flushed in batches and committed on exit"""
+        with connection_manager.batched_session(batch_size=10) as session:
+            session.add_all(_make_records(25))
+            assert len(session.new) == 5
+
+        with connection_manager.get_session() as session:
+            assert session.query(OceanographicData).count() == 25
+
+    def test_rollback_on_error(self, connection_manager):
+        """Nothing is committed when the block raises"""
+        with pytest.raises(RuntimeError):
+            with connection_manager.batched_session(batch_size=5) as session:
+                session.add_all(_make_records(12))
+                raise RuntimeError("abort ingest")
+
+        with connection_manager.get_session() as session:
+            assert session.query(OceanographicData).count() == 0
+
+    def test_rejects_invalid_batch_size(self, connection_manager):
+        """A non-positive batch size is rejected"""
+        with pytest.raises(ValueError):
+            with connection_manager.batched_session(batch_size=0):
+                pass
+
+
+class TestOceanographicDataRepository:
+    """Test OceanographicDataRepository queries"""
+
+    def test_get_by_location(self, repository):
+        """Only records inside the bounding box are returned"""
+        assert repository.create(_make_records(20))
+
+        depths = [
+            record.depth for record in repository.get_by_location(
+                lat_min=-32.0, lat_max=-31.995,
+                lon_min=115.0, lon_max=115.0045
+            )
+        ]
+
+        assert sorted(depths) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    def test_range_queries_stream_in_order(self, repository):
+        """Range queries yield matching records in their sort order"""
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert repository.create_bulk(list(reversed(_make_records(30))))
+
+        times = [
+            record.datetime for record in repository.get_by_time_range(
+                start + timedelta(seconds=5), start + timedelta(seconds=9)
+            )
+        ]
+        depths = [record.depth for record in repository.get_by_depth_range(20.0, 22.0)]
+        source_count = sum(1 for _ in repository.get_by_source_file('unit_test.cnv'))
+
+        assert len(times) == 5 and times == sorted(times)
+        assert depths == [20.0, 21.0, 22.0]
+        assert source_count == 30
+
+    def test_streamed_result_to_dataframe(self, repository):
+        """A streamed range query converts to a populated DataFrame"""
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert repository.create(_make_records(5))
+
+        df = DataMapper().models_to_dataframe(
+            repository.get_by_time_range(start, start + timedelta(seconds=10))
+        )
+
+        assert df.shape[0] == 5
+        assert list(df['depth']) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    def test_statistics_cache_invalidated_by_writes(self, repository):
+        """Cached statistics are refreshed after create and delete"""
+        assert repository.create(_make_records(5))
+        assert repository.get_statistics()['total_records'] == 5
+
+        assert repository.create(_make_records(3))
+        assert repository.get_statistics()['total_records'] == 8
+
+        assert repository.delete_by_source_file('unit_test.cnv') == 8
+        assert repository.get_statistics()['total_records'] == 0
+
+    def test_statistics_ranges(self, repository):
+        """Ranges and per-file counts are reported from the aggregate query"""
+        assert repository.create(_make_records(10))
+
+        stats = repository.get_statistics()
+
+        assert stats['total_records'] == 10
+        assert stats['depth_range'] == {'min': 0.0, 'max': 9.0}
+        assert stats['geographic_bounds']['lat_min'] == pytest.approx(-32.0)
+        assert stats['geographic_bounds']['lon_max'] == pytest.approx(115.009)
+        assert 'date_range' in stats
+        assert stats['source_files'] == {'unit_test.cnv': 10}
+
+    def test_get_exact_count(self, repository):
+        """The exact count matches the number of stored records"""
+        assert repository.get_exact_count() == 0
+        assert repository.create(_make_records(7))
+        assert repository.get_exact_count() == 7
+
+    def test_get_latest_in_time_range(self, repository):
+        """Only records inside the window are returned, newest first"""
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert repository.create_bulk(_make_records(10))
+
+        records = repository.get_latest_in_time_range(
+            start + timedelta(seconds=2), start + timedelta(seconds=6), limit=3
+        )
+
+        assert [record.depth for record in records] == [6.0, 5.0, 4.0]
+
+    def test_get_latest_time(self, repository):
+        """The newest record time is reported, or None for an empty table"""
+        assert repository.get_latest_time() is None
+        assert repository.create(_make_records(4))
+        latest = repository.get_latest_time()
+        assert latest.replace(tzinfo=None) == datetime(2024, 1, 1, 0, 0, 3)
+
+    def test_create_bulk_accepts_models_and_dicts(self, repository):
+        """Bulk insert accepts ORM instances and plain mappings"""
+        models = _make_records(3)
+        start = datetime(2024, 2, 1, tzinfo=timezone.utc)
+        mappings = [
+            {'datetime': start, 'depth': 1.0, 'latitude': -31.0,
+             'longitude': 115.5, 'source_file': 'bulk.cnv'},
+            {'datetime': start, 'depth': 2.0, 'latitude': -31.0,
+             'longitude': 115.5, 'source_file': 'bulk.cnv'},
+        ]
+
+        assert repository.create_bulk(models + mappings, chunk_size=2) == 5
+        assert repository.get_statistics()['source_files'] == {
+            'unit_test.cnv': 3, 'bulk.cnv': 2
+        }
+        assert repository.create_bulk([]) == 0
+
+    def test_create_from_arrays_drops_invalid_rows(self, repository):
+        """Column arrays are validated, inserted and NaN stored as NULL"""
+        arrays = {
+            'datetime': np.array(
+                ['2024-01-01T00:00:00', '2024-01-01T00:00:01', 'NaT', '2024-01-01T00:00:03'],
+                dtype='datetime64[ns]'
+            ),
+            'depth': np.array([1.0, -2.0, 3.0, 4.0]),
+            'latitude': np.array([-32.0, -32.0, -32.0, np.nan]),
+            'longitude': np.array([115.0, 115.0, 115.0, 115.0]),
+            'tv290c': np.array([15.0, 15.0, 15.0, 15.0]),
+            'ph': np.array([np.nan, 8.0, 8.0, 8.0]),
+        }
+
+        assert repository.create_from_arrays(arrays, source_file='arrays.cnv') == 1
+
+        record = next(repository.get_by_source_file('arrays.cnv'))
+        assert record.depth == 1.0 and record.ph is None
+        assert record.datetime.replace(tzinfo=None) == datetime(2024, 1, 1)
+
+    def test_create_from_arrays_rejects_missing_columns(self, repository):
+        """Required columns must be present"""
+        with pytest.raises(ValueError):
+            repository.create_from_arrays({'depth': np.array([1.0])})
+
+    def test_latest_records_are_readable_after_session_closes(self, repository):
+        """Latest records keep their loaded attributes once detached"""
+        assert repository.create(_make_records(10))
+
+        records = repository.get_latest_records(limit=3)
+
+        assert [record.depth for record in records] == [9.0, 8.0, 7.0]
+        assert all(record.created_at is not None for record in records)
+        assert [r.depth for r in list(repository.get_by_depth_range(0.0, 1.0))] == [0.0, 1.0]
+
+    def test_delete_by_source_file_in_chunks(self, repository):
+        """All rows of a source file are removed even across several chunks"""
+        assert repository.create_bulk(_make_records(25))
+
+        assert repository.delete_by_source_file('unit_test.cnv', chunk_size=10) == 25
+        assert repository.delete_by_source_file('unit_test.cnv', chunk_size=10) == 0
+        assert repository.get_statistics()['total_records'] == 0
+
+    def test_get_by_id_and_exists_by_id(self, repository):
+        """Primary key lookups accept UUIDs and their string form"""
+        records = _make_records(2)
+        assert repository.create(records)
+        record_id = records[1].id
+
+        assert repository.get_by_id(str(record_id)).depth == 1.0
+        assert repository.exists_by_id(record_id)
+        assert not repository.exists_by_id(uuid.uuid4())
+        assert repository.get_by_id('not-a-uuid') is None
+
+    def test_get_series_returns_projected_arrays(self, repository):
+        """Only the requested columns are returned, as ordered NumPy arrays"""
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert repository.create_bulk(list(reversed(_make_records(10))))
+
+        series = repository.get_series(
+            start + timedelta(seconds=2), start + timedelta(seconds=5),
+            ['datetime', 'depth', 'tv290c', 'ph']
+        )
+
+        assert set(series) == {'datetime', 'depth', 'tv290c', 'ph'}
+        assert series['depth'].tolist() == [2.0, 3.0, 4.0, 5.0]
+        assert series['datetime'][0] == np.datetime64('2024-01-01T00:00:02')
+        assert np.isnan(series['ph']).all()
+        assert repository.get_series(start, start, ['depth'])['depth'].size == 1
+
+    def test_get_series_rejects_unknown_columns(self, repository):
+        """Unknown column names are reported instead of silently ignored"""
+        with pytest.raises(ValueError):
+            repository.get_series(datetime(2024, 1, 1), datetime(2024, 1, 2), ['nope'])
+
+
+    def test_database_errors_return_defaults(self, connection_manager, repository):
+        """Methods fall back to their defaults when the session cannot be used"""
+        connection_manager.disconnect()
+
+        first, second = repository.get_latest_records(), repository.get_latest_records()
+        assert first == [] and first is not second
+        assert repository.get_statistics() == {}
+        assert repository.create(_make_records(1)) is False
+        assert repository.get_by_id(uuid.uuid4()) is None
+
+class TestDataSourceRepository:
+    """Test DataSourceRepository bulk updates and cached listing"""
+
+    def test_get_all_cached_until_write(self, connection_manager):
+        """get_all serves cached copies until create or update_status runs"""
+        repository = DataSourceRepository(connection_manager)
+        assert repository.create(DataSource(filename='a.cnv', total_records=1.0))
+
+        first = repository.get_all()
+        assert [source.filename for source in first] == ['a.cnv']
+
+        # A write behind the repository's back is hidden by the cache, and
+        # callers never share the cached instances
+        with connection_manager.get_session() as session:
+            session.add(DataSource(filename='hidden.cnv'))
+            session.commit()
+        second = repository.get_all()
+        assert [source.filename for source in second] == ['a.cnv']
+        assert second[0] is not first[0]
+        second[0].processing_status = 'mutated'
+        assert repository.get_all()[0].processing_status == 'processed'
+
+        assert repository.create(DataSource(filename='b.cnv'))
+        assert {source.filename for source in repository.get_all()} == {
+            'a.cnv', 'b.cnv', 'hidden.cnv'
+        }
+
+        assert repository.update_status('a.cnv', 'failed')
+        statuses = {source.filename: source.processing_status
+                    for source in repository.get_all()}
+        assert statuses['a.cnv'] == 'failed'
+
+    def test_update_status_bulk(self, connection_manager):
+        """Several data sources are updated by one call"""
+        repository = DataSourceRepository(connection_manager)
+        for name in ('a.cnv', 'b.cnv', 'c.cnv'):
+            assert repository.create(DataSource(filename=name, total_records=1.0))
+
+        updated = repository.update_status_bulk([
+            ('a.cnv', 'failed', None),
+            ('b.cnv', 'complete', 250),
+            ('missing.cnv', 'complete', 10),
+        ])
+
+        sources = {name: repository.get_by_filename(name) for name in ('a.cnv', 'b.cnv', 'c.cnv')}
+        assert updated == 2
+        assert sources['a.cnv'].processing_status == 'failed'
+        assert sources['a.cnv'].total_records == 1.0
+        assert sources['b.cnv'].processing_status == 'complete'
+        assert sources['b.cnv'].total_records == 250.0
+        assert sources['c.cnv'].processing_status == 'processed'
+        assert repository.update_status_bulk([]) == 0
+
+
+class TestAsyncOceanographicDataRepository:
+    """Test AsyncOceanographicDataRepository"""
+
+    def test_dashboard_data_matches_sync_repository(self, connection_manager, repository):
+        """Concurrent dashboard queries return the same data as the sync ones"""
+        pytest.importorskip('aiosqlite')
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert repository.create_bulk(_make_records(20))
+        async_repository = AsyncOceanographicDataRepository(connection_manager)
+
+        stats, latest, in_range = asyncio.run(async_repository.get_dashboard_data(
+            start + timedelta(seconds=3), start + timedelta(seconds=6), limit=2
+        ))
+
+        assert stats == repository.get_statistics()
+        assert [record.depth for record in latest] == [19.0, 18.0]
+        assert [record.depth for record in in_range] == [3.0, 4.0, 5.0, 6.0]
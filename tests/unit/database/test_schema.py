@@ -88,12 +88,12 @@ class DatabaseSchemaTester:
                 'datetime': 'timestamp with time zone',
                 'latitude': 'double precision',
                 'longitude': 'double precision',
-                'depth': 'double precision',
-                'tv290c': 'double precision',
-                'sal00': 'double precision',
-                'sbeox0mm_l': 'double precision',
-                'fleco_afl': 'double precision',
-                'ph': 'double precision',
+                'depth': 'real',
+                'tv290c': 'real',
+                'sal00': 'real',
+                'sbeox0mm_l': 'real',
+                'fleco_afl': 'real',
+                'ph': 'real',
                 'source_file': 'character varying',
                 'created_at': 'timestamp with time zone'
             }
@@ -0,0 +1,78 @@
+"""
+Unit tests for the asyncio real-time API server
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("aiosqlite")
+from aiohttp.test_utils import TestClient, TestServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "realtime"))
+from async_api_server import create_app
+
+from triaxus.database.config_manager import SecureDatabaseConfigManager
+from triaxus.database.connection_manager import DatabaseConnectionManager
+from triaxus.database.models import Base, OceanographicData
+from triaxus.database.repositories import OceanographicDataRepository
+
+
+@pytest.fixture
+def database_url(tmp_path, monkeypatch):
+    """Point the server at a temporary SQLite database holding five records"""
+    url = f"sqlite:///{tmp_path / 'async_api.db'}"
+    monkeypatch.setenv('DATABASE_URL', url)
+    monkeypatch.setenv('DB_ENABLED', 'true')
+
+    manager = DatabaseConnectionManager(SecureDatabaseConfigManager())
+    assert manager.connect()
+    Base.metadata.create_all(manager.engine)
+    # Inside the default 24 hour window of /api/latest_data
+    start = datetime.now(timezone.utc) - timedelta(minutes=10)
+    assert OceanographicDataRepository(manager).create([
+        OceanographicData(
+            datetime=start + timedelta(seconds=i),
+            depth=float(i),
+            latitude=-32.0,
+            longitude=115.0,
+            tv290c=15.0,
+            source_file='async_api.cnv',
+        )
+        for i in range(5)
+    ])
+    manager.disconnect()
+    return url
+
+
+def _get_json(path):
+    """Run the app on a test server and fetch one JSON endpoint"""
+    async def fetch():
+        async with TestClient(TestServer(create_app())) as client:
+            response = await client.get(path)
+            return response.status, await response.json()
+    return asyncio.run(fetch())
+
+
+class TestAsyncAPIServer:
+    """Test the aiohttp endpoints against a SQLite database"""
+
+    def test_status(self, database_url):
+        """Status reports a connected database"""
+        status, body = _get_json('/api/status')
+
+        assert status == 200
+        assert body['success'] and body['database_connected']
+        assert body['latest_records'] == 5
+
+    def test_latest_data(self, database_url):
+        """Latest data honours the limit and returns JSON records"""
+        status, body = _get_json('/api/latest_data?limit=3')
+
+        assert status == 200
+        assert body['success'] and body['count'] == 3
+        assert {record['depth'] for record in body['data']} == {2.0, 3.0, 4.0}
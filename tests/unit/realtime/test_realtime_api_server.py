@@ -207,6 +207,28 @@ console.log('Test dashboard loaded');
                 
                 print("  PASS: Error handling")
 
+    def test_frame_to_records(self):
+        """Test vectorized record conversion"""
+        print("Testing record conversion...")
+        
+        import pandas as pd
+        from realtime_api_server import RECORD_FIELDS, _frame_to_records
+        
+        data = pd.DataFrame({
+            'time': ['2024-01-01T12:00:00Z', None],
+            **{field: [1.5, 'n/a'] for field in RECORD_FIELDS}
+        })
+        data.loc[0, 'ph'] = None
+        
+        records = _frame_to_records(data)
+        
+        assert records[0]['time'] == '2024-01-01T12:00:00Z'
+        assert records[0]['depth'] == 1.5 and records[0]['ph'] is None
+        assert all(value is None for value in records[1].values())
+        assert _frame_to_records(data.head(0)) == []
+        
+        print("  PASS: Record conversion")
+
 
 def test_realtime_api_server_integration():
     """Integration test for real-time API server"""
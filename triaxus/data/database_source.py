@@ -22,14 +22,20 @@ class DatabaseDataSource:
     Simple database data source for TRIAXUS visualization system
     """
     
-    def __init__(self):
-        """Initialize database data source"""
+    def __init__(self, pool_overrides: Optional[Dict[str, Any]] = None):
+        """
+        Initialize database data source
+        
+        Args:
+            pool_overrides: Optional connection pool settings for this source,
+                e.g. to size the pool for a threaded server
+        """
         self.logger = logging.getLogger(__name__)
         
         try:
             # Initialize database components
             self.config_manager = SecureDatabaseConfigManager()
-            self.connection_manager = DatabaseConnectionManager(self.config_manager)
+            self.connection_manager = DatabaseConnectionManager(self.config_manager, pool_overrides)
             self.mapper = DataMapper()
             self.repository = OceanographicDataRepository(self.connection_manager)
             
@@ -45,22 +51,28 @@ class DatabaseDataSource:
         """Check if database is available"""
         return self.available
     
-    def load_data(self, limit: int = 100) -> pd.DataFrame:
+    def load_data(self, limit: int = 100, time_start: Optional[datetime] = None,
+                  time_end: Optional[datetime] = None) -> pd.DataFrame:
         """
         Load data from database
         
         Args:
             limit: Maximum number of records to load
+            time_start: Optional start of a time window, applied in SQL
+            time_end: Optional end of a time window, applied in SQL
             
         Returns:
-            Pandas DataFrame with oceanographic data
+            Pandas DataFrame with oceanographic data, newest first
         """
         if not self.available:
             return pd.DataFrame()
         
         try:
             # Get latest records from database
-            models = self.repository.get_latest_records(limit)
+            if time_start is not None and time_end is not None:
+                models = self.repository.get_latest_in_time_range(time_start, time_end, limit)
+            else:
+                models = self.repository.get_latest_records(limit)
             
             # Convert models to DataFrame
             df = self.mapper.models_to_dataframe(models)
@@ -72,6 +84,22 @@ class DatabaseDataSource:
             self.logger.error(f"Error loading data from database: {e}")
             return pd.DataFrame()
     
+    def get_latest_time(self) -> Optional[datetime]:
+        """
+        Get the timestamp of the newest record in the database
+        
+        Returns:
+            Newest record datetime, or None if unavailable or empty
+        """
+        if not self.available:
+            return None
+        
+        try:
+            return self.repository.get_latest_time()
+        except Exception as e:
+            self.logger.error(f"Error getting latest record time: {e}")
+            return None
+    
     def store_data(self, data: pd.DataFrame, source_file: Optional[str] = None) -> bool:
         """
         Store data to database
@@ -95,7 +123,7 @@ class DatabaseDataSource:
                 return False
             
             # Store in database
-            success = self.repository.create(models)
+            success = self.repository.create_bulk(models) == len(models)
             
             if success:
                 self.logger.info(f"Stored {len(models)} records in database")
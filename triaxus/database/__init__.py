@@ -11,6 +11,7 @@ from .initializer import DatabaseInitializer
 from .models import OceanographicData, DataSource
 from .mappers import DataMapper, DataSourceMapper
 from .repositories import OceanographicDataRepository, DataSourceRepository
+from .async_repositories import AsyncOceanographicDataRepository
 
 __all__ = [
     'DatabaseConnectionManager',
@@ -21,5 +22,6 @@ __all__ = [
     'DataMapper',
     'DataSourceMapper',
     'OceanographicDataRepository',
-    'DataSourceRepository'
+    'DataSourceRepository',
+    'AsyncOceanographicDataRepository'
 ]
@@ -0,0 +1,192 @@
+"""
+Async repository implementation for TRIAXUS database operations
+
+This module provides asyncio variants of the read-heavy repository queries so
+that independent dashboard queries can run concurrently on separate pooled
+connections. Batch scripts should keep using the synchronous repositories.
+"""
+
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime
+from sqlalchemy.exc import SQLAlchemyError
+import asyncio
+import functools
+import logging
+
+from .models import OceanographicData
+from .connection_manager import DatabaseConnectionManager
+from .repositories import (
+    _COUNT_AND_RANGES_STMT,
+    _LATEST_IN_RANGE_STMT,
+    _LATEST_STMT,
+    _SOURCE_FILE_COUNTS_STMT,
+    _STATS_CACHE_KEY,
+    _TIME_RANGE_STMT,
+    _build_statistics,
+    _cache_get,
+    _cache_set,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def with_async_session(default: Any = None, action: str = "running query"):
+    """
+    Run an async repository method inside a session and absorb database errors
+
+    Async counterpart of ``repositories.with_session``: the decorated
+    coroutine receives an ``AsyncSession`` after ``self`` and ``default``
+    (called first if it is callable) is returned on ``SQLAlchemyError``.
+
+    Args:
+        default: Value, or factory for the value, returned on error
+        action: Description used in the error log message
+
+    Returns:
+        Coroutine method decorator
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            try:
+                async with self.connection_manager.get_async_session() as session:
+                    return await method(self, session, *args, **kwargs)
+            except SQLAlchemyError as e:
+                self.logger.error(f"Error {action}: {e}")
+                return default() if callable(default) else default
+        return wrapper
+    return decorator
+
+
+class AsyncOceanographicDataRepository:
+    """
+    Async repository for oceanographic data read operations
+
+    Each method opens its own session, so calls combined with
+    ``asyncio.gather`` run on separate connections in parallel.
+    """
+
+    def __init__(self, connection_manager: Optional[DatabaseConnectionManager] = None):
+        """
+        Initialize repository
+
+        Args:
+            connection_manager: Connected DatabaseConnectionManager instance
+        """
+        self.connection_manager = connection_manager or DatabaseConnectionManager()
+        self.logger = logging.getLogger(__name__)
+
+    @with_async_session(default=list, action="getting latest records")
+    async def get_latest_records(self, session, limit: int = 100) -> List[OceanographicData]:
+        """
+        Get latest records
+
+        Args:
+            limit: Maximum number of records to return
+
+        Returns:
+            List of latest OceanographicData records
+        """
+        result = await session.execute(_LATEST_STMT, {'limit': limit})
+        records = result.scalars().all()
+        session.expunge_all()
+
+        self.logger.info(f"Retrieved {len(records)} latest records")
+        return records
+
+    @with_async_session(default=list, action="getting latest records in time range")
+    async def get_latest_in_time_range(self, session, start_time: datetime, end_time: datetime,
+                                       limit: int = 100) -> List[OceanographicData]:
+        """
+        Get the newest records within a time range
+        
+        Args:
+            start_time: Start datetime
+            end_time: End datetime
+            limit: Maximum number of records to return
+            
+        Returns:
+            List of OceanographicData records, newest first
+        """
+        result = await session.execute(_LATEST_IN_RANGE_STMT, {
+            'start_time': start_time,
+            'end_time': end_time,
+            'limit': limit
+        })
+        records = result.scalars().all()
+        session.expunge_all()
+        
+        self.logger.info(f"Retrieved {len(records)} latest records in time range")
+        return records
+    
+    @with_async_session(default=list, action="getting records in time range")
+    async def get_by_time_range(self, session, start_time: datetime,
+                                end_time: datetime) -> List[OceanographicData]:
+        """
+        Get records within time range
+
+        Args:
+            start_time: Start datetime
+            end_time: End datetime
+
+        Returns:
+            List of OceanographicData records ordered by datetime
+        """
+        result = await session.execute(_TIME_RANGE_STMT, {
+            'start_time': start_time,
+            'end_time': end_time
+        })
+        records = result.scalars().all()
+        session.expunge_all()
+
+        self.logger.info(f"Found {len(records)} records in time range")
+        return records
+
+    @with_async_session(default=dict, action="getting database statistics")
+    async def get_statistics(self, session) -> Dict[str, Any]:
+        """
+        Get database statistics
+
+        Shares the short-lived cache of
+        ``OceanographicDataRepository.get_statistics()``, including its
+        invalidation on writes.
+
+        Returns:
+            Dictionary with database statistics
+        """
+        cached = _cache_get(self.connection_manager, _STATS_CACHE_KEY)
+        if cached is not None:
+            return dict(cached)
+
+        total_records, *ranges = (await session.execute(_COUNT_AND_RANGES_STMT)).one()
+
+        source_files = (await session.execute(_SOURCE_FILE_COUNTS_STMT)).tuples().all()
+        stats = _build_statistics(total_records, ranges, source_files)
+
+        self.logger.info("Retrieved database statistics")
+        _cache_set(self.connection_manager, _STATS_CACHE_KEY, stats)
+        return dict(stats)
+
+    async def get_dashboard_data(self, start_time: datetime, end_time: datetime,
+                                 limit: int = 100) -> Tuple[Dict[str, Any],
+                                                            List[OceanographicData],
+                                                            List[OceanographicData]]:
+        """
+        Fetch statistics, latest records and a time range concurrently
+
+        Page latency is bounded by the slowest of the three queries rather
+        than their sum.
+
+        Args:
+            start_time: Start of the time range
+            end_time: End of the time range
+            limit: Maximum number of latest records
+
+        Returns:
+            Tuple of (statistics, latest records, records in time range)
+        """
+        return tuple(await asyncio.gather(
+            self.get_statistics(),
+            self.get_latest_records(limit),
+            self.get_by_time_range(start_time, end_time)
+        ))
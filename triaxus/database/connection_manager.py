@@ -7,8 +7,9 @@ health checks, and error handling.
 
 from typing import Optional, Dict, Any
 import logging
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from sqlalchemy import create_engine, Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
@@ -17,20 +18,32 @@ from .config_manager import SecureDatabaseConfigManager
 
 logger = logging.getLogger(__name__)
 
+# Async drivers used for each backend by get_async_session()
+_ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
 
 class DatabaseConnectionManager:
     """Manages PostgreSQL database connections with pooling and health checks"""
 
-    def __init__(self, config_manager: Optional[SecureDatabaseConfigManager] = None):
+    def __init__(self, config_manager: Optional[SecureDatabaseConfigManager] = None,
+                 pool_overrides: Optional[Dict[str, Any]] = None):
         """
         Initialize DatabaseConnectionManager
         
         Args:
             config_manager: SecureDatabaseConfigManager instance
+            pool_overrides: Pool settings (e.g. ``pool_size``) that take
+                precedence over the configured ones for this manager only
         """
         self.config_manager = config_manager or SecureDatabaseConfigManager()
+        self.pool_overrides = dict(pool_overrides or {})
         self.engine: Optional[Engine] = None
         self.session_factory: Optional[sessionmaker] = None
+        self.async_engine: Optional[AsyncEngine] = None
+        self.async_session_factory: Optional[async_sessionmaker] = None
         self.logger = logging.getLogger(__name__)
 
     def connect(self) -> bool:
@@ -47,14 +60,22 @@ class DatabaseConnectionManager:
 
             # Get configuration
             connection_url = self.config_manager.get_connection_url()
-            pool_config = self.config_manager.get_pool_config()
+            pool_config = self.get_pool_config()
 
             # Validate URL
             if not self.config_manager.validate_connection_url(connection_url):
                 self.logger.error(f"Invalid database connection URL: {connection_url}")
                 return False
 
-            # Create engine with connection pooling
+            # Server-side statement timeout (PostgreSQL only)
+            connect_args = {}
+            if connection_url.startswith('postgresql') and pool_config['statement_timeout_ms']:
+                connect_args['options'] = (
+                    f"-c statement_timeout={int(pool_config['statement_timeout_ms'])}"
+                )
+
+            # Create engine with connection pooling; pre-ping replaces stale
+            # pooled connections instead of failing the first query on them
             self.engine = create_engine(
                 connection_url,
                 poolclass=QueuePool,
@@ -62,11 +83,15 @@ class DatabaseConnectionManager:
                 max_overflow=pool_config['max_overflow'],
                 pool_timeout=pool_config['pool_timeout'],
                 pool_recycle=pool_config['pool_recycle'],
+                pool_pre_ping=pool_config['pool_pre_ping'],
+                query_cache_size=pool_config['query_cache_size'],
+                connect_args=connect_args,
                 echo=pool_config['echo']
             )
 
-            # Create session factory
-            self.session_factory = sessionmaker(bind=self.engine)
+            # Create session factory; keep loaded attributes after commit so
+            # records returned by repositories stay readable once detached
+            self.session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
 
             # Test connection
             if self._test_connection():
@@ -83,6 +108,12 @@ class DatabaseConnectionManager:
     def disconnect(self) -> None:
         """Close database connection and cleanup resources"""
         try:
+            if self.async_engine:
+                # Closing asyncpg connections needs an event loop; dereference
+                # the pool and let them be closed when collected
+                self.async_engine.sync_engine.dispose(close=False)
+                self.async_engine = None
+                self.async_session_factory = None
             if self.engine:
                 self.engine.dispose()
                 self.engine = None
@@ -171,6 +202,146 @@ class DatabaseConnectionManager:
         finally:
             session.close()
 
+    @contextmanager
+    def batched_session(self, batch_size: int = 1000, synchronous_commit: bool = True):
+        """
+        Get a session that groups many writes into a single transaction
+
+        Pending objects are flushed to the database every ``batch_size`` calls to
+        ``session.add``/``session.add_all`` but only committed once on exit, so a
+        large ingest pays for a single WAL flush instead of one per record.
+
+        For best-effort ingest loads on PostgreSQL, pass
+        ``synchronous_commit=False`` to issue ``SET LOCAL synchronous_commit = off``
+        for this transaction only.
+
+        Args:
+            batch_size: Number of added objects between automatic flushes
+            synchronous_commit: Keep PostgreSQL's durable commit behaviour
+
+        Yields:
+            SQLAlchemy Session instance
+
+        Raises:
+            SQLAlchemyError: If session creation fails
+            ValueError: If batch_size is not positive
+        """
+        if not self.session_factory:
+            raise SQLAlchemyError("Database not connected. Call connect() first.")
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        session = self.session_factory()
+        pending = 0
+        add = session.add
+
+        def batched_add(instance, **kwargs) -> None:
+            nonlocal pending
+            add(instance, **kwargs)
+            pending += 1
+            if pending >= batch_size:
+                session.flush()
+                pending = 0
+
+        def batched_add_all(instances) -> None:
+            for instance in instances:
+                batched_add(instance)
+
+        session.add = batched_add
+        session.add_all = batched_add_all
+
+        try:
+            session.begin()
+            if not synchronous_commit and self.engine.dialect.name == 'postgresql':
+                session.execute(text("SET LOCAL synchronous_commit = off"))
+            yield session
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"Database batched session error: {e}")
+            raise
+        finally:
+            session.close()
+
+    def get_async_engine(self) -> AsyncEngine:
+        """
+        Get the async engine, creating it on first use
+        
+        The async engine shares the synchronous engine's URL and pool
+        settings but uses an asyncio driver (asyncpg for PostgreSQL,
+        aiosqlite for SQLite).
+        
+        Returns:
+            SQLAlchemy AsyncEngine instance
+            
+        Raises:
+            SQLAlchemyError: If not connected or the backend has no async driver
+        """
+        if self.async_engine is not None:
+            return self.async_engine
+        if not self.engine:
+            raise SQLAlchemyError("Database not connected. Call connect() first.")
+        
+        url = self.engine.url
+        backend = url.get_backend_name()
+        if backend not in _ASYNC_DRIVERS:
+            raise SQLAlchemyError(f"No async driver configured for {backend}")
+        
+        pool_config = self.get_pool_config()
+        connect_args = {}
+        if backend == 'postgresql' and pool_config['statement_timeout_ms']:
+            connect_args['server_settings'] = {
+                'statement_timeout': str(int(pool_config['statement_timeout_ms']))
+            }
+        
+        self.async_engine = create_async_engine(
+            url.set(drivername=_ASYNC_DRIVERS[backend]),
+            pool_size=pool_config['pool_size'],
+            max_overflow=pool_config['max_overflow'],
+            pool_timeout=pool_config['pool_timeout'],
+            pool_recycle=pool_config['pool_recycle'],
+            pool_pre_ping=pool_config['pool_pre_ping'],
+            query_cache_size=pool_config['query_cache_size'],
+            connect_args=connect_args,
+            echo=pool_config['echo']
+        )
+        self.async_session_factory = async_sessionmaker(
+            bind=self.async_engine, expire_on_commit=False
+        )
+        return self.async_engine
+
+    @asynccontextmanager
+    async def get_async_session(self):
+        """
+        Get async database session context manager
+        
+        Yields:
+            SQLAlchemy AsyncSession instance
+            
+        Raises:
+            SQLAlchemyError: If session creation fails
+        """
+        self.get_async_engine()
+        session: AsyncSession = self.async_session_factory()
+        try:
+            yield session
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            self.logger.error(f"Database async session error: {e}")
+            raise
+        finally:
+            await session.close()
+
+    def get_pool_config(self) -> Dict[str, Any]:
+        """
+        Get the pool settings used for this manager's engines
+        
+        Returns:
+            Configured pool settings with ``pool_overrides`` applied
+        """
+        return {**self.config_manager.get_pool_config(), **self.pool_overrides}
+
     def get_engine(self) -> Optional[Engine]:
         """
         Get SQLAlchemy engine instance
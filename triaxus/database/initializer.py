@@ -11,14 +11,20 @@ from sqlalchemy import create_engine, text, MetaData, Table, Column, DateTime, F
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.exc import SQLAlchemyError
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 from .config_manager import SecureDatabaseConfigManager
 from .connection_manager import DatabaseConnectionManager
-from .models import Base
+from .models import Base, OceanographicData
 
 logger = logging.getLogger(__name__)
 
+# Indexes added after init_database.sql was written; they carry the same
+# names in the SQL script and the ORM model, so they are safe to add to any
+# existing schema. The other ORM indexes are named differently from their
+# init_database.sql equivalents and would be created twice.
+_UPGRADE_INDEXES = ('idx_datetime_brin', 'idx_lon_lat_gist')
+
 
 class DatabaseInitializer:
     """Handles database initialization and schema management"""
@@ -52,6 +58,16 @@ class DatabaseInitializer:
                 self.logger.error("Failed to create tables")
                 return False
 
+            # Add indexes missing from tables created by older versions
+            if not self.create_indexes():
+                self.logger.error("Failed to create indexes")
+                return False
+
+            # Keep a partition ready for incoming data if the table is partitioned
+            if self.is_partitioned() and self.create_monthly_partitions() < 0:
+                self.logger.error("Failed to create monthly partitions")
+                return False
+
             # Verify tables exist
             if not self.verify_tables():
                 self.logger.error("Failed to verify tables")
@@ -86,16 +102,289 @@ class DatabaseInitializer:
             self.logger.error(f"Error creating tables: {e}")
             return False
 
-    def create_indexes(self) -> bool:
+    def create_indexes(self, all_indexes: bool = False) -> bool:
+        """
+        Create ORM-defined indexes missing from existing tables
+        
+        ``create_all`` only builds indexes together with new tables, so this
+        brings databases created by older versions up to date. By default
+        only the BRIN and GiST indexes are added: schemas created from
+        ``init_database.sql`` already hold the B-tree indexes under other
+        names, and a name-based check would duplicate them.
+        
+        Args:
+            all_indexes: Create every ORM index, e.g. on a freshly built table
+            
+        Returns:
+            True if indexes were created or already exist, False otherwise
+        """
+        try:
+            engine = self.connection_manager.get_engine()
+            if not engine:
+                self.logger.error("Database engine not available")
+                return False
+            
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    if all_indexes or index.name in _UPGRADE_INDEXES:
+                        index.create(engine, checkfirst=True)
+            
+            self.logger.info("Database indexes verified")
+            return True
+            
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error creating indexes: {e}")
+            return False
+
+    def convert_sensor_columns_to_real(self) -> bool:
+        """
+        Convert double precision sensor columns to REAL (PostgreSQL)
+        
+        Tables created before the model switched its sensor columns to single
+        precision keep ``double precision`` until converted. This is an
+        explicit, one-off migration: the conversion is lossy and rewrites the
+        whole table under an ACCESS EXCLUSIVE lock, so ``initialize_database``
+        never runs it. All columns are altered in one statement, so the table
+        is rewritten at most once. No-op on other backends or when the
+        columns are already REAL.
+        
+        Returns:
+            True if the columns are REAL after the call, False otherwise
+        """
+        try:
+            engine = self.connection_manager.get_engine()
+            if not engine:
+                self.logger.error("Database engine not available")
+                return False
+            if engine.dialect.name != 'postgresql':
+                return True
+
+            table = OceanographicData.__tablename__
+            real_columns = [
+                column.name for column in OceanographicData.__table__.columns
+                if isinstance(column.type, Float) and column.type.precision == 24
+            ]
+
+            with engine.begin() as conn:
+                double_columns = conn.execute(text(
+                    "SELECT column_name FROM information_schema.columns "
+                    "WHERE table_schema = current_schema() AND table_name = :table_name "
+                    "AND data_type = 'double precision'"
+                ), {"table_name": table}).scalars().all()
+                to_convert = [name for name in real_columns if name in double_columns]
+                if to_convert:
+                    conn.execute(text(f"ALTER TABLE {table} " + ", ".join(
+                        f"ALTER COLUMN {name} TYPE real" for name in to_convert
+                    )))
+                    self.logger.info(f"Converted columns to REAL: {', '.join(to_convert)}")
+
+            return True
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error converting sensor columns: {e}")
+            return False
+
+    def is_partitioned(self) -> bool:
+        """
+        Check whether the oceanographic data table is range-partitioned
+        
+        Returns:
+            True if the table is a PostgreSQL partitioned table, False otherwise
+        """
+        try:
+            engine = self.connection_manager.get_engine()
+            if not engine or engine.dialect.name != 'postgresql':
+                return False
+
+            with engine.connect() as conn:
+                relkind = conn.execute(
+                    text("SELECT relkind FROM pg_class WHERE relname = :table_name"),
+                    {"table_name": OceanographicData.__tablename__}
+                ).scalar()
+            return relkind == 'p'
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error checking table partitioning: {e}")
+            return False
+
+    def partition_by_month(self, months_ahead: int = 1) -> bool:
+        """
+        Convert the oceanographic data table to monthly range partitions
+        
+        Builds a table partitioned by ``datetime``, creates one partition per
+        month present in the data plus ``months_ahead`` future months and a
+        DEFAULT partition, copies the rows across and swaps it in place of the
+        original table. CHECK constraints are copied, and dependent views and
+        triggers are recreated on the new table. Everything runs in one
+        transaction. Range queries are then pruned to the relevant months,
+        and old months can be removed with ``DROP TABLE`` instead of DELETE.
+        
+        The primary key becomes ``(id, datetime)`` because PostgreSQL requires
+        the partition key in every unique constraint.
+        
+        Args:
+            months_ahead: Number of future months to create partitions for
+            
+        Returns:
+            True if the table is partitioned after the call, False otherwise
+        """
+        try:
+            engine = self.connection_manager.get_engine()
+            if not engine or engine.dialect.name != 'postgresql':
+                self.logger.error("Table partitioning requires PostgreSQL")
+                return False
+
+            if self.is_partitioned():
+                self.logger.info("Oceanographic data table is already partitioned")
+                return True
+
+            table = OceanographicData.__tablename__
+            staging = f"{table}_partitioned"
+
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS "
+                    f"INCLUDING CONSTRAINTS INCLUDING COMMENTS) "
+                    f"PARTITION BY RANGE (datetime)"
+                ))
+                conn.execute(text(f"ALTER TABLE {staging} ADD PRIMARY KEY (id, datetime)"))
+
+                first, last = conn.execute(text(
+                    f"SELECT min(datetime) AT TIME ZONE 'UTC', max(datetime) AT TIME ZONE 'UTC' "
+                    f"FROM {table}"
+                )).one()
+                today = _utc_now()
+                start = _month_start(first or today)
+                end = _add_months(_month_start(max(last or today, today)), months_ahead)
+                month = start
+                while month <= end:
+                    self._create_partition(conn, staging, month)
+                    month = _add_months(month, 1)
+                conn.execute(text(f"CREATE TABLE {table}_default PARTITION OF {staging} DEFAULT"))
+
+                conn.execute(text(f"INSERT INTO {staging} SELECT * FROM {table}"))
+
+                # Views and triggers from init_database.sql belong to the old
+                # table; capture them so they can be rebuilt after the swap
+                views = conn.execute(text(
+                    "SELECT DISTINCT v.relname, pg_get_viewdef(v.oid) "
+                    "FROM pg_depend d "
+                    "JOIN pg_rewrite r ON r.oid = d.objid "
+                    "JOIN pg_class v ON v.oid = r.ev_class "
+                    "WHERE d.classid = 'pg_rewrite'::regclass "
+                    "AND d.refobjid = CAST(:table_name AS regclass) "
+                    "AND v.relname <> :table_name"
+                ), {"table_name": table}).all()
+                triggers = conn.execute(text(
+                    "SELECT pg_get_triggerdef(oid) FROM pg_trigger "
+                    "WHERE tgrelid = CAST(:table_name AS regclass) AND NOT tgisinternal"
+                ), {"table_name": table}).scalars().all()
+
+                for name, _ in views:
+                    conn.execute(text(f"DROP VIEW {name}"))
+                conn.execute(text(f"DROP TABLE {table}"))
+                conn.execute(text(f"ALTER TABLE {staging} RENAME TO {table}"))
+                conn.execute(text(f"ALTER INDEX {staging}_pkey RENAME TO {table}_pkey"))
+                for definition in triggers:
+                    conn.execute(text(definition))
+                for name, definition in views:
+                    conn.execute(text(f"CREATE VIEW {name} AS {definition}"))
+
+            # Indexes on the partitioned parent cascade to every partition;
+            # the new table has none yet, so build the full ORM set
+            if not self.create_indexes(all_indexes=True):
+                return False
+
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.execute(text(f"ANALYZE {table}"))
+
+            self.logger.info(f"Table '{table}' converted to monthly partitions")
+            return True
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error partitioning table: {e}")
+            return False
+
+    def create_monthly_partitions(self, months_ahead: int = 1) -> int:
         """
-        Create database indexes (now handled by ORM models)
+        Create missing monthly partitions from the current month onwards
         
+        Intended to run at startup and from a monthly scheduled job so a
+        partition always exists before data for that month arrives.
+        
+        Args:
+            months_ahead: Number of future months to create partitions for
+            
         Returns:
-            True (indexes are created automatically with tables)
+            Number of partitions created, or -1 on failure
         """
-        # Indexes are now defined in the ORM models and created automatically
-        self.logger.info("Indexes are created automatically with ORM models")
-        return True
+        try:
+            engine = self.connection_manager.get_engine()
+            if not engine or not self.is_partitioned():
+                self.logger.error("Oceanographic data table is not partitioned")
+                return -1
+
+            table = OceanographicData.__tablename__
+            created = 0
+            month = _month_start(_utc_now())
+            with engine.begin() as conn:
+                for _ in range(months_ahead + 1):
+                    created += self._create_partition(conn, table, month)
+                    month = _add_months(month, 1)
+
+            self.logger.info(f"Created {created} monthly partitions for '{table}'")
+            return created
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error creating monthly partitions: {e}")
+            return -1
+
+    def _create_partition(self, conn, parent: str, month: datetime) -> int:
+        """
+        Create the partition of ``parent`` holding one month, if missing
+        
+        Rows for that month already stored in the DEFAULT partition would
+        make PostgreSQL reject the new partition, so the default partition
+        is detached, the month's rows are moved into the new partition and
+        the default partition is attached again.
+        
+        Args:
+            conn: Connection inside an open transaction
+            parent: Partitioned table name
+            month: First day of the month
+            
+        Returns:
+            1 if a partition was created, 0 if it already existed
+        """
+        name = f"{OceanographicData.__tablename__}_{month:%Y_%m}"
+        if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+            return 0
+
+        lower = f"'{month:%Y-%m-%d} 00:00:00+00'"
+        upper = f"'{_add_months(month, 1):%Y-%m-%d} 00:00:00+00'"
+        in_month = f"datetime >= {lower} AND datetime < {upper}"
+
+        default = f"{OceanographicData.__tablename__}_default"
+        stranded = False
+        if conn.execute(text("SELECT to_regclass(:name)"), {"name": default}).scalar():
+            stranded = conn.execute(text(
+                f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_month})"
+            )).scalar()
+        if stranded:
+            conn.execute(text(f"ALTER TABLE {parent} DETACH PARTITION {default}"))
+
+        conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {parent} "
+            f"FOR VALUES FROM ({lower}) TO ({upper})"
+        ))
+
+        if stranded:
+            conn.execute(text(f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_month}"))
+            conn.execute(text(f"DELETE FROM {default} WHERE {in_month}"))
+            conn.execute(text(f"ALTER TABLE {parent} ATTACH PARTITION {default} DEFAULT"))
+        # Analyze the empty partition so row estimates never see it as unanalyzed
+        conn.execute(text(f"ANALYZE {name}"))
+        return 1
 
     def verify_tables(self) -> bool:
         """
@@ -228,3 +517,19 @@ class DatabaseInitializer:
     def cleanup(self) -> None:
         """Cleanup resources"""
         self.connection_manager.disconnect()
+
+
+def _utc_now() -> datetime:
+    """Return the current UTC time as a naive datetime"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _month_start(value: datetime) -> datetime:
+    """Return midnight on the first day of the month containing ``value``"""
+    return datetime(value.year, value.month, 1)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    """Return the first day of the month ``months`` after ``value``'s month"""
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
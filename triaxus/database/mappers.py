@@ -6,7 +6,7 @@ This module provides mapping between Pandas DataFrames and database models.
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterable, Optional, Union
 from datetime import datetime
 import logging
 
@@ -89,18 +89,19 @@ class DataMapper:
         
         return models
     
-    def models_to_dataframe(self, models: List[OceanographicData]) -> pd.DataFrame:
+    def models_to_dataframe(self, models: Iterable[OceanographicData]) -> pd.DataFrame:
         """
-        Convert list of OceanographicData models to DataFrame
+        Convert OceanographicData models to DataFrame
         
         Args:
-            models: List of OceanographicData model instances
+            models: Iterable of OceanographicData model instances (a list or
+                a streamed repository result)
             
         Returns:
             Pandas DataFrame with oceanographic data
         """
         try:
-            if not models:
+            if models is None:
                 self.logger.warning("No models provided")
                 return pd.DataFrame()
             
@@ -110,7 +111,9 @@ class DataMapper:
                 # Access attributes directly to avoid lazy loading issues
                 data.append({
                     'id': str(model.id) if hasattr(model, 'id') and model.id else None,
-                    'datetime': model.datetime.isoformat() if hasattr(model, 'datetime') and model.datetime else None,
+                    # Kept as datetime objects so the column is built as datetime64
+                    # directly instead of formatting and re-parsing ISO strings
+                    'datetime': model.datetime if hasattr(model, 'datetime') else None,
                     'depth': model.depth if hasattr(model, 'depth') else None,
                     'latitude': model.latitude if hasattr(model, 'latitude') else None,
                     'longitude': model.longitude if hasattr(model, 'longitude') else None,
@@ -123,6 +126,10 @@ class DataMapper:
                     'created_at': model.created_at.isoformat() if hasattr(model, 'created_at') and model.created_at else None
                 })
             
+            if not data:
+                self.logger.warning("No models provided")
+                return pd.DataFrame()
+            
             # Create DataFrame
             df = pd.DataFrame(data)
             
@@ -130,16 +137,16 @@ class DataMapper:
             column_mapping = {v: k for k, v in self.FIELD_MAPPING.items()}
             df = df.rename(columns=column_mapping)
             
-            # Convert datetime column
-            if 'datetime' in df.columns:
-                df['time'] = pd.to_datetime(df['datetime'])
-                df = df.drop('datetime', axis=1)
+            # Ensure the renamed datetime column has a datetime dtype (a no-op
+            # when pandas already inferred one)
+            if 'time' in df.columns:
+                df['time'] = pd.to_datetime(df['time'])
             
             # Remove metadata columns for plotting
             metadata_columns = ['id', 'source_file', 'created_at']
             df = df.drop(columns=[col for col in metadata_columns if col in df.columns])
             
-            self.logger.info(f"Successfully converted {len(models)} models to DataFrame")
+            self.logger.info(f"Successfully converted {len(data)} models to DataFrame")
             
         except Exception as e:
             self.logger.error(f"Error converting models to DataFrame: {e}")
@@ -27,18 +27,20 @@ class OceanographicData(Base):
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     
-    # Core measurement fields
+    # Core measurement fields. Sensor values are stored as single precision
+    # (REAL), which exceeds instrument resolution; positions keep double
+    # precision for GPS accuracy.
     datetime = Column(TIMESTAMP(timezone=True), nullable=False, index=True, comment='Measurement timestamp (UTC)')
-    depth = Column(Float, nullable=False, index=True, comment='Depth in meters')
+    depth = Column(Float(precision=24), nullable=False, index=True, comment='Depth in meters')
     latitude = Column(Float, nullable=False, index=True, comment='Latitude in decimal degrees')
     longitude = Column(Float, nullable=False, index=True, comment='Longitude in decimal degrees')
     
     # Oceanographic parameters
-    tv290c = Column(Float, nullable=True, comment='Temperature in Celsius')
-    sal00 = Column(Float, nullable=True, comment='Salinity in PSU')
-    sbeox0mm_l = Column(Float, nullable=True, comment='Dissolved oxygen in mg/L')
-    fleco_afl = Column(Float, nullable=True, comment='Fluorescence in mg/m³')
-    ph = Column(Float, nullable=True, comment='pH value')
+    tv290c = Column(Float(precision=24), nullable=True, comment='Temperature in Celsius')
+    sal00 = Column(Float(precision=24), nullable=True, comment='Salinity in PSU')
+    sbeox0mm_l = Column(Float(precision=24), nullable=True, comment='Dissolved oxygen in mg/L')
+    fleco_afl = Column(Float(precision=24), nullable=True, comment='Fluorescence in mg/m³')
+    ph = Column(Float(precision=24), nullable=True, comment='pH value')
     
     # Metadata fields
     source_file = Column(String(255), nullable=True, comment='Source data file name')
@@ -48,8 +50,19 @@ class OceanographicData(Base):
     __table_args__ = (
         Index('idx_datetime_depth', 'datetime', 'depth'),
         Index('idx_lat_lon', 'latitude', 'longitude'),
+        Index('idx_lon_lat', 'longitude', 'latitude'),
         Index('idx_datetime_lat_lon', 'datetime', 'latitude', 'longitude'),
         Index('idx_source_file', 'source_file'),
+        # PostgreSQL-only: BRIN suits the append-mostly, time-ordered inserts and
+        # GiST on point(lon, lat) serves bounding-box queries
+        Index(
+            'idx_datetime_brin', 'datetime',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'idx_lon_lat_gist', func.point(longitude, latitude),
+            postgresql_using='gist'
+        ).ddl_if(dialect='postgresql'),
     )
     
     def __repr__(self) -> str:
@@ -4,12 +4,17 @@ Repository pattern implementation for TRIAXUS database operations
 This module provides high-level data access methods for oceanographic data.
 """
 
-from typing import List, Optional, Dict, Any, Union
-from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Dict, Any, Tuple, Union
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc, func
+from sqlalchemy import and_, or_, desc, asc, func, select, update, bindparam, text
 from sqlalchemy.exc import SQLAlchemyError
+from cachetools import TTLCache
+import numpy as np
+import functools
 import logging
+import threading
+import uuid
 
 from .models import OceanographicData, DataSource
 from .connection_manager import DatabaseConnectionManager
@@ -17,6 +22,279 @@ from .config_manager import SecureDatabaseConfigManager
 
 logger = logging.getLogger(__name__)
 
+# Short-lived cache for read-heavy, rarely-written queries. It is shared by all
+# repository instances so a write through any of them invalidates it.
+_query_cache = TTLCache(maxsize=16, ttl=30)
+_query_cache_lock = threading.Lock()
+
+# Sets status for one data source per parameter set; sent as an executemany
+_data_sources = DataSource.__table__
+_UPDATE_STATUS_STMT = update(_data_sources).where(
+    _data_sources.c.source_file == bindparam('b_filename')
+).values(
+    status=bindparam('b_status'),
+    total_records=func.coalesce(bindparam('b_records'), _data_sources.c.total_records),
+    processed_at=func.now()
+)
+
+# Refreshes planner statistics after bulk ingest (PostgreSQL)
+_ANALYZE_SQL = text(f"ANALYZE {OceanographicData.__tablename__}")
+
+# Deletes one bounded chunk of a source file's rows (PostgreSQL). ctid is only
+# unique within one table, so it is paired with tableoid for partitioned tables
+_DELETE_SOURCE_CHUNK_SQL = text(
+    f"DELETE FROM {OceanographicData.__tablename__} WHERE (tableoid, ctid) IN ("
+    f"SELECT tableoid, ctid FROM {OceanographicData.__tablename__} "
+    f"WHERE source_file = :source_file LIMIT :chunk_size)"
+)
+
+# Columns written by the bulk insert paths, in INSERT order
+_BULK_COLUMNS = (
+    'datetime', 'depth', 'latitude', 'longitude',
+    'tv290c', 'sal00', 'sbeox0mm_l', 'fleco_afl', 'ph',
+    'source_file'
+)
+
+# Rows fetched per round-trip by the streaming range queries
+_STREAM_BATCH_SIZE = 1000
+_SERIES_BATCH_SIZE = 10000
+
+_STATS_CACHE_KEY = 'stats'
+_ALL_SOURCES_CACHE_KEY = 'all_sources'
+
+
+def _as_uuid(record_id: Union[str, uuid.UUID]) -> uuid.UUID:
+    """Coerce a record ID to the UUID type used by the primary key"""
+    return record_id if isinstance(record_id, uuid.UUID) else uuid.UUID(str(record_id))
+
+
+def _to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Drop the timezone from an aware datetime after converting it to UTC"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _valid_rows_mask(arrays: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Return a boolean mask of rows passing OceanographicData.validate()
+    
+    Args:
+        arrays: Column name to equal-length array
+        
+    Returns:
+        Boolean array, True for rows that may be inserted
+    """
+    timestamps = np.asarray(arrays['datetime'])
+    if np.issubdtype(timestamps.dtype, np.datetime64):
+        valid = ~np.isnat(timestamps)
+    else:
+        valid = np.array([value is not None for value in timestamps], dtype=bool)
+    
+    depth = np.asarray(arrays['depth'], dtype=np.float64)
+    latitude = np.asarray(arrays['latitude'], dtype=np.float64)
+    longitude = np.asarray(arrays['longitude'], dtype=np.float64)
+    
+    # NaN compares False, so missing values fail every range check
+    valid &= depth >= 0
+    valid &= (latitude >= -90) & (latitude <= 90)
+    valid &= (longitude >= -180) & (longitude <= 180)
+    return valid
+
+
+def _column_to_list(values: np.ndarray) -> List[Any]:
+    """
+    Convert a column array to Python values suitable for the DBAPI
+    
+    datetime64 values become UTC-aware datetimes and NaN becomes None.
+    
+    Args:
+        values: Column array
+        
+    Returns:
+        List of Python values
+    """
+    if np.issubdtype(values.dtype, np.datetime64):
+        return [
+            value.replace(tzinfo=timezone.utc)
+            for value in values.astype('datetime64[us]').tolist()
+        ]
+    if np.issubdtype(values.dtype, np.floating):
+        return np.where(np.isnan(values), None, values).tolist()
+    return values.tolist()
+
+
+def _build_statistics(total_records: int, ranges, source_files) -> Dict[str, Any]:
+    """
+    Assemble the get_statistics() dictionary from raw query results
+    
+    Args:
+        total_records: Record count
+        ranges: Min/max of datetime, depth, latitude and longitude, in the
+            order of ``_RANGE_AGGREGATES``
+        source_files: (source_file, count) rows
+        
+    Returns:
+        Dictionary with database statistics
+    """
+    (dt_min, dt_max,
+     depth_min, depth_max,
+     lat_min, lat_max,
+     lon_min, lon_max) = ranges
+    
+    stats = {'total_records': total_records}
+    
+    # Date range
+    if dt_min and dt_max:
+        stats['date_range'] = {
+            'start': dt_min.isoformat(),
+            'end': dt_max.isoformat()
+        }
+    
+    # Depth range
+    if depth_min is not None and depth_max is not None:
+        stats['depth_range'] = {
+            'min': float(depth_min),
+            'max': float(depth_max)
+        }
+    
+    # Geographic bounds
+    geo_bounds = (lat_min, lat_max, lon_min, lon_max)
+    if all(x is not None for x in geo_bounds):
+        stats['geographic_bounds'] = {
+            'lat_min': float(lat_min),
+            'lat_max': float(lat_max),
+            'lon_min': float(lon_min),
+            'lon_max': float(lon_max)
+        }
+    
+    stats['source_files'] = dict(source_files)
+    return stats
+
+
+def _cache_key(connection_manager: DatabaseConnectionManager, name: str) -> tuple:
+    """Build a cache key scoped to the database the manager is bound to"""
+    engine = connection_manager.get_engine()
+    return (name, str(engine.url) if engine is not None else None)
+
+
+def _cache_get(connection_manager: DatabaseConnectionManager, name: str) -> Any:
+    """Return a cached query result or None"""
+    with _query_cache_lock:
+        return _query_cache.get(_cache_key(connection_manager, name))
+
+
+def _cache_set(connection_manager: DatabaseConnectionManager, name: str, value: Any) -> None:
+    """Store a query result in the cache"""
+    with _query_cache_lock:
+        _query_cache[_cache_key(connection_manager, name)] = value
+
+
+def _cache_invalidate(connection_manager: DatabaseConnectionManager, name: str) -> None:
+    """Drop a cached query result after a write"""
+    with _query_cache_lock:
+        _query_cache.pop(_cache_key(connection_manager, name), None)
+
+
+def _source_snapshot(data_source: DataSource) -> Dict[str, Any]:
+    """Return the column values of a data source for caching"""
+    return {attr.key: getattr(data_source, attr.key)
+            for attr in DataSource.__mapper__.column_attrs}
+
+# Built once so every call reuses the same compiled-cache key; only the bound
+# parameter values change between calls
+_TIME_RANGE_STMT = select(OceanographicData).where(
+    OceanographicData.datetime.between(bindparam('start_time'), bindparam('end_time'))
+).order_by(OceanographicData.datetime)
+
+_DEPTH_RANGE_STMT = select(OceanographicData).where(
+    OceanographicData.depth.between(bindparam('min_depth'), bindparam('max_depth'))
+).order_by(OceanographicData.depth)
+
+_SOURCE_FILE_STMT = select(OceanographicData).where(
+    OceanographicData.source_file == bindparam('source_file')
+).order_by(OceanographicData.datetime)
+
+_LATEST_STMT = select(OceanographicData).order_by(
+    desc(OceanographicData.datetime)
+).limit(bindparam('limit'))
+
+# Newest-first slice of a time window, served by the datetime index
+_LATEST_IN_RANGE_STMT = select(OceanographicData).where(
+    OceanographicData.datetime.between(bindparam('start_time'), bindparam('end_time'))
+).order_by(desc(OceanographicData.datetime)).limit(bindparam('limit'))
+
+_COUNT_STMT = select(func.count(OceanographicData.id))
+
+# Answered from the end of the datetime index
+_LATEST_TIME_STMT = select(func.max(OceanographicData.datetime))
+
+_RANGE_AGGREGATES = (
+    func.min(OceanographicData.datetime),
+    func.max(OceanographicData.datetime),
+    func.min(OceanographicData.depth),
+    func.max(OceanographicData.depth),
+    func.min(OceanographicData.latitude),
+    func.max(OceanographicData.latitude),
+    func.min(OceanographicData.longitude),
+    func.max(OceanographicData.longitude)
+)
+_COUNT_AND_RANGES_STMT = select(func.count(OceanographicData.id), *_RANGE_AGGREGATES)
+
+_SOURCE_FILE_COUNTS_STMT = select(
+    OceanographicData.source_file,
+    func.count(OceanographicData.id)
+).where(
+    OceanographicData.source_file.isnot(None)
+).group_by(OceanographicData.source_file)
+
+# Longitude leads, matching the (longitude, latitude) index, as it is the more
+# selective bound on transects
+_LOCATION_STMT = select(OceanographicData).where(
+    and_(
+        OceanographicData.longitude.between(bindparam('lon_min'), bindparam('lon_max')),
+        OceanographicData.latitude.between(bindparam('lat_min'), bindparam('lat_max'))
+    )
+)
+
+# PostgreSQL form of the same bounding-box filter, written so the planner can
+# use the GiST index on point(longitude, latitude)
+_LOCATION_BOX_STMT = select(OceanographicData).where(
+    text(
+        "point(longitude, latitude) <@ "
+        "box(point(:lon_min, :lat_min), point(:lon_max, :lat_max))"
+    )
+)
+
+
+def with_session(default: Any = None, action: str = "running query"):
+    """
+    Run a repository method inside a session and absorb database errors
+    
+    The decorated method receives the session as its first argument after
+    ``self``; callers do not pass it. On ``SQLAlchemyError`` the error is
+    logged and ``default`` is returned instead (called first if it is
+    callable, so ``list``/``dict`` give a fresh empty container).
+    
+    Args:
+        default: Value, or factory for the value, returned on error
+        action: Description used in the error log message
+        
+    Returns:
+        Method decorator
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                with self.connection_manager.get_session() as session:
+                    return method(self, session, *args, **kwargs)
+            except SQLAlchemyError as e:
+                self.logger.error(f"Error {action}: {e}")
+                return default() if callable(default) else default
+        return wrapper
+    return decorator
+
 
 class OceanographicDataRepository:
     """
@@ -33,7 +311,9 @@ class OceanographicDataRepository:
         self.connection_manager = connection_manager or DatabaseConnectionManager()
         self.logger = logging.getLogger(__name__)
     
-    def create(self, data: Union[OceanographicData, List[OceanographicData]]) -> bool:
+    @with_session(default=False, action="creating oceanographic data")
+    def create(self, session: Session,
+               data: Union[OceanographicData, List[OceanographicData]]) -> bool:
         """
         Create new oceanographic data records
         
@@ -43,24 +323,146 @@ class OceanographicDataRepository:
         Returns:
             True if successful, False otherwise
         """
+        if isinstance(data, list):
+            session.add_all(data)
+        else:
+            session.add(data)
+        
+        session.commit()
+        _cache_invalidate(self.connection_manager, _STATS_CACHE_KEY)
+        
+        count = len(data) if isinstance(data, list) else 1
+        self.logger.info(f"Successfully created {count} oceanographic data records")
+        return True
+    
+    @with_session(default=0, action="bulk inserting oceanographic data")
+    def create_bulk(self, session: Session,
+                    rows: List[Union[Dict[str, Any], OceanographicData]],
+                    chunk_size: int = 1000, analyze: bool = False) -> int:
+        """
+        Insert many oceanographic data records in a single transaction
+        
+        Bypasses ORM unit-of-work bookkeeping. On PostgreSQL with psycopg2 the
+        rows are sent with ``execute_values``; other backends use
+        ``bulk_insert_mappings``. Either way, one commit covers all chunks.
+        Routine ingest leaves planner statistics to autovacuum; pass
+        ``analyze=True`` after a large one-off load on PostgreSQL so the
+        planner sees the new value distribution straight away.
+        
+        Args:
+            rows: Records as column dictionaries or OceanographicData instances
+            chunk_size: Number of rows sent per statement
+            analyze: Refresh planner statistics after the insert (PostgreSQL)
+            
+        Returns:
+            Number of inserted records (0 on failure)
+        """
+        if not rows:
+            return 0
+        
+        mappings = [
+            {column: getattr(row, column) for column in _BULK_COLUMNS}
+            if isinstance(row, OceanographicData) else row
+            for row in rows
+        ]
+        
+        connection = session.connection()
+        use_execute_values = connection.dialect.driver == 'psycopg2'
+        
+        for start in range(0, len(mappings), chunk_size):
+            chunk = mappings[start:start + chunk_size]
+            if use_execute_values:
+                self._execute_values(connection, chunk, chunk_size)
+            else:
+                session.bulk_insert_mappings(OceanographicData, chunk)
+        
+        if analyze and connection.dialect.name == 'postgresql':
+            session.execute(_ANALYZE_SQL)
+        
+        session.commit()
+        _cache_invalidate(self.connection_manager, _STATS_CACHE_KEY)
+        
+        self.logger.info(f"Successfully bulk inserted {len(mappings)} oceanographic data records")
+        return len(mappings)
+    
+    def create_from_arrays(self, arrays: Dict[str, np.ndarray],
+                           source_file: Optional[str] = None,
+                           chunk_size: int = 1000) -> int:
+        """
+        Validate and bulk insert records given as column arrays
+        
+        Rows are checked with vectorized NumPy masks using the same rules as
+        ``OceanographicData.validate()``; invalid rows are dropped and NaN
+        sensor values are stored as NULL. No ORM objects are built.
+        
+        Args:
+            arrays: Column name to equal-length array; must include datetime,
+                depth, latitude and longitude
+            source_file: Source file name stored on every row
+            chunk_size: Number of rows sent per statement
+            
+        Returns:
+            Number of inserted records (0 on failure)
+            
+        Raises:
+            ValueError: If columns are unknown, missing or of unequal length
+        """
+        unknown = set(arrays) - set(_BULK_COLUMNS)
+        missing = {'datetime', 'depth', 'latitude', 'longitude'} - set(arrays)
+        if unknown or missing:
+            raise ValueError(f"Unknown columns {sorted(unknown)}, missing columns {sorted(missing)}")
+        if len({len(values) for values in arrays.values()}) > 1:
+            raise ValueError("All column arrays must have the same length")
+        
+        columns = list(arrays)
+        valid = _valid_rows_mask(arrays)
+        dropped = int(valid.size - valid.sum())
+        if dropped:
+            self.logger.warning(f"Dropped {dropped} invalid rows before bulk insert")
+        
+        column_values = [_column_to_list(np.asarray(arrays[column])[valid]) for column in columns]
+        if source_file is not None:
+            columns.append('source_file')
+            column_values.append([source_file] * int(valid.sum()))
+        
+        return self.create_bulk(
+            [dict(zip(columns, row)) for row in zip(*column_values)],
+            chunk_size=chunk_size
+        )
+    
+    @staticmethod
+    def _execute_values(connection, chunk: List[Dict[str, Any]], page_size: int) -> None:
+        """
+        Insert a chunk of mappings with psycopg2's execute_values
+        
+        Args:
+            connection: SQLAlchemy connection bound to a psycopg2 DBAPI connection
+            chunk: Row mappings to insert
+            page_size: Rows per generated INSERT statement
+        """
+        from psycopg2.extras import execute_values
+        
+        # id and created_at have Python-side defaults in the ORM model, so they
+        # must be supplied explicitly when bypassing it
+        sql = (
+            f"INSERT INTO {OceanographicData.__tablename__} "
+            f"(id, {', '.join(_BULK_COLUMNS)}, created_at) VALUES %s"
+        )
+        template = f"({', '.join(['%s'] * (len(_BULK_COLUMNS) + 1))}, now())"
+        values = [
+            (str(row.get('id') or uuid.uuid4()), *(row.get(column) for column in _BULK_COLUMNS))
+            for row in chunk
+        ]
+        
+        cursor = connection.connection.cursor()
         try:
-            with self.connection_manager.get_session() as session:
-                if isinstance(data, list):
-                    session.add_all(data)
-                else:
-                    session.add(data)
-                
-                session.commit()
-                
-                count = len(data) if isinstance(data, list) else 1
-                self.logger.info(f"Successfully created {count} oceanographic data records")
-                return True
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"Error creating oceanographic data: {e}")
-            return False
+            execute_values(cursor, sql, values, template=template, page_size=page_size)
+        finally:
+            cursor.close()
     
-    def get_by_id(self, record_id: str) -> Optional[OceanographicData]:
+    @with_session(default=None, action="getting record by ID")
+    def get_by_id(self, session: Session,
+                  record_id: Union[str, uuid.UUID]) -> Optional[OceanographicData]:
         """
         Get oceanographic data record by ID
         
@@ -70,19 +472,81 @@ class OceanographicDataRepository:
         Returns:
             OceanographicData instance or None
         """
+        record_uuid = self._parse_id(record_id)
+        if record_uuid is None:
+            return None
+        
+        return session.get(OceanographicData, record_uuid)
+    
+    @with_session(default=False, action="checking record ID")
+    def exists_by_id(self, session: Session, record_id: Union[str, uuid.UUID]) -> bool:
+        """
+        Check whether a record exists without loading it
+        
+        Args:
+            record_id: Record ID
+            
+        Returns:
+            True if a record with this ID exists, False otherwise
+        """
+        record_uuid = self._parse_id(record_id)
+        if record_uuid is None:
+            return False
+        
+        return bool(session.query(
+            session.query(OceanographicData.id).filter_by(id=record_uuid).exists()
+        ).scalar())
+    
+    def _parse_id(self, record_id: Union[str, uuid.UUID]) -> Optional[uuid.UUID]:
+        """
+        Parse a record ID, logging IDs that are not valid UUIDs
+        
+        Args:
+            record_id: Record ID
+            
+        Returns:
+            UUID instance or None if the ID is malformed
+        """
+        try:
+            return _as_uuid(record_id)
+        except ValueError:
+            self.logger.error(f"Invalid record ID: {record_id}")
+            return None
+    
+    def _stream(self, stmt, params: Optional[Dict[str, Any]] = None,
+                description: str = "") -> Iterator[OceanographicData]:
+        """
+        Stream ORM records for a select() in fixed-size batches
+        
+        Rows are fetched through a server-side cursor, so memory stays bounded
+        by the batch size instead of the full result set. The session stays
+        open until the iterator is exhausted or closed.
+        
+        Args:
+            stmt: select() statement returning OceanographicData entities
+            params: Optional bound parameter values
+            description: Short description used in log messages
+            
+        Yields:
+            OceanographicData records
+        """
+        count = 0
         try:
             with self.connection_manager.get_session() as session:
-                record = session.query(OceanographicData).filter(
-                    OceanographicData.id == record_id
-                ).first()
-                
-                return record
-                
+                result = session.execute(
+                    stmt.execution_options(yield_per=_STREAM_BATCH_SIZE, stream_results=True),
+                    params or {}
+                )
+                for record in result.scalars():
+                    count += 1
+                    yield record
+            
+            self.logger.info(f"Found {count} records {description}")
+            
         except SQLAlchemyError as e:
-            self.logger.error(f"Error getting record by ID {record_id}: {e}")
-            return None
+            self.logger.error(f"Error getting records {description}: {e}")
     
-    def get_by_time_range(self, start_time: datetime, end_time: datetime) -> List[OceanographicData]:
+    def get_by_time_range(self, start_time: datetime, end_time: datetime) -> Iterator[OceanographicData]:
         """
         Get records within time range
         
@@ -91,25 +555,66 @@ class OceanographicDataRepository:
             end_time: End datetime
             
         Returns:
-            List of OceanographicData records
+            Iterator of OceanographicData records ordered by datetime
         """
+        return self._stream(_TIME_RANGE_STMT, {
+            'start_time': start_time,
+            'end_time': end_time
+        }, description="in time range")
+    
+    def get_series(self, start_time: datetime, end_time: datetime,
+                   columns: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Get selected columns within a time range as NumPy arrays
+        
+        Only the requested columns are selected, so plotting code avoids
+        loading and hydrating full ORM records. ``datetime`` is returned as
+        UTC ``datetime64[us]``; all other columns as ``float64`` with NULL
+        values mapped to NaN.
+        
+        Args:
+            start_time: Start datetime
+            end_time: End datetime
+            columns: Column names, e.g. ['datetime', 'depth', 'tv290c']
+            
+        Returns:
+            Dictionary mapping each column name to an array ordered by datetime
+            
+        Raises:
+            ValueError: If a column name is not a column of OceanographicData
+        """
+        table_columns = OceanographicData.__table__.columns
+        unknown = [column for column in columns if column not in table_columns]
+        if unknown:
+            raise ValueError(f"Unknown oceanographic data columns: {unknown}")
+        
+        stmt = select(*(table_columns[column] for column in columns)).where(
+            OceanographicData.datetime.between(start_time, end_time)
+        ).order_by(OceanographicData.datetime)
+        
         try:
             with self.connection_manager.get_session() as session:
-                records = session.query(OceanographicData).filter(
-                    and_(
-                        OceanographicData.datetime >= start_time,
-                        OceanographicData.datetime <= end_time
-                    )
-                ).order_by(OceanographicData.datetime).all()
-                
-                self.logger.info(f"Found {len(records)} records in time range")
-                return records
-                
+                rows = session.execute(
+                    stmt.execution_options(yield_per=_SERIES_BATCH_SIZE, stream_results=True)
+                ).all()
         except SQLAlchemyError as e:
-            self.logger.error(f"Error getting records by time range: {e}")
-            return []
+            self.logger.error(f"Error getting series in time range: {e}")
+            rows = []
+        
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        series = {}
+        for column, column_values in zip(columns, values):
+            if column == 'datetime':
+                series[column] = np.array(
+                    [_to_naive_utc(value) for value in column_values], dtype='datetime64[us]'
+                )
+            else:
+                series[column] = np.array(column_values, dtype=np.float64)
+        
+        self.logger.info(f"Found {len(rows)} series rows in time range")
+        return series
     
-    def get_by_depth_range(self, min_depth: float, max_depth: float) -> List[OceanographicData]:
+    def get_by_depth_range(self, min_depth: float, max_depth: float) -> Iterator[OceanographicData]:
         """
         Get records within depth range
         
@@ -118,26 +623,15 @@ class OceanographicDataRepository:
             max_depth: Maximum depth
             
         Returns:
-            List of OceanographicData records
+            Iterator of OceanographicData records ordered by depth
         """
-        try:
-            with self.connection_manager.get_session() as session:
-                records = session.query(OceanographicData).filter(
-                    and_(
-                        OceanographicData.depth >= min_depth,
-                        OceanographicData.depth <= max_depth
-                    )
-                ).order_by(OceanographicData.depth).all()
-                
-                self.logger.info(f"Found {len(records)} records in depth range")
-                return records
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"Error getting records by depth range: {e}")
-            return []
+        return self._stream(_DEPTH_RANGE_STMT, {
+            'min_depth': min_depth,
+            'max_depth': max_depth
+        }, description="in depth range")
     
     def get_by_location(self, lat_min: float, lat_max: float, 
-                       lon_min: float, lon_max: float) -> List[OceanographicData]:
+                       lon_min: float, lon_max: float) -> Iterator[OceanographicData]:
         """
         Get records within geographic bounds
         
@@ -148,27 +642,22 @@ class OceanographicDataRepository:
             lon_max: Maximum longitude
             
         Returns:
-            List of OceanographicData records
+            Iterator of OceanographicData records
         """
-        try:
-            with self.connection_manager.get_session() as session:
-                records = session.query(OceanographicData).filter(
-                    and_(
-                        OceanographicData.latitude >= lat_min,
-                        OceanographicData.latitude <= lat_max,
-                        OceanographicData.longitude >= lon_min,
-                        OceanographicData.longitude <= lon_max
-                    )
-                ).all()
-                
-                self.logger.info(f"Found {len(records)} records in geographic bounds")
-                return records
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"Error getting records by location: {e}")
-            return []
+        engine = self.connection_manager.get_engine()
+        if engine is not None and engine.dialect.name == 'postgresql':
+            stmt = _LOCATION_BOX_STMT
+        else:
+            stmt = _LOCATION_STMT
+        
+        return self._stream(stmt, {
+            'lat_min': lat_min,
+            'lat_max': lat_max,
+            'lon_min': lon_min,
+            'lon_max': lon_max
+        }, description="in geographic bounds")
     
-    def get_by_source_file(self, source_file: str) -> List[OceanographicData]:
+    def get_by_source_file(self, source_file: str) -> Iterator[OceanographicData]:
         """
         Get records by source file
         
@@ -176,22 +665,13 @@ class OceanographicDataRepository:
             source_file: Source file name
             
         Returns:
-            List of OceanographicData records
+            Iterator of OceanographicData records ordered by datetime
         """
-        try:
-            with self.connection_manager.get_session() as session:
-                records = session.query(OceanographicData).filter(
-                    OceanographicData.source_file == source_file
-                ).order_by(OceanographicData.datetime).all()
-                
-                self.logger.info(f"Found {len(records)} records from source file: {source_file}")
-                return records
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"Error getting records by source file: {e}")
-            return []
+        return self._stream(_SOURCE_FILE_STMT, {'source_file': source_file},
+                            description=f"from source file: {source_file}")
     
-    def get_latest_records(self, limit: int = 100) -> List[OceanographicData]:
+    @with_session(default=list, action="getting latest records")
+    def get_latest_records(self, session: Session, limit: int = 100) -> List[OceanographicData]:
         """
         Get latest records
         
@@ -201,112 +681,97 @@ class OceanographicDataRepository:
         Returns:
             List of latest OceanographicData records
         """
-        try:
-            with self.connection_manager.get_session() as session:
-                records = session.query(OceanographicData).order_by(
-                    desc(OceanographicData.datetime)
-                ).limit(limit).all()
-                
-                # Convert to detached objects to avoid session issues
-                detached_records = []
-                for record in records:
-                    # Create a new instance with the same data
-                    detached_record = OceanographicData(
-                        datetime=record.datetime,
-                        depth=record.depth,
-                        latitude=record.latitude,
-                        longitude=record.longitude,
-                        tv290c=record.tv290c,
-                        sal00=record.sal00,
-                        sbeox0mm_l=record.sbeox0mm_l,
-                        fleco_afl=record.fleco_afl,
-                        ph=record.ph,
-                        source_file=record.source_file
-                    )
-                    detached_record.id = record.id
-                    detached_record.created_at = record.created_at
-                    detached_records.append(detached_record)
-                
-                self.logger.info(f"Retrieved {len(detached_records)} latest records")
-                return detached_records
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"Error getting latest records: {e}")
-            return []
+        records = session.execute(_LATEST_STMT, {'limit': limit}).scalars().all()
+        
+        # Sessions do not expire on commit, so the loaded records can be
+        # detached and returned as-is
+        session.expunge_all()
+        
+        self.logger.info(f"Retrieved {len(records)} latest records")
+        return records
     
-    def get_statistics(self) -> Dict[str, Any]:
+    @with_session(default=list, action="getting latest records in time range")
+    def get_latest_in_time_range(self, session: Session, start_time: datetime,
+                                 end_time: datetime, limit: int = 100) -> List[OceanographicData]:
+        """
+        Get the newest records within a time range
+        
+        The window, ordering and limit are applied in SQL, so rows outside
+        the window are never fetched.
+        
+        Args:
+            start_time: Start datetime
+            end_time: End datetime
+            limit: Maximum number of records to return
+            
+        Returns:
+            List of OceanographicData records, newest first
+        """
+        records = session.execute(_LATEST_IN_RANGE_STMT, {
+            'start_time': start_time,
+            'end_time': end_time,
+            'limit': limit
+        }).scalars().all()
+        session.expunge_all()
+        
+        self.logger.info(f"Retrieved {len(records)} latest records in time range")
+        return records
+    
+    @with_session(default=None, action="getting latest record time")
+    def get_latest_time(self, session: Session) -> Optional[datetime]:
+        """
+        Get the timestamp of the newest record
+        
+        A cheap change marker for callers that cache results derived from
+        the latest records.
+        
+        Returns:
+            Newest record datetime, or None if there are no records
+        """
+        return session.execute(_LATEST_TIME_STMT).scalar()
+    
+    @with_session(default=dict, action="getting database statistics")
+    def get_statistics(self, session: Session) -> Dict[str, Any]:
         """
         Get database statistics
         
+        Results are cached for a short time and invalidated by writes made
+        through any repository instance.
+        
         Returns:
             Dictionary with database statistics
         """
-        try:
-            with self.connection_manager.get_session() as session:
-                stats = {}
-                
-                # Total records
-                stats['total_records'] = session.query(OceanographicData).count()
-                
-                # Date range
-                date_range = session.query(
-                    func.min(OceanographicData.datetime),
-                    func.max(OceanographicData.datetime)
-                ).first()
-                
-                if date_range and date_range[0] and date_range[1]:
-                    stats['date_range'] = {
-                        'start': date_range[0].isoformat(),
-                        'end': date_range[1].isoformat()
-                    }
-                
-                # Depth range
-                depth_range = session.query(
-                    func.min(OceanographicData.depth),
-                    func.max(OceanographicData.depth)
-                ).first()
-                
-                if depth_range and depth_range[0] is not None and depth_range[1] is not None:
-                    stats['depth_range'] = {
-                        'min': float(depth_range[0]),
-                        'max': float(depth_range[1])
-                    }
-                
-                # Geographic bounds
-                geo_bounds = session.query(
-                    func.min(OceanographicData.latitude),
-                    func.max(OceanographicData.latitude),
-                    func.min(OceanographicData.longitude),
-                    func.max(OceanographicData.longitude)
-                ).first()
-                
-                if geo_bounds and all(x is not None for x in geo_bounds):
-                    stats['geographic_bounds'] = {
-                        'lat_min': float(geo_bounds[0]),
-                        'lat_max': float(geo_bounds[1]),
-                        'lon_min': float(geo_bounds[2]),
-                        'lon_max': float(geo_bounds[3])
-                    }
-                
-                # Source files
-                source_files = session.query(
-                    OceanographicData.source_file,
-                    func.count(OceanographicData.id)
-                ).group_by(OceanographicData.source_file).all()
-                
-                stats['source_files'] = {
-                    file_name: count for file_name, count in source_files
-                    if file_name is not None
-                }
-                
-                self.logger.info("Retrieved database statistics")
-                return stats
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"Error getting database statistics: {e}")
-            return {}
+        cached = _cache_get(self.connection_manager, _STATS_CACHE_KEY)
+        if cached is not None:
+            return dict(cached)
+        
+        # Count and all range aggregates in a single scan
+        total_records, *ranges = session.execute(_COUNT_AND_RANGES_STMT).one()
+        
+        # NULL source files are dropped in SQL so the rows can be handed
+        # straight to dict() without a Python-level loop
+        source_files = session.execute(_SOURCE_FILE_COUNTS_STMT).tuples().all()
+        stats = _build_statistics(total_records, ranges, source_files)
+        
+        self.logger.info("Retrieved database statistics")
+        _cache_set(self.connection_manager, _STATS_CACHE_KEY, stats)
+        return dict(stats)
+    
+    @with_session(default=0, action="counting records")
+    def get_exact_count(self, session: Session) -> int:
+        """
+        Get the exact number of records
+        
+        Counts the table without computing the ranges of ``get_statistics()``
+        and bypasses its cache.
+        
+        Returns:
+            Number of oceanographic data records
+        """
+        return session.execute(_COUNT_STMT).scalar()
     
-    def delete_by_id(self, record_id: str) -> bool:
+    @with_session(default=False, action="deleting record")
+    def delete_by_id(self, session: Session, record_id: str) -> bool:
         """
         Delete record by ID
         
@@ -316,49 +781,62 @@ class OceanographicDataRepository:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            with self.connection_manager.get_session() as session:
-                deleted = session.query(OceanographicData).filter(
-                    OceanographicData.id == record_id
-                ).delete()
-                
-                session.commit()
-                
-                if deleted > 0:
-                    self.logger.info(f"Successfully deleted record {record_id}")
-                    return True
-                else:
-                    self.logger.warning(f"Record {record_id} not found")
-                    return False
-                    
-        except SQLAlchemyError as e:
-            self.logger.error(f"Error deleting record {record_id}: {e}")
+        deleted = session.query(OceanographicData).filter(
+            OceanographicData.id == record_id
+        ).delete()
+        
+        session.commit()
+        _cache_invalidate(self.connection_manager, _STATS_CACHE_KEY)
+        
+        if deleted > 0:
+            self.logger.info(f"Successfully deleted record {record_id}")
+            return True
+        else:
+            self.logger.warning(f"Record {record_id} not found")
             return False
     
-    def delete_by_source_file(self, source_file: str) -> int:
+    def delete_by_source_file(self, source_file: str, chunk_size: int = 10000) -> int:
         """
         Delete all records from a source file
         
+        On PostgreSQL the rows are deleted and committed in chunks of
+        ``chunk_size`` so lock and WAL pressure stay bounded for very large
+        files. Other backends delete in a single statement.
+        
         Args:
             source_file: Source file name
+            chunk_size: Maximum rows deleted per transaction on PostgreSQL
             
         Returns:
             Number of deleted records
         """
+        deleted = 0
         try:
             with self.connection_manager.get_session() as session:
-                deleted = session.query(OceanographicData).filter(
-                    OceanographicData.source_file == source_file
-                ).delete()
-                
-                session.commit()
+                if session.get_bind().dialect.name == 'postgresql':
+                    while True:
+                        count = session.execute(_DELETE_SOURCE_CHUNK_SQL, {
+                            'source_file': source_file,
+                            'chunk_size': chunk_size
+                        }).rowcount
+                        session.commit()
+                        deleted += count
+                        if count < chunk_size:
+                            break
+                else:
+                    deleted = session.query(OceanographicData).filter(
+                        OceanographicData.source_file == source_file
+                    ).delete(synchronize_session=False)
+                    session.commit()
                 
                 self.logger.info(f"Successfully deleted {deleted} records from {source_file}")
                 return deleted
                 
         except SQLAlchemyError as e:
             self.logger.error(f"Error deleting records from {source_file}: {e}")
-            return 0
+            return deleted
+        finally:
+            _cache_invalidate(self.connection_manager, _STATS_CACHE_KEY)
 
 
 class DataSourceRepository:
@@ -376,7 +854,8 @@ class DataSourceRepository:
         self.connection_manager = connection_manager or DatabaseConnectionManager()
         self.logger = logging.getLogger(__name__)
     
-    def create(self, data_source: DataSource) -> bool:
+    @with_session(default=False, action="creating data source")
+    def create(self, session: Session, data_source: DataSource) -> bool:
         """
         Create new data source record
         
@@ -386,19 +865,15 @@ class DataSourceRepository:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            with self.connection_manager.get_session() as session:
-                session.add(data_source)
-                session.commit()
-                
-                self.logger.info(f"Successfully created data source: {data_source.filename}")
-                return True
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"Error creating data source: {e}")
-            return False
+        session.add(data_source)
+        session.commit()
+        _cache_invalidate(self.connection_manager, _ALL_SOURCES_CACHE_KEY)
+        
+        self.logger.info(f"Successfully created data source: {data_source.filename}")
+        return True
     
-    def get_by_filename(self, filename: str) -> Optional[DataSource]:
+    @with_session(default=None, action="getting data source by filename")
+    def get_by_filename(self, session: Session, filename: str) -> Optional[DataSource]:
         """
         Get data source by filename
         
@@ -408,40 +883,36 @@ class DataSourceRepository:
         Returns:
             DataSource instance or None
         """
-        try:
-            with self.connection_manager.get_session() as session:
-                data_source = session.query(DataSource).filter(
-                    DataSource.filename == filename
-                ).first()
-                
-                return data_source
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"Error getting data source by filename: {e}")
-            return None
+        return session.query(DataSource).filter(
+            DataSource.filename == filename
+        ).first()
     
-    def get_all(self) -> List[DataSource]:
+    @with_session(default=list, action="getting all data sources")
+    def get_all(self, session: Session) -> List[DataSource]:
         """
         Get all data sources
         
+        Results are cached for a short time and invalidated by writes made
+        through any repository instance. The cache holds column snapshots, so
+        every call returns its own detached DataSource instances.
+        
         Returns:
             List of DataSource records
         """
-        try:
-            with self.connection_manager.get_session() as session:
-                data_sources = session.query(DataSource).order_by(
-                    desc(DataSource.created_at)
-                ).all()
-                
-                self.logger.info(f"Retrieved {len(data_sources)} data sources")
-                return data_sources
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"Error getting all data sources: {e}")
-            return []
+        snapshots = _cache_get(self.connection_manager, _ALL_SOURCES_CACHE_KEY)
+        if snapshots is None:
+            data_sources = session.query(DataSource).order_by(
+                desc(DataSource.processed_at)
+            ).all()
+            self.logger.info(f"Retrieved {len(data_sources)} data sources")
+            snapshots = tuple(_source_snapshot(source) for source in data_sources)
+            _cache_set(self.connection_manager, _ALL_SOURCES_CACHE_KEY, snapshots)
+        
+        return [DataSource(**snapshot) for snapshot in snapshots]
     
-    def update_status(self, filename: str, status: str, 
-                     processed_records: Optional[int] = None) -> bool:
+    @with_session(default=False, action="updating data source status")
+    def update_status(self, session: Session, filename: str, status: str,
+                      processed_records: Optional[int] = None) -> bool:
         """
         Update data source processing status
         
@@ -453,27 +924,53 @@ class DataSourceRepository:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            with self.connection_manager.get_session() as session:
-                data_source = session.query(DataSource).filter(
-                    DataSource.filename == filename
-                ).first()
-                
-                if data_source:
-                    data_source.processing_status = status
-                    data_source.last_processed = datetime.now()
-                    
-                    if processed_records is not None:
-                        data_source.processed_records = processed_records
-                    
-                    session.commit()
-                    
-                    self.logger.info(f"Updated status for {filename}: {status}")
-                    return True
-                else:
-                    self.logger.warning(f"Data source {filename} not found")
-                    return False
-                    
-        except SQLAlchemyError as e:
-            self.logger.error(f"Error updating data source status: {e}")
+        data_source = session.query(DataSource).filter(
+            DataSource.filename == filename
+        ).first()
+        
+        if data_source:
+            data_source.processing_status = status
+            data_source.last_processed = datetime.now()
+            
+            if processed_records is not None:
+                data_source.processed_records = processed_records
+            
+            session.commit()
+            _cache_invalidate(self.connection_manager, _ALL_SOURCES_CACHE_KEY)
+            
+            self.logger.info(f"Updated status for {filename}: {status}")
+            return True
+        else:
+            self.logger.warning(f"Data source {filename} not found")
             return False
+
+    @with_session(default=0, action="bulk updating data source status")
+    def update_status_bulk(self, session: Session,
+                           updates: List[Tuple[str, str, Optional[int]]]) -> int:
+        """
+        Update the processing status of many data sources in one statement
+        
+        The updates are sent as a single executemany of one prepared UPDATE,
+        so finalizing N files costs one round-trip instead of N.
+        
+        Args:
+            updates: (filename, status, processed_records) tuples; a
+                processed_records of None leaves the stored count unchanged
+            
+        Returns:
+            Number of updated data sources
+        """
+        if not updates:
+            return 0
+        
+        params = [
+            {'b_filename': filename, 'b_status': status, 'b_records': processed_records}
+            for filename, status, processed_records in updates
+        ]
+        
+        updated = session.connection().execute(_UPDATE_STATUS_STMT, params).rowcount
+        session.commit()
+        _cache_invalidate(self.connection_manager, _ALL_SOURCES_CACHE_KEY)
+        
+        self.logger.info(f"Updated status for {updated} of {len(updates)} data sources")
+        return updated
@@ -48,16 +48,17 @@ CREATE TABLE oceanographic_data (
     
     -- Time and spatial information
     datetime TIMESTAMP WITH TIME ZONE NOT NULL,
-    depth DOUBLE PRECISION NOT NULL CHECK (depth >= 0),
+    depth REAL NOT NULL CHECK (depth >= 0),
     latitude DOUBLE PRECISION CHECK (latitude >= -90 AND latitude <= 90),
     longitude DOUBLE PRECISION CHECK (longitude >= -180 AND longitude <= 180),
     
-    -- Oceanographic variables (matching current code structure)
-    tv290c DOUBLE PRECISION,           -- Temperature [ITS-90, deg C]
-    sal00 DOUBLE PRECISION,           -- Salinity [PSU]
-    sbeox0mm_l DOUBLE PRECISION,      -- Dissolved Oxygen [umol/kg]
-    fleco_afl DOUBLE PRECISION,       -- Fluorescence [mg/m^3]
-    ph DOUBLE PRECISION,              -- pH
+    -- Oceanographic variables (matching current code structure); single
+    -- precision covers sensor resolution
+    tv290c REAL,                      -- Temperature [ITS-90, deg C]
+    sal00 REAL,                       -- Salinity [PSU]
+    sbeox0mm_l REAL,                  -- Dissolved Oxygen [umol/kg]
+    fleco_afl REAL,                   -- Fluorescence [mg/m^3]
+    ph REAL,                          -- pH
     
     -- Metadata
     source_file VARCHAR(255),          -- Source CNV file or data source
@@ -79,6 +80,7 @@ CREATE INDEX idx_oceanographic_data_longitude ON oceanographic_data (longitude);
 -- Composite indexes for common query patterns
 CREATE INDEX idx_oceanographic_data_datetime_depth ON oceanographic_data (datetime, depth);
 CREATE INDEX idx_oceanographic_data_lat_lon ON oceanographic_data (latitude, longitude);
+CREATE INDEX idx_oceanographic_data_lon_lat ON oceanographic_data (longitude, latitude);
 CREATE INDEX idx_oceanographic_data_datetime_lat_lon ON oceanographic_data (datetime, latitude, longitude);
 
 -- Variable-specific indexes
@@ -86,6 +88,12 @@ CREATE INDEX idx_oceanographic_data_temperature ON oceanographic_data (tv290c) W
 CREATE INDEX idx_oceanographic_data_salinity ON oceanographic_data (sal00) WHERE sal00 IS NOT NULL;
 CREATE INDEX idx_oceanographic_data_oxygen ON oceanographic_data (sbeox0mm_l) WHERE sbeox0mm_l IS NOT NULL;
 
+-- Block-range index for time-ordered inserts (much smaller than a B-tree)
+CREATE INDEX idx_datetime_brin ON oceanographic_data USING brin (datetime) WITH (pages_per_range = 32);
+
+-- Spatial index for bounding-box queries (point(longitude, latitude) <@ box)
+CREATE INDEX idx_lon_lat_gist ON oceanographic_data USING gist (point(longitude, latitude));
+
 -- Quality and source indexes
 CREATE INDEX idx_oceanographic_data_quality ON oceanographic_data (quality_flag);
 CREATE INDEX idx_oceanographic_data_source ON oceanographic_data (source_file) WHERE source_file IS NOT NULL;